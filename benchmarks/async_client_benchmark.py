@@ -0,0 +1,59 @@
+"""
+Wall-clock comparison of sequential APIClient calls against concurrent
+AsyncAPIClient calls on a local stub server.
+
+Usage:
+    python -m benchmarks.async_client_benchmark --requests 200 --delay 0.02
+"""
+
+import argparse
+import asyncio
+import time
+
+from framework.api.api_client import APIClient
+from framework.api.async_api_client import AsyncAPIClient
+from framework.api.endpoints import AuthorAPI
+from framework.stub_server import PoetryStore, StubServer, seed_poems
+
+
+def run_sequential(base_url: str, requests_count: int) -> float:
+    client = APIClient(base_url=base_url)
+    started = time.perf_counter()
+    for _ in range(requests_count):
+        client.get(AuthorAPI.base)
+    return time.perf_counter() - started
+
+
+async def run_concurrent(base_url: str, requests_count: int) -> float:
+    client = AsyncAPIClient(base_url=base_url)
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(client.get(AuthorAPI.base) for _ in range(requests_count))
+    )
+    elapsed = time.perf_counter() - started
+    await client.aclose()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    server = StubServer(PoetryStore(seed_poems()), delay=args.delay)
+    base_url = server.start()
+
+    sequential = run_sequential(base_url, args.requests)
+    concurrent = asyncio.run(run_concurrent(base_url, args.requests))
+
+    print(
+        f"Requests:   {args.requests} (server delay {args.delay * 1000:.0f} ms)"
+    )
+    print(f"Sequential: {sequential:.3f} s")
+    print(f"Concurrent: {concurrent:.3f} s")
+    print(f"Speedup:    {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Memory of a poem corpus held as PoemResponse models and as a Corpus.
+
+Usage:
+    python -m benchmarks.corpus_benchmark --poems 100000
+"""
+
+import argparse
+import gc
+import json
+import timeit
+import tracemalloc
+
+from framework.api.models.response_types import PoemListAdapter
+from framework.corpus.compact import Corpus
+from framework.stub_server import generate_poems
+
+
+def retained_memory(build) -> tuple[int, object]:
+    """Memory still allocated after building an object, and the object"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--poems", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Both are built from the response body, so neither shares strings
+    # with the other
+    content = json.dumps(generate_poems(args.poems, args.seed)).encode()
+    models_memory, models = retained_memory(
+        lambda: PoemListAdapter.validate_json(content)
+    )
+    del models
+    corpus_memory, corpus = retained_memory(
+        lambda: Corpus(PoemListAdapter.validate_json(content))
+    )
+
+    print(f"Corpus: {args.poems} poems")
+    print(f"{'list[PoemResponse]':<20} {models_memory / 2**20:8.1f} MiB")
+    print(
+        f"{'Corpus':<20} {corpus_memory / 2**20:8.1f} MiB  "
+        f"{models_memory / corpus_memory:5.1f}x smaller"
+    )
+    index = args.poems // 2
+    access = min(timeit.repeat(lambda: corpus[index], number=1000, repeat=5))
+    print(f"Poem access: {access * 1000:.1f} us per poem as PoemResponse")
+
+
+if __name__ == "__main__":
+    main()
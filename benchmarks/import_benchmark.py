@@ -0,0 +1,36 @@
+"""
+Import time of conftest.py and framework modules at pytest startup.
+
+Every module is imported in fresh interpreters with python -X importtime
+after the modules pytest has already loaded, and the fastest run is shown
+with its slowest direct imports.
+
+Usage:
+    python -m benchmarks.import_benchmark
+    python -m benchmarks.import_benchmark --modules conftest framework.logger
+"""
+
+import argparse
+
+from utilities.import_time import measure_import
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", nargs="+", default=["conftest"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    for module in args.modules:
+        profile = measure_import(module, repeat=args.repeat)
+        print(
+            f"{module}: {profile.total:.1f} ms, "
+            f"{len(profile.imported)} modules imported"
+        )
+        for name, total in profile.slowest(args.top):
+            print(f"  {name:<40} {total:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
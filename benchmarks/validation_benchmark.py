@@ -0,0 +1,74 @@
+"""
+Comparison of poem list validation paths on a synthetic payload.
+
+Usage:
+    python -m benchmarks.validation_benchmark --poems 10000 --repeat 5
+"""
+
+import argparse
+import gc
+import json
+import timeit
+import tracemalloc
+
+from framework.api.models.response_types import PoemResponse, parse_poems
+
+
+def build_payload(poems_count: int, lines_count: int = 20) -> bytes:
+    """Build a JSON body with poems shaped like PoetryDB responses"""
+    return json.dumps(
+        [
+            {
+                "title": f"Poem {number}",
+                "author": f"Author {number % 100}",
+                "lines": [
+                    f"Line {line} of poem {number}"
+                    for line in range(lines_count)
+                ],
+                "linecount": str(lines_count),
+            }
+            for number in range(poems_count)
+        ]
+    ).encode()
+
+
+def per_item_validation(content: bytes) -> list[PoemResponse]:
+    """Previous path: parse to Python objects, then validate item by item"""
+    return [PoemResponse.model_validate(item) for item in json.loads(content)]
+
+
+def peak_memory(path) -> int:
+    """Peak memory allocated while running the path once"""
+    gc.collect()
+    tracemalloc.start()
+    path()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--poems", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = build_payload(args.poems)
+    paths = {
+        "json.loads + model_validate": lambda: per_item_validation(content),
+        "TypeAdapter.validate_json": lambda: parse_poems(content),
+    }
+
+    print(f"Payload: {args.poems} poems, {len(content) / 1024:.0f} KiB")
+    baseline = None
+    for name, path in paths.items():
+        best = min(timeit.repeat(path, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(
+            f"{name:<30} {best * 1000:8.1f} ms  {baseline / best:5.2f}x  "
+            f"peak {peak_memory(path) / 2**20:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,138 @@
+import html
+import os
 from datetime import datetime
 
 import pytest
+import pytest_asyncio
 from pytest_metadata.plugin import metadata_key
 
-from framework.api.api_client import APIClient
-from framework.logger import APILogger
-from settings import API_URL, LOCAL_RUNNER
+from framework.baseline import latency_baselines
+from framework.logger import APILogger, attribute_to_test
+from framework.metrics import api_metrics
+from settings import (
+    API_URL,
+    HTTP_CASSETTE,
+    HTTP_CASSETTE_LATENCY_SCALE,
+    HTTP_CASSETTE_MODE,
+    HTTP_RATE_LIMITS,
+    HTTP_RATE_LIMITS_DIRECTORY,
+    HTTP_RATE_LIMITS_SHARED,
+    LOCAL_RUNNER,
+    REPORT_DIRECTORY,
+    RESPONSE_CACHE,
+    RESPONSE_CACHE_DISK_MAX_AGE,
+    RESPONSE_CACHE_DISK_MAX_BYTES,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_PATH,
+    RESPONSE_CACHE_TTL,
+    STUB_IN_PROCESS,
+    USE_STUB_SERVER,
+)
 
+# Clients, services and the stub server are imported by the fixtures that
+# use them: collecting tests or running a few of them should not pay for
+# aiohttp, pydantic models and corpus indexes they do not need
 pytest_plugins = [
     "framework.fixtures.service_fixtures",
+    "framework.fixtures.load_fixtures",
+    "framework.fixtures.baseline_fixtures",
+    "framework.fixtures.stub_fixtures",
+    "framework.fixtures.corpus_fixtures",
 ]
 
+test_failed_key = pytest.StashKey[bool]()
+
 
 @pytest.fixture(scope="session")
-def api_client():
+def cassette():
+    """
+    Fixture that provides the cassette of recorded responses (optional)
+
+    Returns:
+        Cassette | None: HTTP_CASSETTE, None if it is not configured
+    """
+    if not HTTP_CASSETTE:
+        yield None
+        return
+
+    from framework.api.cassette import Cassette
+
+    # Erased once in record mode by pytest_configure(), parallel workers
+    # append to the same cassette
+    cassette = Cassette(HTTP_CASSETTE)
+
+    yield cassette
+
+    # Merge the recorded responses into the index
+    cassette.close()
+
+
+@pytest.fixture(scope="session")
+def api_client(request, api_url, cassette):
     """
     Fixture that provides an API client instance
 
     Returns:
         APIClient: Configured API client
     """
+    from framework.api.api_client import APIClient
+
     # Set default headers for all requests
     headers = {
         "Content-Type": "application/json",
         "Accept": "application/json",
     }
 
+    # Cache reference data fetched repeatedly across tests (optional)
+    cache = None
+    if RESPONSE_CACHE:
+        from framework.api.cache import ResponseCache
+
+        cache = ResponseCache(
+            ttl=RESPONSE_CACHE_TTL,
+            max_bytes=RESPONSE_CACHE_MAX_BYTES,
+            disk_path=RESPONSE_CACHE_PATH,
+            disk_max_bytes=RESPONSE_CACHE_DISK_MAX_BYTES,
+            disk_max_age=RESPONSE_CACHE_DISK_MAX_AGE,
+        )
+
+    # Keep the request rate within the budget of the server (optional)
+    rate_limiter = None
+    if HTTP_RATE_LIMITS:
+        from framework.api.rate_limit import RateLimiter, parse_rate_limits
+
+        rate_limiter = RateLimiter(
+            parse_rate_limits(HTTP_RATE_LIMITS),
+            HTTP_RATE_LIMITS_DIRECTORY if HTTP_RATE_LIMITS_SHARED else None,
+        )
+
     # Create and return the API client
-    client = APIClient(base_url=API_URL, headers=headers)
+    client = APIClient(
+        base_url=api_url,
+        headers=headers,
+        cache=cache,
+        rate_limiter=rate_limiter,
+    )
+
+    # Answer requests from the stub's memory without sockets (optional)
+    if USE_STUB_SERVER and STUB_IN_PROCESS:
+        from framework.stub_server import StubAdapter
+
+        stub_server = request.getfixturevalue("stub_server")
+        client.mount(api_url, StubAdapter(stub_server.store))
+
+    # Record responses and replay them without network (optional)
+    if cassette is not None:
+        from framework.api.cassette import CassetteAdapter
+
+        cassette_adapter = CassetteAdapter(
+            cassette,
+            client.adapter,
+            mode=HTTP_CASSETTE_MODE,
+            latency_scale=HTTP_CASSETTE_LATENCY_SCALE,
+        )
+        client.mount("http://", cassette_adapter)
+        client.mount("https://", cassette_adapter)
 
     # Log the test session start
     APILogger.log_info(
@@ -37,20 +142,238 @@ def api_client():
 
     yield client
 
+    # Log connection reuse to spot a handshake on every request
+    APILogger.log_info(f"Connection stats: {client.connection_stats()}")
+    if cache is not None:
+        APILogger.log_info(f"Response cache stats: {cache.stats()}")
+    APILogger.log_info(f"Resilience policies: {client.resilience_stats()}")
+    for template, stats in client.rate_limit_stats().items():
+        APILogger.log_info(f"Rate limit of {template}: {stats}")
+    if client.single_flight is not None:
+        APILogger.log_info(
+            f"Coalesced requests: {client.single_flight_stats()}"
+        )
+
+    # Wait for hedged copies still in flight, close the connections
+    client.close()
+
     # Log the test session end
     APILogger.log_info(
         f"Test session ended at "
         f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
     )
 
+    # Write out records still queued by the background logger
+    APILogger.flush()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def async_api_client(api_url, cassette):
+    """
+    Fixture that provides an async API client instance
+
+    Returns:
+        AsyncAPIClient: Configured async API client
+    """
+    from framework.api.async_api_client import AsyncAPIClient
+
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    }
+
+    # Replay and record through the session cassette (optional)
+    cassette_adapter = None
+    if cassette is not None:
+        from framework.api.cassette import CassetteAdapter
+
+        cassette_adapter = CassetteAdapter(
+            cassette,
+            mode=HTTP_CASSETTE_MODE,
+            latency_scale=HTTP_CASSETTE_LATENCY_SCALE,
+        )
+
+    client = AsyncAPIClient(
+        base_url=api_url, headers=headers, cassette=cassette_adapter
+    )
+
+    yield client
+
+    await client.aclose()
+
+
+# Attribute API calls to the running test, including calls made
+# from other threads or asyncio tasks started by the test
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_setup(item):
+    with attribute_to_test(f"{item.nodeid} (setup)"):
+        return (yield)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    with attribute_to_test(f"{item.nodeid} (call)"):
+        # Tests measuring latency must always reach the server
+        if item.get_closest_marker("no_cache"):
+            from framework.api.cache import bypass_cache
+
+            with bypass_cache():
+                return (yield)
+        return (yield)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    with attribute_to_test(f"{item.nodeid} (teardown)"):
+        return (yield)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item, call):
+    report = yield
+
+    if report.failed:
+        item.stash[test_failed_key] = True
+
+    # Write log entries buffered in "log bodies only on failure" mode
+    if report.when == "teardown":
+        APILogger.release_test_records(
+            failed=item.stash.get(test_failed_key, False)
+        )
+
+    return report
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-load",
+        action="store_true",
+        default=False,
+        help="run load tests (marked with @pytest.mark.load)",
+    )
+    parser.addoption(
+        "--run-perf",
+        action="store_true",
+        default=False,
+        help="run timing-sensitive tests (marked with @pytest.mark.perf)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    # Load tests take long and stress the server, and timings of perf tests
+    # depend on the machine, so both are opt-in
+    skips = {
+        marker: pytest.mark.skip(
+            reason=f"{marker} test, use --run-{marker} to run"
+        )
+        for marker in ("load", "perf")
+        if not config.getoption(f"--run-{marker}")
+    }
+    for item in items:
+        for marker, skip in skips.items():
+            if item.get_closest_marker(marker):
+                item.add_marker(skip)
+
+
+def pytest_sessionfinish(session):
+    # Hand API call metrics of a pytest-xdist worker over to the controller
+    if hasattr(session.config, "workerinput"):
+        session.config.workeroutput["api_metrics"] = api_metrics.to_state()
+        session.config.workeroutput["latency_baselines"] = (
+            latency_baselines.to_state()
+        )
+        return
+
+    # Merge per-worker log shards on the pytest-xdist controller
+    APILogger.merge_worker_logs()
+
+    # Save latency percentiles and throughput of every endpoint, if any
+    # endpoint was called (unit tests keep their calls to themselves)
+    if api_metrics.endpoints:
+        api_metrics.write_json(os.path.join(REPORT_DIRECTORY, "metrics.json"))
+
+    # Keep latencies of checks without a regression for the next run
+    latency_baselines.save()
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    # Collect API call metrics of a finished pytest-xdist worker
+    workeroutput = getattr(node, "workeroutput", {})
+    if "api_metrics" in workeroutput:
+        api_metrics.merge_state(workeroutput["api_metrics"])
+    if "latency_baselines" in workeroutput:
+        latency_baselines.merge_state(workeroutput["latency_baselines"])
+
 
 # HTML report configuration
 def pytest_html_report_title(report):
     report.title = "API Test Automation Report"
 
 
+def pytest_html_results_summary(prefix, summary, postfix):
+    # Latency percentiles and throughput of every endpoint over the run
+    endpoints = api_metrics.summary()["endpoints"]
+    if endpoints:
+        postfix.append(_metrics_table(endpoints))
+
+    # Median latency changes against the previous run
+    if latency_baselines.comparisons:
+        postfix.append(_baseline_table(latency_baselines.comparisons))
+
+
+def _metrics_table(endpoints: dict) -> str:
+    columns = ("count", "p50", "p90", "p99", "max", "throughput", "errors")
+    rows = "".join(
+        f"<tr><td>{html.escape(endpoint)}</td>"
+        + "".join(f"<td>{metrics[column]}</td>" for column in columns)
+        + "</tr>"
+        for endpoint, metrics in endpoints.items()
+    )
+    return (
+        "<h2>API latency (ms) and throughput (calls/s)</h2>"
+        "<table><tr><th>Endpoint</th>"
+        + "".join(f"<th>{column}</th>" for column in columns)
+        + f"</tr>{rows}</table>"
+    )
+
+
+def _baseline_table(comparisons: list) -> str:
+    rows = "".join(
+        f"<tr><td>{html.escape(comparison.key)}</td>"
+        f"<td>{comparison.current_median:.3f}</td>"
+        + (
+            f"<td>{comparison.baseline_median:.3f}</td>"
+            f"<td>{comparison.delta:+.1%}</td>"
+            f"<td>{comparison.p_value:.4f}</td>"
+            if comparison.baseline_median is not None
+            else "<td>-</td><td>-</td><td>-</td>"
+        )
+        + f"<td>{'yes' if comparison.regressed else 'no'}</td></tr>"
+        for comparison in comparisons
+    )
+    return (
+        "<h2>Latency vs. baseline (median, ms)</h2>"
+        "<table><tr><th>Check</th><th>current</th><th>baseline</th>"
+        "<th>delta</th><th>p-value</th><th>regressed</th></tr>"
+        f"{rows}</table>"
+    )
+
+
 def pytest_configure(config):
-    config.stash[metadata_key]["API URL"] = API_URL
+    # Start a fresh recording once per run, before any xdist worker opens it
+    if (
+        HTTP_CASSETTE
+        and HTTP_CASSETTE_MODE == "record"
+        and not hasattr(config, "workerinput")
+    ):
+        from framework.api.cassette import erase_cassette
+
+        erase_cassette(HTTP_CASSETTE)
+
+    config.stash[metadata_key]["API URL"] = (
+        "In-repo stub server" if USE_STUB_SERVER else API_URL
+    )
     config.stash[metadata_key]["Test Framework"] = "Pytest + Requests"
     config.stash[metadata_key]["Environment"] = (
         "Local" if LOCAL_RUNNER else "CI"
@@ -0,0 +1,191 @@
+import socket
+import threading
+import time
+from dataclasses import dataclass
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.response import HTTPResponse
+from urllib3.util.connection import allowed_gai_family
+
+from framework.api.timings import current_timings
+
+
+@dataclass(frozen=True)
+class ConnectionStats:
+    """Connection usage of an HTTP adapter"""
+
+    requests: int
+    new_connections: int
+
+    @property
+    def reused_connections(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    @property
+    def reuse_ratio(self) -> float:
+        """Share of requests sent over an already open connection"""
+        return self.reused_connections / self.requests if self.requests else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"requests={self.requests}, "
+            f"new_connections={self.new_connections}, "
+            f"reuse_ratio={self.reuse_ratio:.2%}"
+        )
+
+
+class PoolingHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter with configurable socket options that counts requests and
+    newly opened connections across all of its connection pools, and
+    measures connection phases of requests sent with current_timings set
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        tcp_nodelay: bool = True,
+        tcp_keepalive: bool = True,
+        **kwargs,
+    ):
+        """
+        Args:
+            pool_connections: Number of per-host pools to keep
+            pool_maxsize: Maximum number of connections kept per pool
+            pool_block: Wait for a free connection instead of opening
+                a throwaway one when the pool is exhausted
+            tcp_nodelay: Disable Nagle's algorithm on new sockets
+            tcp_keepalive: Enable TCP keep-alive probes on new sockets
+            **kwargs: Additional arguments to pass to HTTPAdapter
+        """
+        self.socket_options = [
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, int(tcp_nodelay)),
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, int(tcp_keepalive)),
+        ]
+        # Sockets opened by connections of this adapter, including
+        # reconnects of pooled connections dropped by the server
+        self._new_connections = 0
+        self._counter_lock = threading.Lock()
+        # Requests sent by pools evicted from the pool manager
+        self._retired_requests = 0
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            **kwargs,
+        )
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pools.dispose_func = self._dispose_pool
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: self._counting_pool_class(pool_class)
+            for scheme, pool_class in (
+                self.poolmanager.pool_classes_by_scheme.items()
+            )
+        }
+
+    def _counting_pool_class(
+        self, pool_class: type[HTTPConnectionPool]
+    ) -> type[HTTPConnectionPool]:
+        """
+        Subclass the pool to count every socket its connections open
+        and to time connection phases
+        """
+        adapter = self
+
+        class CountingConnection(pool_class.ConnectionCls):
+            def connect(self) -> None:
+                with adapter._counter_lock:
+                    adapter._new_connections += 1
+                timings = current_timings.get()
+                if timings is None:
+                    return super().connect()
+
+                started = time.perf_counter()
+                super().connect()
+                # TLS handshake is the part of connect() after the socket
+                # connection established by _new_conn()
+                if isinstance(self, HTTPSConnection):
+                    timings.tls = (
+                        time.perf_counter()
+                        - started
+                        - (timings.dns or 0)
+                        - (timings.connect or 0)
+                    )
+
+            def _new_conn(self) -> socket.socket:
+                timings = current_timings.get()
+                if timings is None:
+                    return super()._new_conn()
+
+                started = time.perf_counter()
+                host = self._dns_host
+                try:
+                    addresses = socket.getaddrinfo(
+                        host.strip("[]"),
+                        self.port,
+                        allowed_gai_family(),
+                        socket.SOCK_STREAM,
+                    )
+                except socket.gaierror:
+                    # Let urllib3 raise its usual resolution error
+                    return super()._new_conn()
+                resolved = time.perf_counter()
+                timings.dns = resolved - started
+
+                # Connect to the resolved addresses in order, as urllib3
+                # does, without resolving the host a second time
+                error = None
+                try:
+                    for *_, address in addresses:
+                        self._dns_host = address[0]
+                        try:
+                            sock = super()._new_conn()
+                        except NewConnectionError as exc:
+                            error = exc
+                            continue
+                        timings.connect = time.perf_counter() - resolved
+                        return sock
+                    raise error
+                finally:
+                    self._dns_host = host
+
+            def getresponse(self) -> HTTPResponse:
+                timings = current_timings.get()
+                if timings is None:
+                    return super().getresponse()
+
+                started = time.perf_counter()
+                response = super().getresponse()
+                timings.headers_received = time.perf_counter()
+                timings.ttfb = timings.headers_received - started
+                return response
+
+        return type(
+            pool_class.__name__,
+            (pool_class,),
+            {"ConnectionCls": CountingConnection},
+        )
+
+    def _dispose_pool(self, pool: HTTPConnectionPool) -> None:
+        with self._counter_lock:
+            self._retired_requests += pool.num_requests
+        pool.close()
+
+    def connection_stats(self) -> ConnectionStats:
+        """Get request and new connection counts of all pools"""
+        pools = self.poolmanager.pools
+        with pools.lock:
+            live_pools = list(pools._container.values())
+        return ConnectionStats(
+            requests=self._retired_requests
+            + sum(pool.num_requests for pool in live_pools),
+            new_connections=self._new_connections,
+        )
@@ -1,35 +1,230 @@
-from typing import Any, Literal
+import json
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from contextlib import nullcontext
+from contextvars import copy_context
+from dataclasses import dataclass
+from typing import Any, Literal, Optional
 
 import requests
 from requests import Response
-
-from framework.logger import APILogger
+from requests.adapters import BaseAdapter
+
+from framework.api.adapters import ConnectionStats, PoolingHTTPAdapter
+from framework.api.cache import ResponseCache, cache_bypassed
+from framework.api.rate_limit import RateLimiter, RateLimitStats
+from framework.api.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgePolicy,
+    RetryPolicy,
+)
+from framework.api.single_flight import SingleFlight, SingleFlightStats
+from framework.api.timings import RequestTimings, current_timings
+from framework.logger import APILogger, get_caller
+from framework.metrics import api_metrics, endpoint_template
+from settings import (
+    HTTP_CIRCUIT_BREAKER,
+    HTTP_CIRCUIT_FAILURE_THRESHOLD,
+    HTTP_CIRCUIT_RESET_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_HEDGE,
+    HTTP_HEDGE_DELAY,
+    HTTP_KEEP_ALIVE,
+    HTTP_POOL_BLOCK,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_READ_TIMEOUT,
+    HTTP_RETRIES,
+    HTTP_RETRY_BACKOFF,
+    HTTP_SINGLE_FLIGHT,
+    HTTP_TCP_NODELAY,
+    HTTP_TIMINGS,
+)
 
 # Define HTTP methods type
 HTTPMethod = Literal["GET", "POST", "PUT", "PATCH", "DELETE", "HEAD"]
 
 
+@dataclass(frozen=True)
+class ResilienceStats:
+    """Retries, hedged requests and calls rejected by circuit breakers"""
+
+    retries: int = 0
+    hedges: int = 0
+    # Hedged requests answered by the backup copy first
+    hedge_wins: int = 0
+    rejected: int = 0
+    open_circuits: tuple[str, ...] = ()
+
+    def __str__(self) -> str:
+        return (
+            f"retries={self.retries}, hedges={self.hedges}, "
+            f"hedge_wins={self.hedge_wins}, rejected={self.rejected}, "
+            f"open_circuits={list(self.open_circuits)}"
+        )
+
+
+def _close_response(future: Future) -> None:
+    # Return the connection of a hedged copy nobody reads
+    if future.exception() is None:
+        future.result().close()
+
+
 class APIClient:
-    """Base class for API clients"""
+    """
+    Base class for API clients
+
+    The client is safe to share between threads: every thread sends
+    requests through its own requests.Session, while all sessions share
+    one thread-safe connection pool.
+    """
 
-    def __init__(self, base_url: str = "", headers: dict = None):
+    def __init__(
+        self,
+        base_url: str = "",
+        headers: dict = None,
+        pool_connections: int = HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = HTTP_POOL_MAXSIZE,
+        pool_block: bool = HTTP_POOL_BLOCK,
+        keep_alive: bool = HTTP_KEEP_ALIVE,
+        tcp_nodelay: bool = HTTP_TCP_NODELAY,
+        connect_timeout: float | None = HTTP_CONNECT_TIMEOUT,
+        read_timeout: float | None = HTTP_READ_TIMEOUT,
+        cache: ResponseCache = None,
+        timings: bool = HTTP_TIMINGS,
+        single_flight: bool = HTTP_SINGLE_FLIGHT,
+        retry: Optional[RetryPolicy] = (
+            RetryPolicy(retries=HTTP_RETRIES, backoff=HTTP_RETRY_BACKOFF)
+            if HTTP_RETRIES
+            else None
+        ),
+        hedge: Optional[HedgePolicy] = (
+            HedgePolicy(delay=HTTP_HEDGE_DELAY) if HTTP_HEDGE else None
+        ),
+        circuit_breaker: bool = HTTP_CIRCUIT_BREAKER,
+        rate_limiter: RateLimiter = None,
+    ):
         """
         Initialize the API client with base URL and default headers
 
         Args:
             base_url: Base URL for API endpoints
             headers: Default headers to include in all requests
+            pool_connections: Number of per-host connection pools to keep
+            pool_maxsize: Maximum number of connections kept per pool
+            pool_block: Wait for a free connection when the pool is
+                exhausted instead of opening a throwaway one
+            keep_alive: Reuse connections between requests
+            tcp_nodelay: Disable Nagle's algorithm on new sockets
+            connect_timeout: Default connect timeout in seconds
+            read_timeout: Default read timeout in seconds
+            cache: Response cache for GET requests, disabled by default
+            timings: Measure request phases (DNS, connect, TLS, TTFB,
+                download) and attach them to responses as .timings
+            single_flight: Send identical GET requests made concurrently
+                only once and share the response between the callers
+            retry: Retry policy of idempotent requests, None - no retries
+                (the default unless HTTP_RETRIES is set); calls can
+                override it with retry=...
+            hedge: Hedging policy of slow idempotent requests, None - no
+                hedging; calls can override it with hedge=...
+            circuit_breaker: Fail calls to an endpoint fast while most of
+                its recent calls fail, disabled by default
+            rate_limiter: Rate and in-flight limits per endpoint template,
+                disabled by default
         """
         self.base_url = base_url
         self.headers = headers or {}
-        self.session = requests.Session()
+        self.timeout = (connect_timeout, read_timeout)
+        self.keep_alive = keep_alive
+        self.pool_maxsize = pool_maxsize
+        self.cache = cache
+        self.timings = timings
+        self.single_flight = SingleFlight() if single_flight else None
+        self.retry = retry
+        self.hedge = hedge
+        self.circuit_breaker = (
+            CircuitBreaker(
+                failure_threshold=HTTP_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=HTTP_CIRCUIT_RESET_TIMEOUT,
+            )
+            if circuit_breaker
+            else None
+        )
+        self.rate_limiter = rate_limiter
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {"retries": 0, "hedges": 0, "hedge_wins": 0}
+        self._rejected = 0
+        self._stats_lock = threading.Lock()
+
+        self.adapter = PoolingHTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            tcp_nodelay=tcp_nodelay,
+        )
+        # Adapters mounted on the session of every thread
+        self.adapters: dict[str, BaseAdapter] = {
+            "http://": self.adapter,
+            "https://": self.adapter,
+        }
+        self._local = threading.local()
+        # Sessions of all threads, closed by close()
+        self._sessions: list[requests.Session] = []
+
+    @property
+    def session(self) -> requests.Session:
+        """Session of the current thread"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self._new_session()
+            with self._stats_lock:
+                self._sessions.append(session)
+        return session
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
+        for prefix, adapter in self.adapters.items():
+            session.mount(prefix, adapter)
+
+        # Ask the server to close connections when keep-alive is disabled
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
 
         # Set default headers for the session
         if self.headers:
-            self.session.headers.update(self.headers)
+            session.headers.update(self.headers)
+
+        return session
+
+    def mount(self, prefix: str, adapter: BaseAdapter) -> None:
+        """
+        Mount a transport adapter on the sessions of all threads
+
+        Args:
+            prefix: URL prefix the adapter handles
+            adapter: Transport adapter
+        """
+        self.adapters[prefix] = adapter
+        # Sessions are recreated with the new adapter on their next use
+        self._local = threading.local()
 
     def get(
-        self, endpoint: str, params: dict = None, headers: dict = None, **kwargs
+        self,
+        endpoint: str,
+        params: dict = None,
+        headers: dict = None,
+        use_cache: bool = True,
+        **kwargs,
     ) -> Response:
         """
         Send GET request
@@ -38,15 +233,100 @@ class APIClient:
             endpoint: API endpoint (will be appended to base_url)
             params: Query parameters
             headers: Additional headers for this request
+            use_cache: Serve the response from the cache if it is enabled
             **kwargs: Additional arguments to pass to requests.request
 
         Returns:
             Response object
         """
+        # Name the caller here, the request may be sent by another thread
+        caller = kwargs.pop("caller", None) or get_caller()
+
+        # Share one round-trip between identical concurrent requests
+        if (
+            self.single_flight is not None
+            and not cache_bypassed.get()
+            and not kwargs.get("stream")
+        ):
+            key = (
+                endpoint,
+                json.dumps(sorted((params or {}).items()), default=str),
+                json.dumps(sorted((headers or {}).items())),
+                use_cache,
+                repr(sorted(kwargs.items())),
+            )
+            return self.single_flight.do(
+                key,
+                lambda: self._get(
+                    endpoint,
+                    params,
+                    headers,
+                    use_cache,
+                    caller=caller,
+                    **kwargs,
+                ),
+            )
+
+        return self._get(
+            endpoint, params, headers, use_cache, caller=caller, **kwargs
+        )
+
+    def _get(
+        self,
+        endpoint: str,
+        params: dict = None,
+        headers: dict = None,
+        use_cache: bool = True,
+        **kwargs,
+    ) -> Response:
+        """Send GET request, through the response cache if it is enabled"""
+        if (
+            self.cache is not None
+            and use_cache
+            and not cache_bypassed.get()
+            and not kwargs.get("stream")
+        ):
+            return self._cached_get(endpoint, params, headers, **kwargs)
+
         return self._request(
             "GET", endpoint, params=params, headers=headers, **kwargs
         )
 
+    def _cached_get(
+        self, endpoint: str, params: dict = None, headers: dict = None, **kwargs
+    ) -> Response:
+        """
+        Send GET request through the response cache
+
+        Args:
+            endpoint: API endpoint (will be appended to base_url)
+            params: Query parameters
+            headers: Additional headers for this request
+            **kwargs: Additional arguments to pass to requests.request
+
+        Returns:
+            Cached or received response object
+        """
+        url = f"{self.base_url}{endpoint}" if self.base_url else endpoint
+        key = self.cache.key(url, params, {**self.headers, **(headers or {})})
+
+        entry, fresh = self.cache.lookup(key)
+        if fresh:
+            return entry.to_response()
+
+        # Ask the server to confirm a stale response is still valid
+        if entry is not None:
+            headers = {**(headers or {}), **entry.conditional_headers()}
+
+        response = self._request(
+            "GET", endpoint, params=params, headers=headers, **kwargs
+        )
+        if entry is not None and response.status_code == 304:
+            return self.cache.revalidated(key, entry, response)
+
+        self.cache.store(key, response)
+        return response
+
     def post(
         self,
         endpoint: str,
@@ -155,17 +435,27 @@ class APIClient:
         self, method: HTTPMethod, endpoint: str, headers: dict = None, **kwargs
     ) -> Response:
         """
-        Send HTTP request
+        Send HTTP request, applying the retry, hedging and circuit breaker
+        policies
 
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint (will be appended to base_url)
             headers: Additional headers for this request
-            **kwargs: Additional arguments to pass to requests.request
+            **kwargs: Additional arguments to pass to requests.request;
+                retry and hedge override the policies of the client, caller
+                names the function logged as making the request
 
         Returns:
             Response object
+
+        Raises:
+            CircuitOpenError: If the circuit breaker of the endpoint is open
         """
+        retry = kwargs.pop("retry", self.retry)
+        hedge = kwargs.pop("hedge", self.hedge)
+        caller = kwargs.pop("caller", None) or get_caller()
+
         # Construct full URL
         url = f"{self.base_url}{endpoint}" if self.base_url else endpoint
 
@@ -174,13 +464,185 @@ class APIClient:
         if headers:
             request_headers.update(headers)
 
-        # Send request
-        response = self.session.request(
-            method=method, url=url, headers=request_headers, **kwargs
+        # Apply default timeouts unless the call sets its own
+        if self.timeout != (None, None):
+            kwargs.setdefault("timeout", self.timeout)
+
+        circuit = f"{method} {endpoint_template(endpoint)}"
+        attempt = 0
+        while True:
+            trial = None
+            if self.circuit_breaker is not None:
+                try:
+                    trial = self.circuit_breaker.before_call(circuit)
+                except CircuitOpenError:
+                    with self._stats_lock:
+                        self._rejected += 1
+                    raise
+
+            response = error = None
+            try:
+                response = self._hedged_send(
+                    method,
+                    url,
+                    endpoint,
+                    request_headers,
+                    hedge,
+                    kwargs,
+                    caller,
+                )
+            except (requests.ConnectionError, requests.Timeout) as exception:
+                error = exception
+            except Exception:
+                # Other errors say nothing about the endpoint: they are not
+                # recorded, a trial call only hands the trial to the next one
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.cancel(circuit, trial)
+                raise
+
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(
+                    circuit,
+                    error is not None or response.status_code >= 500,
+                    trial,
+                )
+
+            if retry is None or not retry.should_retry(
+                method, attempt, response, error
+            ):
+                if error is not None:
+                    raise error
+                return response
+
+            delay = retry.delay(attempt, response)
+            APILogger.log_info(
+                f"Retrying {method} {url} in {delay:.3f} s "
+                f"(attempt {attempt + 2} of {retry.retries + 1}): "
+                f"{error or response.status_code}"
+            )
+            if response is not None:
+                response.close()
+            with self._stats_lock:
+                self._stats["retries"] += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def _hedge_delay(
+        self, method: str, endpoint: str, hedge: Optional[HedgePolicy], kwargs
+    ) -> Optional[float]:
+        """Seconds to wait before hedging a request, None - do not hedge"""
+        if hedge is None or method not in hedge.methods or kwargs.get("stream"):
+            return None
+        if hedge.delay is not None:
+            return hedge.delay
+        latency = api_metrics.percentile(
+            method, endpoint, hedge.percentile, hedge.min_samples
+        )
+        return None if latency is None else latency / 1000
+
+    def _hedged_send(
+        self,
+        method: HTTPMethod,
+        url: str,
+        endpoint: str,
+        headers: dict,
+        hedge: Optional[HedgePolicy],
+        kwargs: dict,
+        caller: Optional[str],
+    ) -> Response:
+        """
+        Send a request, and a backup copy if it is slower than the hedging
+        delay; the first successful response wins. The slower copy is not
+        cancelled, it completes in the background and its response is
+        closed; close() waits for it.
+        """
+        delay = self._hedge_delay(method, endpoint, hedge, kwargs)
+        if delay is None:
+            return self._send(method, url, endpoint, headers, kwargs, caller)
+
+        with self._stats_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.pool_maxsize,
+                    thread_name_prefix="hedge",
+                )
+            executor = self._hedge_executor
+
+        def submit():
+            # Run in a copy of the caller's context, see map_get()
+            return executor.submit(
+                copy_context().run,
+                self._send,
+                method,
+                url,
+                endpoint,
+                headers,
+                kwargs,
+                caller,
+            )
+
+        primary = submit()
+        if wait([primary], timeout=delay).done:
+            return primary.result()
+
+        backup = submit()
+        with self._stats_lock:
+            self._stats["hedges"] += 1
+        for future in as_completed([primary, backup]):
+            if future.exception() is None:
+                if future is backup:
+                    with self._stats_lock:
+                        self._stats["hedge_wins"] += 1
+                loser = primary if future is backup else backup
+                loser.add_done_callback(_close_response)
+                return future.result()
+        return primary.result()
+
+    def _send(
+        self,
+        method: HTTPMethod,
+        url: str,
+        endpoint: str,
+        headers: dict,
+        kwargs: dict,
+        caller: Optional[str],
+    ) -> Response:
+        """Send a single request, recording its metrics and logs"""
+        # Wait for the budget of the endpoint before the latency is measured
+        limit = (
+            self.rate_limiter.limit(endpoint_template(endpoint))
+            if self.rate_limiter is not None
+            else nullcontext()
         )
+        with limit:
+            # Send request, timing its phases in the instrumentation mode
+            timings = RequestTimings() if self.timings else None
+            token = current_timings.set(timings)
+            started = time.perf_counter()
+            try:
+                response = self.session.request(
+                    method=method, url=url, headers=headers, **kwargs
+                )
+            finally:
+                current_timings.reset(token)
+            finished = time.perf_counter()
+        api_metrics.record(
+            method, endpoint, finished - started, response.status_code
+        )
+
+        if timings is not None:
+            # The body is read right after the headers unless streamed
+            if timings.headers_received and not kwargs.get("stream"):
+                timings.download = finished - timings.headers_received
+            response.timings = timings
 
         # Log request and response
-        APILogger.log_api_call(response)
+        APILogger.log_api_call(
+            response,
+            streamed=kwargs.get("stream", False),
+            template=endpoint_template(endpoint),
+            caller=caller,
+        )
 
         return response
 
@@ -214,3 +676,144 @@ class APIClient:
         response = self.post(endpoint, json_data=json_data, **kwargs)
         response.raise_for_status()
         return response.json()
+
+    def map_get(
+        self, endpoints: list[str], max_workers: int = None, **kwargs
+    ) -> list[Response]:
+        """
+        Send GET requests concurrently from a thread pool
+
+        Args:
+            endpoints: API endpoints
+            max_workers: Number of threads, the pool size by default
+            **kwargs: Additional arguments to pass to get method
+
+        Returns:
+            Responses in the order of endpoints
+        """
+        caller = get_caller()
+        with ThreadPoolExecutor(
+            max_workers=max_workers or self.pool_maxsize
+        ) as executor:
+            # Each call runs in a copy of the caller's context,
+            # so the logger attributes it to the current test
+            futures = [
+                executor.submit(
+                    copy_context().run,
+                    self.get,
+                    endpoint,
+                    caller=caller,
+                    **kwargs,
+                )
+                for endpoint in endpoints
+            ]
+            return [future.result() for future in futures]
+
+    def imap_get(
+        self, endpoints: Iterable[str], max_workers: int = None, **kwargs
+    ) -> Iterator[tuple[str, Response]]:
+        """
+        Send GET requests concurrently and yield responses as they complete
+
+        At most max_workers requests are in flight, and endpoints are read
+        lazily, so long inputs are not queued up front. Requests not sent
+        yet are cancelled when the iteration stops early.
+
+        Args:
+            endpoints: API endpoints
+            max_workers: Number of requests in flight, the pool size by default
+            **kwargs: Additional arguments to pass to get method
+
+        Returns:
+            Endpoints with their responses in the order of completion
+        """
+        max_workers = max_workers or self.pool_maxsize
+        caller = get_caller()
+        endpoints = iter(endpoints)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+        try:
+            while True:
+                for endpoint in endpoints:
+                    future = executor.submit(
+                        copy_context().run,
+                        self.get,
+                        endpoint,
+                        caller=caller,
+                        **kwargs,
+                    )
+                    pending[future] = endpoint
+                    if len(pending) >= max_workers:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def close(self) -> None:
+        """
+        Wait for hedged copies still in flight and close the connection
+        pools of all threads
+        """
+        with self._stats_lock:
+            executor, self._hedge_executor = self._hedge_executor, None
+            sessions, self._sessions = self._sessions, []
+        if executor is not None:
+            executor.shutdown(wait=True)
+        for session in sessions:
+            session.close()
+        for adapter in self.adapters.values():
+            adapter.close()
+        self._local = threading.local()
+
+    def connection_stats(self) -> ConnectionStats:
+        """
+        Get connection usage of the session
+
+        Returns:
+            Number of requests, newly opened connections and reuse ratio
+        """
+        return self.adapter.connection_stats()
+
+    def single_flight_stats(self) -> SingleFlightStats:
+        """
+        Get counters of coalesced GET requests
+
+        Returns:
+            Number of requests sent and of callers that shared them
+        """
+        if self.single_flight is None:
+            return SingleFlightStats()
+        return self.single_flight.stats()
+
+    def resilience_stats(self) -> ResilienceStats:
+        """
+        Get counters of the retry, hedging and circuit breaker policies
+
+        Returns:
+            Number of retries, hedged requests and rejected calls
+        """
+        with self._stats_lock:
+            return ResilienceStats(
+                **self._stats,
+                rejected=self._rejected,
+                open_circuits=tuple(
+                    self.circuit_breaker.open_circuits()
+                    if self.circuit_breaker is not None
+                    else ()
+                ),
+            )
+
+    def rate_limit_stats(self) -> dict[str, RateLimitStats]:
+        """
+        Get requests held back by the rate limiter
+
+        Returns:
+            Request counters by the template of the limit
+        """
+        if self.rate_limiter is None:
+            return {}
+        return self.rate_limiter.stats()
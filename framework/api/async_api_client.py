@@ -0,0 +1,345 @@
+import asyncio
+import time
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+import requests
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+from framework.api.api_client import HTTPMethod
+from framework.api.cassette import CassetteAdapter
+from framework.logger import APILogger, get_caller
+from framework.metrics import api_metrics, endpoint_template
+
+if TYPE_CHECKING:
+    import aiohttp
+
+
+class AsyncAPIClient:
+    """Base class for asynchronous API clients"""
+
+    def __init__(
+        self,
+        base_url: str = "",
+        headers: dict = None,
+        max_connections: int = 100,
+        cassette: CassetteAdapter = None,
+    ):
+        """
+        Initialize the async API client with base URL and default headers
+
+        Args:
+            base_url: Base URL for API endpoints
+            headers: Default headers to include in all requests
+            max_connections: Maximum number of concurrent connections
+            cassette: Cassette adapter whose recordings are replayed and
+                extended by this client, no recording by default
+        """
+        self.base_url = base_url
+        self.headers = headers or {}
+        self.max_connections = max_connections
+        self.cassette = cassette
+        # The aiohttp session binds to the running event loop,
+        # so it is created on the first request
+        self.session: aiohttp.ClientSession | None = None
+
+    async def get(
+        self, endpoint: str, params: dict = None, headers: dict = None, **kwargs
+    ) -> Response:
+        """
+        Send GET request
+
+        Args:
+            endpoint: API endpoint (will be appended to base_url)
+            params: Query parameters
+            headers: Additional headers for this request
+            **kwargs: Additional arguments to pass to the _request method
+
+        Returns:
+            Response object
+        """
+        return await self._request(
+            "GET", endpoint, params=params, headers=headers, **kwargs
+        )
+
+    async def post(
+        self,
+        endpoint: str,
+        data: Any = None,
+        json_data: Any = None,
+        headers: dict = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Send POST request
+
+        Args:
+            endpoint: API endpoint (will be appended to base_url)
+            data: Form data or request body
+            json_data: JSON data (will be serialized)
+            headers: Additional headers for this request
+            **kwargs: Additional arguments to pass to the _request method
+
+        Returns:
+            Response object
+        """
+        return await self._request(
+            "POST",
+            endpoint,
+            data=data,
+            json_data=json_data,
+            headers=headers,
+            **kwargs,
+        )
+
+    async def put(
+        self,
+        endpoint: str,
+        data: Any = None,
+        json_data: Any = None,
+        headers: dict = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Send PUT request
+
+        Args:
+            endpoint: API endpoint (will be appended to base_url)
+            data: Form data or request body
+            json_data: JSON data (will be serialized)
+            headers: Additional headers for this request
+            **kwargs: Additional arguments to pass to the _request method
+
+        Returns:
+            Response object
+        """
+        return await self._request(
+            "PUT",
+            endpoint,
+            data=data,
+            json_data=json_data,
+            headers=headers,
+            **kwargs,
+        )
+
+    async def patch(
+        self,
+        endpoint: str,
+        data: Any = None,
+        json_data: Any = None,
+        headers: dict = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Send PATCH request
+
+        Args:
+            endpoint: API endpoint (will be appended to base_url)
+            data: Form data or request body
+            json_data: JSON data (will be serialized)
+            headers: Additional headers for this request
+            **kwargs: Additional arguments to pass to the _request method
+
+        Returns:
+            Response object
+        """
+        return await self._request(
+            "PATCH",
+            endpoint,
+            data=data,
+            json_data=json_data,
+            headers=headers,
+            **kwargs,
+        )
+
+    async def delete(
+        self, endpoint: str, headers: dict = None, **kwargs
+    ) -> Response:
+        """
+        Send DELETE request
+
+        Args:
+            endpoint: API endpoint (will be appended to base_url)
+            headers: Additional headers for this request
+            **kwargs: Additional arguments to pass to the _request method
+
+        Returns:
+            Response object
+        """
+        return await self._request(
+            "DELETE", endpoint, headers=headers, **kwargs
+        )
+
+    async def _request(
+        self,
+        method: HTTPMethod,
+        endpoint: str,
+        headers: dict = None,
+        params: dict = None,
+        data: Any = None,
+        json_data: Any = None,
+        timeout: float = None,
+        **kwargs,
+    ) -> Response:
+        """
+        Send HTTP request
+
+        The request is prepared by requests and the aiohttp result is
+        converted back to a requests.Response, so services, the logger and
+        tests work with the same response type as for APIClient.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint (will be appended to base_url)
+            headers: Additional headers for this request
+            params: Query parameters
+            data: Form data or request body
+            json_data: JSON data (will be serialized)
+            timeout: Total timeout in seconds
+            **kwargs: Additional arguments to pass to
+                aiohttp.ClientSession.request; caller names the function
+                logged as making the request
+
+        Returns:
+            Response object
+        """
+        caller = kwargs.pop("caller", None) or get_caller()
+
+        # Construct full URL
+        url = f"{self.base_url}{endpoint}" if self.base_url else endpoint
+
+        # Merge headers
+        request_headers = self.headers.copy()
+        if headers:
+            request_headers.update(headers)
+
+        prepared = requests.Request(
+            method=method,
+            url=url,
+            headers=request_headers,
+            params=params,
+            data=data,
+            json=json_data,
+        ).prepare()
+
+        # Replay a recorded response if there is one
+        key, response = (
+            self.cassette.lookup(prepared)
+            if self.cassette is not None
+            else (None, None)
+        )
+
+        started = time.perf_counter()
+        if response is not None:
+            await asyncio.sleep(response.elapsed.total_seconds())
+        else:
+            response = await self._send(prepared, timeout, **kwargs)
+            if self.cassette is not None:
+                self.cassette.record(
+                    key, response, time.perf_counter() - started
+                )
+        api_metrics.record(
+            method,
+            endpoint,
+            time.perf_counter() - started,
+            response.status_code,
+        )
+
+        # Log request and response
+        APILogger.log_api_call(
+            response, template=endpoint_template(endpoint), caller=caller
+        )
+
+        return response
+
+    async def _send(
+        self,
+        prepared: requests.PreparedRequest,
+        timeout: float = None,
+        **kwargs,
+    ) -> Response:
+        """Send a prepared request with aiohttp"""
+        # aiohttp takes longer to import than the rest of the framework,
+        # so sync-only test runs never import it
+        import aiohttp
+        from yarl import URL
+
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections)
+            )
+        if timeout is not None:
+            kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+        started = time.perf_counter()
+        async with self.session.request(
+            method=prepared.method,
+            # Keep the URL exactly as requests encoded it
+            url=URL(prepared.url, encoded=True),
+            headers=dict(prepared.headers),
+            data=prepared.body,
+            **kwargs,
+        ) as client_response:
+            elapsed = time.perf_counter() - started
+            content = await client_response.read()
+
+        return self._build_response(prepared, client_response, content, elapsed)
+
+    @staticmethod
+    def _build_response(
+        prepared: requests.PreparedRequest,
+        client_response: "aiohttp.ClientResponse",
+        content: bytes,
+        elapsed: float,
+    ) -> Response:
+        """Convert an aiohttp response into a requests.Response"""
+        response = Response()
+        response.status_code = client_response.status
+        response.reason = client_response.reason
+        response.headers = CaseInsensitiveDict(client_response.headers)
+        response.url = str(client_response.url)
+        response.encoding = requests.utils.get_encoding_from_headers(
+            response.headers
+        )
+        response.elapsed = timedelta(seconds=elapsed)
+        response.request = prepared
+        response._content = content
+        return response
+
+    async def get_json(self, endpoint: str, **kwargs) -> dict | list:
+        """
+        Send GET request and return JSON response
+
+        Args:
+            endpoint: API endpoint
+            **kwargs: Additional arguments to pass to get method
+
+        Returns:
+            JSON response as dictionary
+        """
+        response = await self.get(endpoint, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def post_json(self, endpoint: str, json_data: Any, **kwargs) -> dict:
+        """
+        Send POST request with JSON data and return JSON response
+
+        Args:
+            endpoint: API endpoint
+            json_data: JSON data to send
+            **kwargs: Additional arguments to pass to the Post method
+
+        Returns:
+            JSON response as dictionary
+        """
+        response = await self.post(endpoint, json_data=json_data, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pool"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
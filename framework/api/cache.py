@@ -0,0 +1,398 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Optional
+
+from requests import PreparedRequest, Response
+from requests.structures import CaseInsensitiveDict
+
+DAY = 24 * 60 * 60
+
+# Set while responses must not be shared between requests (response cache,
+# coalescing of concurrent requests), e.g. in latency tests
+cache_bypassed: ContextVar[bool] = ContextVar("cache_bypassed", default=False)
+
+
+@contextmanager
+def bypass_cache() -> Iterator[None]:
+    """Send every request made in this context to the server"""
+    token = cache_bypassed.set(True)
+    try:
+        yield
+    finally:
+        cache_bypassed.reset(token)
+
+
+def cache_directives(headers: dict) -> dict[str, Optional[str]]:
+    """Directives of a Cache-Control header, e.g. {"max-age": "60"}"""
+    directives = {}
+    for directive in (
+        CaseInsensitiveDict(headers).get("Cache-Control", "").split(",")
+    ):
+        name, _, value = directive.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def freshness_lifetime(directives: dict[str, Optional[str]]) -> Optional[float]:
+    """
+    Seconds a response may be served without revalidation
+
+    Returns:
+        0 for no-cache (stored, but revalidated before every use), the
+        max-age directive, or None when the server does not say
+    """
+    if "no-cache" in directives:
+        return 0.0
+    try:
+        return max(0.0, float(directives["max-age"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class CacheEntry:
+    """Stored response of an idempotent request"""
+
+    url: str
+    status_code: int
+    reason: Optional[str]
+    headers: dict
+    encoding: Optional[str]
+    content: bytes
+    stored_at: float
+    # Freshness lifetime set by the server, the cache TTL when None
+    max_age: Optional[float] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.content) + sum(
+            len(name) + len(value) for name, value in self.headers.items()
+        )
+
+    def is_fresh(self, ttl: float) -> bool:
+        lifetime = ttl if self.max_age is None else self.max_age
+        return time.time() - self.stored_at < lifetime
+
+    def conditional_headers(self) -> dict:
+        """Headers asking the server to revalidate the stored response"""
+        stored_headers = CaseInsensitiveDict(self.headers)
+        headers = {}
+        if "ETag" in stored_headers:
+            headers["If-None-Match"] = stored_headers["ETag"]
+        if "Last-Modified" in stored_headers:
+            headers["If-Modified-Since"] = stored_headers["Last-Modified"]
+        return headers
+
+    @classmethod
+    def from_response(cls, response: Response) -> "CacheEntry":
+        return cls(
+            url=response.url,
+            status_code=response.status_code,
+            reason=response.reason,
+            headers=dict(response.headers),
+            encoding=response.encoding,
+            content=response.content,
+            stored_at=time.time(),
+            max_age=freshness_lifetime(cache_directives(response.headers)),
+        )
+
+    def to_response(self) -> Response:
+        """Build a response served from the cache"""
+        request = PreparedRequest()
+        request.method = "GET"
+        request.url = self.url
+        request.headers = CaseInsensitiveDict()
+        request.body = None
+
+        response = Response()
+        response.url = self.url
+        response.status_code = self.status_code
+        response.reason = self.reason
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        response.elapsed = timedelta(0)
+        response.request = request
+        response._content = self.content
+        response.from_cache = True
+        return response
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Response cache counters"""
+
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    evictions: int = 0
+    stores: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"hits={self.hits}, misses={self.misses}, "
+            f"revalidations={self.revalidations}, "
+            f"evictions={self.evictions}, stores={self.stores}, "
+            f"hit_ratio={self.hit_ratio:.2%}"
+        )
+
+
+class MemoryCacheBackend:
+    """In-memory LRU storage bounded by the total size of entries"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous.size
+            self._entries[key] = entry
+            self.size += entry.size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= evicted.size
+                self.evictions += 1
+
+
+class DiskCacheBackend:
+    """
+    SQLite storage shared between test runs
+
+    Entries older than max_age seconds are evicted, then the oldest ones
+    until the entries fit into max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: float = 7 * DAY,
+    ):
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            columns = [
+                row[1]
+                for row in self._connection.execute(
+                    "PRAGMA table_info(responses)"
+                )
+            ]
+            # A file without the eviction columns is dropped and rebuilt
+            if columns and "size" not in columns:
+                self._connection.execute("DROP TABLE responses")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, "
+                "entry TEXT, content BLOB, stored_at REAL, size INTEGER)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_stored_at "
+                "ON responses (stored_at)"
+            )
+            self._evict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT entry, content FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(**json.loads(row[0]), content=row[1])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        if entry.size > self.max_bytes:
+            return
+        fields = asdict(entry)
+        content = fields.pop("content")
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(fields), content, entry.stored_at, entry.size),
+            )
+            # Writes follow a request to the server, which outweighs the
+            # scan of the entry sizes
+            self._evict()
+
+    def _evict(self) -> None:
+        # Called under the lock, in a transaction
+        evicted = self._connection.execute(
+            "DELETE FROM responses WHERE stored_at < ?",
+            (time.time() - self.max_age,),
+        ).rowcount
+        evicted += self._connection.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM (SELECT key, SUM(size) OVER "
+            "(ORDER BY stored_at DESC, key) AS total FROM responses) "
+            "WHERE total > ?)",
+            (self.max_bytes,),
+        ).rowcount
+        self.evictions += evicted
+
+
+class ResponseCache:
+    """
+    Cache for idempotent GET responses
+
+    Fresh entries (younger than the max-age of their Cache-Control header,
+    or the TTL without one) are served without a request; no-cache entries
+    are never fresh. Stale entries with an ETag or Last-Modified header are
+    revalidated with a conditional request and reused on 304 Not Modified.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 300,
+        max_bytes: int = 64 * 1024 * 1024,
+        disk_path: str = None,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+        disk_max_age: float = 7 * DAY,
+        vary_headers: tuple[str, ...] = ("Accept", "Accept-Language"),
+    ):
+        """
+        Args:
+            ttl: Seconds a stored response is served without revalidation,
+                unless its Cache-Control header says otherwise
+            max_bytes: Memory limit for stored responses
+            disk_path: SQLite file to keep responses between runs
+            disk_max_bytes: Size limit of the SQLite file entries
+            disk_max_age: Seconds an entry is kept in the SQLite file since
+                it was stored or revalidated
+            vary_headers: Request headers that are part of the cache key
+        """
+        self.ttl = ttl
+        self.vary_headers = vary_headers
+        self.memory = MemoryCacheBackend(max_bytes)
+        self.disk = (
+            DiskCacheBackend(disk_path, disk_max_bytes, disk_max_age)
+            if disk_path
+            else None
+        )
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._stores = 0
+        self._lock = threading.Lock()
+
+    def key(self, url: str, params: dict = None, headers: dict = None) -> str:
+        """
+        Build the cache key of a GET request
+
+        Args:
+            url: Full request URL
+            params: Query parameters
+            headers: Request headers
+
+        Returns:
+            Hash of the URL, the sorted parameters and vary headers
+        """
+        headers = CaseInsensitiveDict(headers or {})
+        parts = [
+            "GET",
+            url,
+            json.dumps(sorted((params or {}).items()), default=str),
+            *(f"{name}:{headers.get(name, '')}" for name in self.vary_headers),
+        ]
+        return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+    def lookup(self, key: str) -> tuple[Optional[CacheEntry], bool]:
+        """
+        Find a stored response
+
+        Returns:
+            Stored entry or None, and whether it can be served as is
+        """
+        entry = self.memory.get(key)
+        if entry is None and self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                self.memory.set(key, entry)
+
+        fresh = entry is not None and entry.is_fresh(self.ttl)
+        with self._lock:
+            if fresh:
+                self._hits += 1
+            else:
+                self._misses += 1
+        return entry, fresh
+
+    def store(self, key: str, response: Response) -> None:
+        """Store a successful response unless the server forbids it"""
+        if response.status_code != 200:
+            return
+        if "no-store" in cache_directives(response.headers):
+            return
+        self._save(key, CacheEntry.from_response(response))
+
+    def revalidated(
+        self, key: str, entry: CacheEntry, response: Response = None
+    ) -> Response:
+        """
+        Mark a stale entry as fresh after a 304 response
+
+        Args:
+            key: Cache key
+            entry: Stale entry
+            response: 304 response, whose Cache-Control header replaces the
+                stored one
+        """
+        with self._lock:
+            self._revalidations += 1
+        if response is not None and "Cache-Control" in response.headers:
+            headers = CaseInsensitiveDict(entry.headers)
+            headers["Cache-Control"] = response.headers["Cache-Control"]
+            entry.headers = dict(headers)
+            entry.max_age = freshness_lifetime(
+                cache_directives(response.headers)
+            )
+        entry.stored_at = time.time()
+        self._save(key, entry)
+        return entry.to_response()
+
+    def _save(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._stores += 1
+        self.memory.set(key, entry)
+        if self.disk is not None:
+            self.disk.set(key, entry)
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            revalidations=self._revalidations,
+            evictions=self.memory.evictions
+            + (self.disk.evictions if self.disk is not None else 0),
+            stores=self._stores,
+        )
@@ -0,0 +1,314 @@
+"""
+Record and replay of HTTP responses ("cassettes").
+
+A cassette is a pair of files: "<path>.data" with zlib-compressed
+responses appended one after another, and "<path>.idx" with fixed-size
+entries sorted by request key. The index is memory-mapped and searched
+with a binary search, so a lookup reads only the index pages it touches
+and the single record it finds.
+
+Several processes, e.g. pytest-xdist workers, can record to one cassette:
+records are appended under an exclusive lock of the data file, and each
+process merges its entries into the index on disk when it closes.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Literal, Optional
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+CassetteMode = Literal["record", "replay", "auto"]
+
+# SHA-1 request key, record offset and length
+INDEX_ENTRY = struct.Struct(">20sQI")
+
+
+class CassetteMiss(LookupError):
+    """Request has no recorded response in replay mode"""
+
+
+def request_key(request: PreparedRequest) -> bytes:
+    """Key of a request: hash of its method, URL and body hash"""
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode()
+    return hashlib.sha1(
+        f"{request.method}\n{request.url}\n".encode()
+        + hashlib.sha1(body).digest()
+    ).digest()
+
+
+def erase_cassette(path: str) -> None:
+    """
+    Delete the files of a cassette, e.g. before recording it again
+
+    Args:
+        path: Cassette path without extension
+    """
+    for extension in (".data", ".idx"):
+        if os.path.exists(f"{path}{extension}"):
+            os.remove(f"{path}{extension}")
+
+
+class Cassette:
+    """On-disk store of recorded responses"""
+
+    def __init__(self, path: str, truncate: bool = False):
+        """
+        Args:
+            path: Cassette path without extension
+            truncate: Start an empty cassette, e.g. to refresh recordings;
+                processes recording together erase it once instead, with
+                erase_cassette()
+        """
+        self.data_path = f"{path}.data"
+        self.index_path = f"{path}.idx"
+        if truncate:
+            erase_cassette(path)
+
+        self._data = open(self.data_path, "ab+")
+        self._index: Optional[mmap.mmap] = None
+        self._index_entries = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "rb") as index_file:
+                if os.fstat(index_file.fileno()).st_size:
+                    self._index = mmap.mmap(
+                        index_file.fileno(), 0, access=mmap.ACCESS_READ
+                    )
+                    self._index_entries = len(self._index) // INDEX_ENTRY.size
+        # Records added since the index was written
+        self._new_entries: dict[bytes, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def _find(self, key: bytes) -> Optional[tuple[int, int]]:
+        if key in self._new_entries:
+            return self._new_entries[key]
+
+        low, high = 0, self._index_entries
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, offset, length = INDEX_ENTRY.unpack_from(
+                self._index, middle * INDEX_ENTRY.size
+            )
+            if entry_key < key:
+                low = middle + 1
+            elif entry_key > key:
+                high = middle
+            else:
+                return offset, length
+        return None
+
+    def get(self, key: bytes) -> Optional[dict]:
+        """
+        Find a recorded response
+
+        Returns:
+            Response fields with "content" bytes, or None
+        """
+        with self._lock:
+            location = self._find(key)
+            if location is None:
+                return None
+            offset, length = location
+            # Reads and appends share the file position, hence the lock
+            self._data.seek(offset)
+            compressed = self._data.read(length)
+
+        record = zlib.decompress(compressed)
+        body_start = 4 + int.from_bytes(record[:4], "big")
+        fields = json.loads(record[4:body_start])
+        fields["content"] = record[body_start:]
+        return fields
+
+    def put(self, key: bytes, response: Response, elapsed: float) -> None:
+        """
+        Append a response to the cassette
+
+        Args:
+            key: Request key
+            response: Response with its body read
+            elapsed: Seconds the response took to arrive
+        """
+        header = json.dumps(
+            {
+                "status_code": response.status_code,
+                "reason": response.reason,
+                "headers": dict(response.headers),
+                "encoding": response.encoding,
+                "url": response.url,
+                "elapsed": elapsed,
+            }
+        ).encode()
+        record = zlib.compress(
+            len(header).to_bytes(4, "big") + header + response.content
+        )
+        with self._lock, self._file_locked():
+            self._data.seek(0, os.SEEK_END)
+            offset = self._data.tell()
+            self._data.write(record)
+            self._data.flush()
+            self._new_entries[key] = (offset, len(record))
+
+    @contextmanager
+    def _file_locked(self) -> Iterator[None]:
+        # Other processes appending to the data file or rewriting the index
+        # wait for this one
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._data.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._data.fileno(), fcntl.LOCK_UN)
+
+    def _read_index(self) -> dict[bytes, tuple[int, int]]:
+        # The index on disk, with entries written by other processes since
+        # this one opened it
+        entries = {}
+        if not os.path.exists(self.index_path):
+            return entries
+        with open(self.index_path, "rb") as index_file:
+            data = index_file.read()
+        for key, offset, length in INDEX_ENTRY.iter_unpack(data):
+            entries[key] = (offset, length)
+        return entries
+
+    def close(self) -> None:
+        """Merge new records into the index and close the files"""
+        with self._lock:
+            if self._data.closed:
+                return
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+            self._index_entries = 0
+
+            with self._file_locked():
+                # Replace the index at once, so readers never see a partial
+                # one
+                if self._new_entries:
+                    entries = self._read_index()
+                    entries.update(self._new_entries)
+                    temporary_path = f"{self.index_path}.{os.getpid()}.tmp"
+                    with open(temporary_path, "wb") as index_file:
+                        for key in sorted(entries):
+                            index_file.write(
+                                INDEX_ENTRY.pack(key, *entries[key])
+                            )
+                    os.replace(temporary_path, self.index_path)
+                    self._new_entries = {}
+            self._data.close()
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    Transport adapter that records responses of another adapter to a
+    cassette and replays them without network access
+
+    The cassette is shared and closed by its owner, not by the adapter.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        adapter: BaseAdapter = None,
+        mode: CassetteMode = "auto",
+        latency_scale: float = 0.0,
+    ):
+        """
+        Args:
+            cassette: Cassette to record to and replay from
+            adapter: Adapter sending requests that are not replayed, not
+                needed when only lookup() and record() are used
+            mode: "record" - always send and record, "replay" - only replay
+                and raise CassetteMiss for unknown requests, "auto" - replay
+                known requests and record the rest
+            latency_scale: Share of the recorded latency to wait before
+                replaying a response, 0 - reply at once, 1 - as recorded
+        """
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+        self.mode = mode
+        self.latency_scale = latency_scale
+
+    def lookup(
+        self, request: PreparedRequest
+    ) -> tuple[bytes, Optional[Response]]:
+        """
+        Find the recorded response of a request
+
+        Args:
+            request: Prepared request
+
+        Returns:
+            Request key, and the response to replay (its elapsed time is the
+            latency to simulate) or None if the request must be sent
+        """
+        key = request_key(request)
+        if self.mode == "record":
+            return key, None
+
+        fields = self.cassette.get(key)
+        if fields is None:
+            if self.mode == "replay":
+                raise CassetteMiss(
+                    f"No recorded response for {request.method} {request.url}"
+                )
+            return key, None
+
+        response = Response()
+        response.status_code = fields["status_code"]
+        response.reason = fields["reason"]
+        response.headers = CaseInsensitiveDict(fields["headers"])
+        response.encoding = fields["encoding"]
+        response.url = fields["url"]
+        response.request = request
+        response.elapsed = timedelta(
+            seconds=fields["elapsed"] * self.latency_scale
+        )
+        response._content = fields["content"]
+        response._content_consumed = True
+        response.from_cassette = True
+        return key, response
+
+    def record(self, key: bytes, response: Response, elapsed: float) -> None:
+        """Store a received response unless the cassette is only replayed"""
+        if self.mode != "replay":
+            self.cassette.put(key, response, elapsed)
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        key, response = self.lookup(request)
+        if response is not None:
+            time.sleep(response.elapsed.total_seconds())
+            return response
+
+        started = time.perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        # Read the body to record it, streamed responses included
+        content = response.content
+        self.record(key, response, time.perf_counter() - started)
+        response._content = content
+        return response
+
+    def close(self) -> None:
+        if self.adapter is not None:
+            self.adapter.close()
@@ -1,35 +1,55 @@
+class Endpoint(str):
+    """Endpoint path that keeps the template it was built from"""
+
+    template: str
+
+    def __new__(cls, template: str, **params: str) -> "Endpoint":
+        endpoint = super().__new__(cls, template.format(**params))
+        endpoint.template = template
+        return endpoint
+
+
 class AuthorAPI:
     """Endpoints for Author API"""
 
-    base = "/author"
+    base = Endpoint("/author")
+
+    @staticmethod
+    def by_name(name: str, exact: bool = False) -> Endpoint:
+        """Get author by name endpoint, partial name match unless exact"""
+        if exact:
+            return Endpoint("/author/{name}:abs", name=name)
+        return Endpoint("/author/{name}", name=name)
 
     @staticmethod
-    def by_name(name: str) -> str:
-        """Get author by name endpoint"""
-        return f"/author/{name}"
+    def titles_by_name(name: str, exact: bool = False) -> Endpoint:
+        """Get titles of author's poems endpoint"""
+        if exact:
+            return Endpoint("/author/{name}:abs/title", name=name)
+        return Endpoint("/author/{name}/title", name=name)
 
 
 class TitleAPI:
     """Endpoints for Title API"""
 
-    base = "/title"
+    base = Endpoint("/title")
 
     @staticmethod
-    def by_name(name: str) -> str:
+    def by_name(name: str) -> Endpoint:
         """Get title by name endpoint"""
-        return f"/title/{name}"
+        return Endpoint("/title/{name}", name=name)
 
 
 class RandomAPI:
     """Endpoints for Random API"""
 
-    base = "/random"
+    base = Endpoint("/random")
 
 
 class LinesAPI:
     """Endpoints for Lines API"""
 
     @staticmethod
-    def by_line_text(text: str) -> str:
+    def by_line_text(text: str) -> Endpoint:
         """Get lines by number endpoint"""
-        return f"/lines/{text}"
+        return Endpoint("/lines/{text}", text=text)
@@ -1,4 +1,10 @@
-from pydantic import BaseModel
+import json
+import time
+
+from pydantic import BaseModel, TypeAdapter
+from requests import Response
+
+from framework.logger import APILogger
 
 
 class PoemResponse(BaseModel):
@@ -8,9 +14,65 @@ class PoemResponse(BaseModel):
     linecount: str
 
 
+class PoemTitle(BaseModel):
+    """Poem with only the title output field"""
+
+    title: str
+
+
 class AuthorsResponse(BaseModel):
     authors: list[str]
 
 
 class TitlesResponse(BaseModel):
     titles: list[str]
+
+
+# Validates a whole JSON body in a single pass of the pydantic core
+PoemListAdapter = TypeAdapter(list[PoemResponse])
+PoemTitleListAdapter = TypeAdapter(list[PoemTitle])
+
+
+def is_not_found(content: bytes) -> bool:
+    """
+    Check whether a response body reports a resource that does not exist
+
+    Args:
+        content: Raw JSON response body
+
+    Returns:
+        True for the {"status": 404} body PoetryDB answers with a 200
+    """
+    # Found resources are JSON arrays, errors are objects with a status
+    if not content.lstrip().startswith(b"{"):
+        return False
+    return json.loads(content).get("status") == 404
+
+
+def parse_poems(
+    content: bytes, response: Response = None
+) -> list[PoemResponse]:
+    """
+    Parse a list of poems from a response body
+
+    Args:
+        content: Raw JSON response body
+        response: Response the body belongs to; if it has timings, JSON
+            decode and validation run as two separate timed passes and
+            are logged in a follow-up record of the call
+
+    Returns:
+        List of poems
+    """
+    timings = getattr(response, "timings", None)
+    if timings is not None:
+        started = time.perf_counter()
+        items = json.loads(content)
+        decoded = time.perf_counter()
+        poems = PoemListAdapter.validate_python(items)
+        timings.json_decode = decoded - started
+        timings.validation = time.perf_counter() - decoded
+        APILogger.log_parse(response)
+        return poems
+
+    return PoemListAdapter.validate_json(content)
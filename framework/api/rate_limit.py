@@ -0,0 +1,303 @@
+"""
+Client-side rate limits per endpoint template.
+
+Every limit is a token bucket (requests per second with a burst) plus a
+cap on requests in flight. Limits are kept either in memory, shared by
+the threads of one process, or in small lock files under a directory,
+shared by all processes using it, e.g. pytest-xdist workers, so parallel
+workers respect one global budget.
+"""
+
+import os
+import re
+import struct
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Tokens left and the time they were counted at
+BUCKET_STATE = struct.Struct("dd")
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Budget of an endpoint template"""
+
+    # Requests per second, None - unlimited
+    rate: Optional[float] = None
+    # Requests allowed at once after an idle period, the rate by default
+    burst: Optional[float] = None
+    # Requests in flight at the same time, None - unlimited
+    max_in_flight: Optional[int] = None
+
+    @property
+    def capacity(self) -> float:
+        return self.burst or max(1.0, self.rate)
+
+
+@dataclass(frozen=True)
+class RateLimitStats:
+    """Requests of an endpoint template and how long they were held back"""
+
+    requests: int = 0
+    throttled: int = 0
+    waited: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"requests={self.requests}, throttled={self.throttled}, "
+            f"waited={self.waited:.3f} s"
+        )
+
+
+def parse_rate_limits(spec: str) -> dict[str, RateLimit]:
+    """
+    Parse rate limits, e.g. "*=50/100:8; /lines/{text}=5:2"
+
+    Args:
+        spec: "template=rate[/burst][:max_in_flight]" items separated by
+            ";", "*" is the limit of other endpoints and an empty rate
+            means no rate limit
+
+    Returns:
+        Limits by endpoint template
+    """
+    limits = {}
+    for item in filter(None, (item.strip() for item in spec.split(";"))):
+        match = re.fullmatch(
+            r"(\S+)\s*=\s*([\d.]*)\s*(?:/\s*([\d.]+))?\s*(?::\s*(\d+))?",
+            item,
+        )
+        if match is None or (match[3] and not match[2]):
+            raise ValueError(f"Invalid rate limit: {item!r}")
+        template, rate, burst, max_in_flight = match.groups()
+        limits[template] = RateLimit(
+            rate=float(rate) if rate else None,
+            burst=float(burst) if burst else None,
+            max_in_flight=int(max_in_flight) if max_in_flight else None,
+        )
+    return limits
+
+
+class TokenBucket:
+    """Token bucket of one process"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _take(
+        tokens: float, updated: float, now: float, rate: float, capacity: float
+    ) -> tuple[float, float]:
+        # Tokens may go negative: each caller reserves the next free slot,
+        # so waiting callers are served in order instead of polling
+        tokens = min(capacity, tokens + (now - updated) * rate) - 1
+        return tokens, max(0.0, -tokens / rate)
+
+    def reserve(self) -> float:
+        """Take a token and return seconds to wait before using it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens, wait = self._take(
+                self._tokens, self._updated, now, self.rate, self.capacity
+            )
+            self._updated = now
+        return wait
+
+
+class FileTokenBucket(TokenBucket):
+    """Token bucket stored in a file and shared by the processes using it"""
+
+    def __init__(self, path: str, rate: float, capacity: float):
+        if fcntl is None:
+            raise RuntimeError("Shared rate limits need fcntl (POSIX)")
+        super().__init__(rate, capacity)
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def reserve(self) -> float:
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                state = os.pread(self._fd, BUCKET_STATE.size, 0)
+                # Wall clock time, comparable between processes
+                now = time.time()
+                tokens, updated = (
+                    BUCKET_STATE.unpack(state)
+                    if len(state) == BUCKET_STATE.size
+                    else (self.capacity, now)
+                )
+                tokens, wait = self._take(
+                    tokens, updated, now, self.rate, self.capacity
+                )
+                os.pwrite(self._fd, BUCKET_STATE.pack(tokens, now), 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return wait
+
+
+class FileSemaphore:
+    """
+    Semaphore shared by processes through one lock file per slot
+
+    Slots are held with flock, so the slots of a crashed process are
+    released by the operating system.
+    """
+
+    def __init__(self, path: str, value: int, poll_interval: float = 0.005):
+        if fcntl is None:
+            raise RuntimeError("Shared rate limits need fcntl (POSIX)")
+        self.poll_interval = poll_interval
+        self._free = [
+            os.open(f"{path}.{slot}", os.O_RDWR | os.O_CREAT, 0o644)
+            for slot in range(value)
+        ]
+        self._lock = threading.Lock()
+
+    def acquire(self) -> int:
+        """Wait for a free slot and return its file descriptor"""
+        while True:
+            with self._lock:
+                for fd in self._free:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        continue
+                    self._free.remove(fd)
+                    return fd
+            time.sleep(self.poll_interval)
+
+    def release(self, fd: int) -> None:
+        with self._lock:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            self._free.append(fd)
+
+
+class _Governor:
+    """Rate and concurrency limit of one endpoint template"""
+
+    def __init__(self, limit: RateLimit, path: str = None):
+        self.bucket = None
+        self.slots = None
+        self.semaphore = None
+        if limit.rate:
+            self.bucket = (
+                FileTokenBucket(f"{path}.bucket", limit.rate, limit.capacity)
+                if path
+                else TokenBucket(limit.rate, limit.capacity)
+            )
+        if limit.max_in_flight:
+            if path:
+                self.slots = FileSemaphore(f"{path}.slot", limit.max_in_flight)
+            else:
+                self.semaphore = threading.BoundedSemaphore(limit.max_in_flight)
+        self.requests = 0
+        self.throttled = 0
+        self.waited = 0.0
+
+
+class RateLimiter:
+    """Rate and concurrency limits of APIClient requests"""
+
+    def __init__(
+        self,
+        limits: dict[str, RateLimit],
+        shared_directory: str = None,
+    ):
+        """
+        Args:
+            limits: Limits by endpoint template, "*" applies to templates
+                without their own limit
+            shared_directory: Directory of lock files to share the limits
+                with other processes, None - limits of this process only
+        """
+        self.limits = limits
+        self.shared_directory = shared_directory
+        if shared_directory:
+            os.makedirs(shared_directory, exist_ok=True)
+        self._governors: dict[str, Optional[_Governor]] = {}
+        self._lock = threading.Lock()
+
+    def _governor(self, template: str) -> Optional[_Governor]:
+        with self._lock:
+            if template in self._governors:
+                return self._governors[template]
+            key = template if template in self.limits else "*"
+            limit = self.limits.get(key)
+            governor = None
+            if limit is not None:
+                path = None
+                if self.shared_directory:
+                    name = re.sub(r"[^\w.-]+", "_", key).strip("_") or "all"
+                    path = os.path.join(self.shared_directory, name)
+                # Templates sharing the "*" limit share one budget
+                governor = self._governors.get(key) or _Governor(limit, path)
+                self._governors[key] = governor
+            self._governors[template] = governor
+            return governor
+
+    @contextmanager
+    def limit(self, template: str) -> Iterator[None]:
+        """
+        Hold a request back until its endpoint has budget for it
+
+        Args:
+            template: Endpoint template, e.g. "/lines/{text}"
+        """
+        governor = self._governor(template)
+        if governor is None:
+            yield
+            return
+
+        started = time.perf_counter()
+        if governor.bucket is not None:
+            wait = governor.bucket.reserve()
+            if wait > 0:
+                time.sleep(wait)
+        slot = None
+        if governor.slots is not None:
+            slot = governor.slots.acquire()
+        elif governor.semaphore is not None:
+            governor.semaphore.acquire()
+        waited = time.perf_counter() - started
+
+        with self._lock:
+            governor.requests += 1
+            # Ignore the overhead of taking a free slot
+            if waited > 0.001:
+                governor.throttled += 1
+                governor.waited += waited
+        try:
+            yield
+        finally:
+            if slot is not None:
+                governor.slots.release(slot)
+            elif governor.semaphore is not None:
+                governor.semaphore.release()
+
+    def stats(self) -> dict[str, RateLimitStats]:
+        """
+        Get requests held back per limit
+
+        Returns:
+            Request counters by the template of the limit
+        """
+        with self._lock:
+            return {
+                key: RateLimitStats(
+                    governor.requests, governor.throttled, governor.waited
+                )
+                for key, governor in self._governors.items()
+                if governor is not None and key in self.limits
+            }
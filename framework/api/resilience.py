@@ -0,0 +1,233 @@
+"""
+Policies protecting test runs from a slow or failing upstream.
+
+RetryPolicy resends idempotent requests after connection errors and
+retryable status codes with jittered exponential backoff, honouring
+Retry-After. HedgePolicy sends a second copy of an idempotent request
+that is slower than usual and takes whichever response arrives first.
+CircuitBreaker fails calls to an endpoint fast once most of its recent
+calls failed, instead of waiting for timeouts on every remaining test.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from requests import Response
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Call rejected because the endpoint's circuit breaker is open"""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """When and how long to wait before resending a request"""
+
+    # Attempts after the first one
+    retries: int = 2
+    # First backoff in seconds, doubled on every retry
+    backoff: float = 0.1
+    max_backoff: float = 5.0
+    statuses: frozenset[int] = frozenset({429, 502, 503, 504})
+    methods: frozenset[str] = IDEMPOTENT_METHODS
+    # Longest Retry-After to wait for, longer waits return the response
+    max_retry_after: float = 30.0
+
+    def should_retry(
+        self,
+        method: str,
+        attempt: int,
+        response: Response = None,
+        error: Exception = None,
+    ) -> bool:
+        """
+        Check whether a failed attempt should be repeated
+
+        Args:
+            method: HTTP method
+            attempt: Number of the failed attempt, starting at 0
+            response: Response of the attempt, if one was received
+            error: Exception raised by the attempt
+
+        Returns:
+            True if the request may be sent again
+        """
+        if attempt >= self.retries or method not in self.methods:
+            return False
+        if error is not None:
+            return isinstance(
+                error, (requests.ConnectionError, requests.Timeout)
+            ) and not isinstance(error, CircuitOpenError)
+        if response.status_code not in self.statuses:
+            return False
+        retry_after = self.retry_after(response)
+        return retry_after is None or retry_after <= self.max_retry_after
+
+    def delay(self, attempt: int, response: Response = None) -> float:
+        """
+        Seconds to wait before the next attempt
+
+        Full jitter: a random wait up to the exponential backoff, so
+        parallel workers hitting the same failure do not retry in lockstep.
+        A Retry-After header of the response takes precedence.
+        """
+        retry_after = (
+            self.retry_after(response) if response is not None else None
+        )
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(
+            0, min(self.max_backoff, self.backoff * 2**attempt)
+        )
+
+    @staticmethod
+    def retry_after(response: Response) -> Optional[float]:
+        """Wait in seconds requested by a Retry-After header"""
+        value = response.headers.get("Retry-After")
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(
+                0.0, parsedate_to_datetime(value).timestamp() - time.time()
+            )
+        except (TypeError, ValueError):
+            return None
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """When to send a backup copy of a slow idempotent request"""
+
+    # Fixed wait in seconds before hedging, None - the endpoint percentile
+    delay: Optional[float] = None
+    # Latency percentile of the endpoint used as the wait
+    percentile: float = 95
+    # Calls of the endpoint to see before hedging on its percentile
+    min_samples: int = 20
+    methods: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker over a window of recent calls
+
+    A circuit opens when the failure rate of the last `window` calls
+    reaches `failure_threshold`; its calls then fail at once with
+    CircuitOpenError. After `reset_timeout` seconds a single trial call
+    is let through: success closes the circuit, failure opens it again.
+    Only the outcome of the trial call decides, calls let through before
+    the circuit opened are not counted while it is open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+    ):
+        """
+        Args:
+            failure_threshold: Failure rate opening the circuit, 0-1
+            window: Number of recent calls the rate is computed over
+            min_calls: Calls needed in the window before the circuit opens
+            reset_timeout: Seconds before a trial call to an open circuit
+        """
+        self.failure_threshold = failure_threshold
+        self.window = window
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self._calls: dict[str, deque[bool]] = {}
+        # Time circuits opened at
+        self._opened: dict[str, float] = {}
+        # Token of the trial call in flight of half-open circuits
+        self._trials: dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def before_call(self, key: str) -> Optional[object]:
+        """
+        Let a call through or reject it
+
+        Args:
+            key: Endpoint, e.g. "GET /author/{name}"
+
+        Returns:
+            Trial token if the call is the trial call of an open circuit,
+            to pass to record() or cancel(); None for a regular call
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        with self._lock:
+            opened = self._opened.get(key)
+            if opened is None:
+                return None
+            if (
+                key not in self._trials
+                and time.monotonic() - opened >= self.reset_timeout
+            ):
+                trial = self._trials[key] = object()
+                return trial
+        raise CircuitOpenError(
+            f"Circuit breaker for {key} is open after repeated failures"
+        )
+
+    def record(self, key: str, failed: bool, trial: object = None) -> None:
+        """
+        Record the outcome of a call let through by before_call()
+
+        Args:
+            key: Endpoint
+            failed: The call raised a connection error or returned 5xx
+            trial: Token returned by before_call() for the call
+        """
+        with self._lock:
+            if key in self._opened:
+                if trial is None or self._trials.get(key) is not trial:
+                    return
+                del self._trials[key]
+                if failed:
+                    self._opened[key] = time.monotonic()
+                    return
+                del self._opened[key]
+                self._calls.pop(key, None)
+
+            calls = self._calls.get(key)
+            if calls is None:
+                calls = self._calls[key] = deque(maxlen=self.window)
+            calls.append(failed)
+            if (
+                len(calls) >= self.min_calls
+                and sum(calls) / len(calls) >= self.failure_threshold
+            ):
+                self._opened[key] = time.monotonic()
+
+    def cancel(self, key: str, trial: object) -> None:
+        """
+        Give up a trial call without an outcome, e.g. after an error that
+        says nothing about the endpoint; the next call becomes the trial
+
+        Args:
+            key: Endpoint
+            trial: Token returned by before_call() for the call
+        """
+        with self._lock:
+            if trial is not None and self._trials.get(key) is trial:
+                del self._trials[key]
+
+    def open_circuits(self) -> list[str]:
+        """Endpoints whose circuit is currently open"""
+        with self._lock:
+            return sorted(self._opened)
@@ -1,8 +1,22 @@
+from collections.abc import AsyncIterator, Iterable, Iterator
+from functools import partial
+
 from requests import Response
 
 from framework.api.api_client import APIClient
+from framework.api.async_api_client import AsyncAPIClient
 from framework.api.endpoints import AuthorAPI
-from framework.api.models.response_types import AuthorsResponse, PoemResponse
+from framework.api.models.response_types import (
+    AuthorsResponse,
+    PoemResponse,
+    PoemTitle,
+    PoemTitleListAdapter,
+    is_not_found,
+    parse_poems,
+)
+from framework.api.services.batch import gather_distinct, map_distinct
+from framework.api.streaming import iter_models
+from framework.logger import get_caller
 from settings import API_URL
 
 
@@ -20,7 +34,7 @@ class AuthorService:
             List of authors
         """
         response = self.api_client.get(AuthorAPI.base)
-        authors = AuthorsResponse.model_validate(response.json())
+        authors = AuthorsResponse.model_validate_json(response.content)
         return authors, response
 
     def get_poems_by_author(
@@ -36,5 +50,158 @@ class AuthorService:
             Poems data
         """
         response = self.api_client.get(AuthorAPI.by_name(author))
-        poems = [PoemResponse.model_validate(item) for item in response.json()]
+        poems = parse_poems(response.content, response)
+        return poems, response
+
+    def get_poems_by_authors(
+        self, authors: Iterable[str], max_workers: int = None
+    ) -> Iterator[tuple[str, list[PoemResponse], Response]]:
+        """
+        Get poems of many authors concurrently
+
+        Args:
+            authors: Author names, matched exactly
+            max_workers: Number of requests in flight, the pool size by default
+
+        Returns:
+            Author names with their poems, in the order responses arrive;
+            repeated names are requested and returned once, unknown ones
+            with no poems
+        """
+        for author, response in map_distinct(
+            self.api_client,
+            authors,
+            partial(AuthorAPI.by_name, exact=True),
+            max_workers,
+        ):
+            if is_not_found(response.content):
+                yield author, [], response
+                continue
+            poems = parse_poems(response.content, response)
+            yield author, poems, response
+
+    def get_titles_by_author(
+        self, author: str
+    ) -> tuple[list[PoemTitle], Response]:
+        """
+        Get titles of author's poems
+
+        Args:
+            author: Author name
+
+        Returns:
+            Titles without the rest of the poems
+        """
+        response = self.api_client.get(AuthorAPI.titles_by_name(author))
+        titles = PoemTitleListAdapter.validate_json(response.content)
+        return titles, response
+
+    def get_titles_by_authors(
+        self, authors: Iterable[str], max_workers: int = None
+    ) -> Iterator[tuple[str, list[PoemTitle], Response]]:
+        """
+        Get titles of many authors' poems concurrently
+
+        Args:
+            authors: Author names, matched exactly
+            max_workers: Number of requests in flight, the pool size by default
+
+        Returns:
+            Author names with their titles, in the order responses arrive;
+            repeated names are requested and returned once, unknown ones
+            with no titles
+        """
+        for author, response in map_distinct(
+            self.api_client,
+            authors,
+            partial(AuthorAPI.titles_by_name, exact=True),
+            max_workers,
+        ):
+            if is_not_found(response.content):
+                yield author, [], response
+                continue
+            titles = PoemTitleListAdapter.validate_json(response.content)
+            yield author, titles, response
+
+    def iter_poems_by_author(self, author: str) -> Iterator[PoemResponse]:
+        """
+        Iterate over author's poems, reading the response incrementally
+
+        Args:
+            author: Author name
+
+        Returns:
+            Poems validated one at a time
+
+        Raises:
+            HTTPError: If the API answers with an error status
+        """
+        response = self.api_client.get(AuthorAPI.by_name(author), stream=True)
+        return iter_models(response, PoemResponse)
+
+
+class AsyncAuthorService:
+    """Async service for interacting with Author API endpoints"""
+
+    def __init__(self, api_client: AsyncAPIClient = None):
+        self.api_client = api_client or AsyncAPIClient(base_url=API_URL)
+
+    async def get_all_authors(self) -> tuple[AuthorsResponse, Response]:
+        """
+        Get all authors
+
+        Returns:
+            List of authors
+        """
+        response = await self.api_client.get(AuthorAPI.base)
+        authors = AuthorsResponse.model_validate_json(response.content)
+        return authors, response
+
+    async def get_poems_by_author(
+        self, author: str
+    ) -> tuple[list[PoemResponse], Response]:
+        """
+        Get all author's poems
+
+        Args:
+            author: Author name
+
+        Returns:
+            Poems data
+        """
+        response = await self.api_client.get(AuthorAPI.by_name(author))
+        poems = parse_poems(response.content, response)
         return poems, response
+
+    async def get_poems_by_authors(
+        self, authors: Iterable[str], max_concurrency: int = None
+    ) -> AsyncIterator[tuple[str, list[PoemResponse], Response]]:
+        """
+        Get poems of many authors concurrently
+
+        Args:
+            authors: Author names, matched exactly
+            max_concurrency: Number of requests in flight, the connection
+                limit of the client by default
+
+        Returns:
+            Author names with their poems, in the order responses arrive;
+            repeated names are requested and returned once, unknown ones
+            with no poems
+        """
+        # Requests are sent by tasks, which cannot see the caller
+        caller = get_caller()
+
+        async def fetch(author: str):
+            response = await self.api_client.get(
+                AuthorAPI.by_name(author, exact=True), caller=caller
+            )
+            if is_not_found(response.content):
+                return author, [], response
+            poems = parse_poems(response.content, response)
+            return author, poems, response
+
+        async for result in gather_distinct(
+            authors, fetch, max_concurrency or self.api_client.max_connections
+        ):
+            yield result
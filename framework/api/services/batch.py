@@ -0,0 +1,82 @@
+import asyncio
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+)
+from typing import TypeVar
+
+from requests import Response
+
+from framework.api.api_client import APIClient
+
+T = TypeVar("T")
+
+
+def map_distinct(
+    api_client: APIClient,
+    names: Iterable[str],
+    endpoint: Callable[[str], str],
+    max_workers: int = None,
+) -> Iterator[tuple[str, Response]]:
+    """
+    Send a GET per distinct name, yielding responses as they arrive
+
+    Args:
+        api_client: API client
+        names: Author names, titles, etc.; repeated ones are sent once
+        endpoint: Endpoint of a name, e.g. AuthorAPI.by_name
+        max_workers: Number of requests in flight, the pool size by default
+
+    Returns:
+        Names with their responses, in the order responses arrive
+    """
+    requested = {}
+
+    def endpoints() -> Iterator[str]:
+        for name in names:
+            name_endpoint = endpoint(name)
+            if name_endpoint not in requested:
+                requested[name_endpoint] = name
+                yield name_endpoint
+
+    for name_endpoint, response in api_client.imap_get(
+        endpoints(), max_workers
+    ):
+        yield requested[name_endpoint], response
+
+
+async def gather_distinct(
+    names: Iterable[str],
+    fetch: Callable[[str], Awaitable[T]],
+    max_concurrency: int,
+) -> AsyncIterator[T]:
+    """
+    Await a fetch per distinct name, yielding results as they complete
+
+    Args:
+        names: Author names, titles, etc.; repeated ones are fetched once
+        fetch: Coroutine function fetching a name
+        max_concurrency: Number of fetches in flight
+
+    Returns:
+        Results in the order they complete; the fetches left are
+        cancelled when the iteration stops early
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def limited(name: str) -> T:
+        async with semaphore:
+            return await fetch(name)
+
+    tasks = [
+        asyncio.ensure_future(limited(name)) for name in dict.fromkeys(names)
+    ]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
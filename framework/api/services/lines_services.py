@@ -1,8 +1,12 @@
+from collections.abc import Iterator
+
 from requests import Response
 
 from framework.api.api_client import APIClient
+from framework.api.async_api_client import AsyncAPIClient
 from framework.api.endpoints import LinesAPI
-from framework.api.models.response_types import PoemResponse
+from framework.api.models.response_types import PoemResponse, parse_poems
+from framework.api.streaming import iter_models
 from settings import API_URL
 
 
@@ -25,5 +29,45 @@ class LinesService:
             List of lines
         """
         response = self.api_client.get(LinesAPI.by_line_text(text))
-        poems = [PoemResponse.model_validate(item) for item in response.json()]
+        poems = parse_poems(response.content, response)
+        return poems, response
+
+    def iter_poems_by_text_in_lines(self, text: str) -> Iterator[PoemResponse]:
+        """
+        Iterate over poems with the text in lines, reading the response
+        incrementally
+
+        Args:
+            text: Text presented in lines
+
+        Returns:
+            Poems validated one at a time
+
+        Raises:
+            HTTPError: If the API answers with an error status
+        """
+        response = self.api_client.get(LinesAPI.by_line_text(text), stream=True)
+        return iter_models(response, PoemResponse)
+
+
+class AsyncLinesService:
+    """Async service for interacting with Lines API endpoints"""
+
+    def __init__(self, api_client: AsyncAPIClient = None):
+        self.api_client = api_client or AsyncAPIClient(base_url=API_URL)
+
+    async def get_poem_by_text_in_lines(
+        self, text: str
+    ) -> tuple[list[PoemResponse], Response]:
+        """
+        Get lines by number
+
+        Args:
+            text: Text presented in lines
+
+        Returns:
+            List of lines
+        """
+        response = await self.api_client.get(LinesAPI.by_line_text(text))
+        poems = parse_poems(response.content, response)
         return poems, response
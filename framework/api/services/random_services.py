@@ -1,8 +1,9 @@
 from requests import Response
 
 from framework.api.api_client import APIClient
+from framework.api.async_api_client import AsyncAPIClient
 from framework.api.endpoints import RandomAPI
-from framework.api.models.response_types import PoemResponse
+from framework.api.models.response_types import PoemResponse, parse_poems
 from settings import API_URL
 
 
@@ -20,5 +21,23 @@ class RandomService:
             Random data
         """
         response = self.api_client.get(RandomAPI.base)
-        poems = [PoemResponse.model_validate(item) for item in response.json()]
+        poems = parse_poems(response.content, response)
+        return poems, response
+
+
+class AsyncRandomService:
+    """Async service for interacting with Random API endpoints"""
+
+    def __init__(self, api_client: AsyncAPIClient = None):
+        self.api_client = api_client or AsyncAPIClient(base_url=API_URL)
+
+    async def get_random_poem(self) -> tuple[list[PoemResponse], Response]:
+        """
+        Get random poem
+
+        Returns:
+            Random data
+        """
+        response = await self.api_client.get(RandomAPI.base)
+        poems = parse_poems(response.content, response)
         return poems, response
@@ -1,8 +1,18 @@
+from collections.abc import AsyncIterator, Iterable, Iterator
+
 from requests import Response
 
 from framework.api.api_client import APIClient
+from framework.api.async_api_client import AsyncAPIClient
 from framework.api.endpoints import TitleAPI
-from framework.api.models.response_types import PoemResponse, TitlesResponse
+from framework.api.models.response_types import (
+    PoemResponse,
+    TitlesResponse,
+    parse_poems,
+)
+from framework.api.services.batch import gather_distinct, map_distinct
+from framework.api.streaming import iter_models
+from framework.logger import get_caller
 from settings import API_URL
 
 
@@ -20,7 +30,7 @@ class TitleService:
             List of title data
         """
         response = self.api_client.get(TitleAPI.base)
-        titles = TitlesResponse.model_validate(response.json())
+        titles = TitlesResponse.model_validate_json(response.content)
         return titles, response
 
     def get_poem_by_title(
@@ -36,5 +46,105 @@ class TitleService:
             List of poems with this title
         """
         response = self.api_client.get(TitleAPI.by_name(title))
-        poems = [PoemResponse.model_validate(item) for item in response.json()]
+        poems = parse_poems(response.content, response)
+        return poems, response
+
+    def get_poems_by_titles(
+        self, titles: Iterable[str], max_workers: int = None
+    ) -> Iterator[tuple[str, list[PoemResponse], Response]]:
+        """
+        Get poems with many titles concurrently
+
+        Args:
+            titles: Title names
+            max_workers: Number of requests in flight, the pool size by default
+
+        Returns:
+            Title names with their poems, in the order responses arrive;
+            repeated names are requested and returned once
+        """
+        for title, response in map_distinct(
+            self.api_client, titles, TitleAPI.by_name, max_workers
+        ):
+            poems = parse_poems(response.content, response)
+            yield title, poems, response
+
+    def iter_poems_by_title(self, title: str) -> Iterator[PoemResponse]:
+        """
+        Iterate over poems with this title, reading the response incrementally
+
+        Args:
+            title: Title name
+
+        Returns:
+            Poems validated one at a time
+
+        Raises:
+            HTTPError: If the API answers with an error status
+        """
+        response = self.api_client.get(TitleAPI.by_name(title), stream=True)
+        return iter_models(response, PoemResponse)
+
+
+class AsyncTitleService:
+    """Async service for interacting with Title API endpoints"""
+
+    def __init__(self, api_client: AsyncAPIClient = None):
+        self.api_client = api_client or AsyncAPIClient(base_url=API_URL)
+
+    async def get_all_titles(self) -> tuple[TitlesResponse, Response]:
+        """
+        Get all titles
+
+        Returns:
+            List of title data
+        """
+        response = await self.api_client.get(TitleAPI.base)
+        titles = TitlesResponse.model_validate_json(response.content)
+        return titles, response
+
+    async def get_poem_by_title(
+        self, title: str
+    ) -> tuple[list[PoemResponse], Response]:
+        """
+        Get title by name
+
+        Args:
+            title: Title name
+
+        Returns:
+            List of poems with this title
+        """
+        response = await self.api_client.get(TitleAPI.by_name(title))
+        poems = parse_poems(response.content, response)
         return poems, response
+
+    async def get_poems_by_titles(
+        self, titles: Iterable[str], max_concurrency: int = None
+    ) -> AsyncIterator[tuple[str, list[PoemResponse], Response]]:
+        """
+        Get poems with many titles concurrently
+
+        Args:
+            titles: Title names
+            max_concurrency: Number of requests in flight, the connection
+                limit of the client by default
+
+        Returns:
+            Title names with their poems, in the order responses arrive;
+            repeated names are requested and returned once
+        """
+        # Requests are sent by tasks, which cannot see the caller
+        caller = get_caller()
+
+        async def fetch(title: str):
+            response = await self.api_client.get(
+                TitleAPI.by_name(title), caller=caller
+            )
+            poems = parse_poems(response.content, response)
+            return title, poems, response
+
+        async for result in gather_distinct(
+            titles, fetch, max_concurrency or self.api_client.max_connections
+        ):
+            yield result
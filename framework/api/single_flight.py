@@ -0,0 +1,90 @@
+import threading
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    """Counters of calls run and shared by a SingleFlight"""
+
+    executed: int = 0
+    coalesced: int = 0
+
+    @property
+    def coalesce_ratio(self) -> float:
+        """Share of callers served by a call started by another caller"""
+        calls = self.executed + self.coalesced
+        return self.coalesced / calls if calls else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"executed={self.executed}, coalesced={self.coalesced}, "
+            f"coalesce_ratio={self.coalesce_ratio:.2%}"
+        )
+
+
+class _Call:
+    """Call in flight and its outcome"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time: callers arriving while a call
+    with the same key is in flight wait for it and share its result
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, _Call] = {}
+        self._executed = 0
+        self._coalesced = 0
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Run the function or join the call in flight for the same key
+
+        Args:
+            key: Identity of the call
+            function: Call to run if none is in flight
+
+        Returns:
+            Result of the function, shared with concurrent callers;
+            its exception is raised to all of them
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._executed += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            # Later callers start a new call instead of reusing this result
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(
+            executed=self._executed, coalesced=self._coalesced
+        )
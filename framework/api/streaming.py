@@ -0,0 +1,166 @@
+import codecs
+import json
+from collections.abc import Iterable, Iterator
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+from requests import Response
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Size of body chunks read from the socket
+CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+# What iter_json_array expects next
+_OPEN, _FIRST_ITEM, _ITEM, _SEPARATOR = range(4)
+
+
+def _skip_whitespace(buffer: str, position: int) -> int:
+    while position < len(buffer) and buffer[position] in _WHITESPACE:
+        position += 1
+    return position
+
+
+def iter_json_array(
+    chunks: Iterable[bytes], encoding: str = "utf-8"
+) -> Iterator[Any]:
+    """
+    Parse a JSON array incrementally and yield its items one at a time
+
+    Only the unparsed tail of the body is kept in memory, so the peak
+    memory is bounded by the largest item rather than the whole array.
+    An item split between chunks is parsed again only after its tail has
+    doubled, so large items cost linear time.
+
+    Args:
+        chunks: Body chunks, e.g. Response.iter_content()
+        encoding: Body encoding
+
+    Returns:
+        Iterator over the parsed items
+
+    Raises:
+        ValueError: If the body is not a single well-formed JSON array,
+            e.g. it has a missing or extra comma or data after the array
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="strict")
+    chunks = iter(chunks)
+    buffer = ""
+    # Offset of the first unparsed character in the buffer and the number
+    # of characters dropped from the head of the buffer before it
+    position = 0
+    consumed = 0
+    exhausted = False
+    expected = _OPEN
+
+    def read_more(size: int = 1) -> bool:
+        """Append at least size characters, dropping the parsed head"""
+        nonlocal buffer, position, consumed, exhausted
+        if exhausted:
+            return False
+        pieces = [buffer[position:]]
+        read = 0
+        while read < size:
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+                pieces.append(decoder.decode(b"", final=True))
+                break
+            pieces.append(decoder.decode(chunk))
+            read += len(pieces[-1])
+        consumed += position
+        buffer = "".join(pieces)
+        position = 0
+        return True
+
+    def error(message: str) -> ValueError:
+        return ValueError(f"{message} at offset {consumed + position}")
+
+    while True:
+        position = _skip_whitespace(buffer, position)
+        if position == len(buffer):
+            if not read_more():
+                raise error("Unexpected end of JSON array")
+            continue
+
+        char = buffer[position]
+        if expected == _OPEN:
+            if char != "[":
+                raise error("Expected a JSON array")
+            position += 1
+            expected = _FIRST_ITEM
+            continue
+        if char == "]" and expected in (_FIRST_ITEM, _SEPARATOR):
+            position += 1
+            break
+        if expected == _SEPARATOR:
+            if char != ",":
+                raise error("Expected ',' or ']'")
+            position += 1
+            expected = _ITEM
+            continue
+        if char in ",]":
+            raise error("Expected an array item")
+
+        try:
+            item, end = _decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # The item is split between chunks
+            if not read_more(len(buffer) - position):
+                raise
+            continue
+
+        # A number or literal is complete only when followed by a delimiter,
+        # "1." would otherwise be parsed as 1 when "5" is in the next chunk
+        if (
+            not exhausted
+            and char not in '{["'
+            and (end == len(buffer) or buffer[end] not in _DELIMITERS)
+        ):
+            read_more(len(buffer) - position)
+            continue
+
+        position = end
+        expected = _SEPARATOR
+        yield item
+
+    # Nothing but whitespace may follow the array
+    while True:
+        position = _skip_whitespace(buffer, position)
+        if position < len(buffer):
+            raise error("Unexpected data after JSON array")
+        if not read_more():
+            return
+
+
+def iter_models(response: Response, model: type[ModelT]) -> Iterator[ModelT]:
+    """
+    Validate items of a streamed JSON array response one at a time
+
+    Args:
+        response: Response requested with stream=True
+        model: Pydantic model of an array item
+
+    Returns:
+        Iterator over validated models; the connection is released
+        when the iteration ends
+
+    Raises:
+        HTTPError: If the response has an error status, before any of the
+            body is read; the connection is released
+    """
+    if not response.ok:
+        response.close()
+        response.raise_for_status()
+    return _iter_models(response, model)
+
+
+def _iter_models(response: Response, model: type[ModelT]) -> Iterator[ModelT]:
+    with response:
+        chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+        for item in iter_json_array(chunks, response.encoding or "utf-8"):
+            yield model.model_validate(item)
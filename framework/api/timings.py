@@ -0,0 +1,55 @@
+from contextvars import ContextVar
+from dataclasses import dataclass, fields
+from typing import Optional
+
+
+@dataclass
+class RequestTimings:
+    """
+    Durations of the phases of a single request in seconds
+
+    Connection phases (dns, connect, tls) are None when the request reused
+    a pooled connection; json_decode and validation are set by the service
+    that parses the body.
+    """
+
+    # Name resolution of the host
+    dns: Optional[float] = None
+    # TCP handshake
+    connect: Optional[float] = None
+    # TLS handshake, HTTPS only
+    tls: Optional[float] = None
+    # Request sent until the status line and headers are received
+    ttfb: Optional[float] = None
+    # Headers received until the whole body is read
+    download: Optional[float] = None
+    json_decode: Optional[float] = None
+    validation: Optional[float] = None
+    # perf_counter() time the headers were received at
+    headers_received: Optional[float] = None
+
+    @property
+    def new_connection(self) -> bool:
+        return self.connect is not None
+
+    def to_dict(self) -> dict:
+        """Measured phases in milliseconds"""
+        return {
+            field.name: round(getattr(self, field.name) * 1000, 3)
+            for field in fields(self)
+            if field.name != "headers_received"
+            and getattr(self, field.name) is not None
+        }
+
+    def __str__(self) -> str:
+        return ", ".join(
+            f"{phase}={duration} ms"
+            for phase, duration in self.to_dict().items()
+        )
+
+
+# Timings of the request sent in this context, set by APIClient
+# in the instrumentation mode and filled in by the connection classes
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "current_timings", default=None
+)
@@ -0,0 +1,295 @@
+"""
+Latency baselines persisted between test runs.
+
+Latency samples of a check are compared with pinned reference samples
+using a one-sided Mann-Whitney U test, so a check fails only when the
+current run is significantly and noticeably slower, rather than whenever
+a single response crosses a fixed threshold. Checks without a reference
+fall back to a fixed budget for their median latency.
+
+References are refreshed only on request (LATENCY_BASELINE_UPDATE=1),
+so a slow drift over many runs cannot become the new normal unnoticed.
+Sampling repeats the checked call, so it is opt-in (--run-perf); other
+runs time a single call against the budget.
+"""
+
+import json
+import math
+import os
+import statistics
+import threading
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from requests import Response
+
+from settings import (
+    LATENCY_BASELINE_ALPHA,
+    LATENCY_BASELINE_MIN_DELTA_MS,
+    LATENCY_BASELINE_MIN_SLOWDOWN,
+    LATENCY_BASELINE_PATH,
+    LATENCY_BASELINE_SAMPLES,
+    LATENCY_BASELINE_UPDATE,
+    LATENCY_BUDGET_MS,
+)
+
+
+def mann_whitney_u_test(current: list[float], baseline: list[float]) -> float:
+    """
+    One-sided Mann-Whitney U test with normal approximation
+
+    Args:
+        current: Samples of the current run
+        baseline: Samples of the baseline run
+
+    Returns:
+        p-value of the hypothesis that current values tend to be larger
+    """
+    n1, n2 = len(current), len(baseline)
+    values = sorted(
+        [(value, True) for value in current]
+        + [(value, False) for value in baseline]
+    )
+
+    # Rank sum of current samples with average ranks for ties
+    rank_sum = 0.0
+    tie_term = 0
+    start = 0
+    while start < len(values):
+        end = start + 1
+        while end < len(values) and values[end][0] == values[start][0]:
+            end += 1
+        ties = end - start
+        average_rank = (start + 1 + end) / 2
+        rank_sum += average_rank * sum(
+            is_current for _, is_current in values[start:end]
+        )
+        tie_term += ties**3 - ties
+        start = end
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    # Continuity correction towards the mean of U
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass(frozen=True)
+class LatencyComparison:
+    """Result of comparing latency samples with their baseline"""
+
+    key: str
+    current_median: float
+    baseline_median: Optional[float] = None
+    p_value: Optional[float] = None
+    regressed: bool = False
+    # Median latency allowed when there is no baseline, in ms
+    budget_ms: Optional[float] = None
+
+    @property
+    def delta(self) -> Optional[float]:
+        """Relative change of the median latency"""
+        if not self.baseline_median:
+            return None
+        return self.current_median / self.baseline_median - 1
+
+    def __str__(self) -> str:
+        if self.baseline_median is None:
+            budget = (
+                f", budget {self.budget_ms:.0f} ms"
+                if self.budget_ms is not None
+                else ""
+            )
+            return (
+                f"{self.key}: median {self.current_median:.3f} ms, "
+                f"no baseline{budget}"
+            )
+        return (
+            f"{self.key}: median {self.current_median:.3f} ms vs "
+            f"{self.baseline_median:.3f} ms baseline "
+            f"({self.delta:+.1%}, p={self.p_value:.4f})"
+        )
+
+
+class BaselineStore:
+    """JSON file of reference latency samples per check"""
+
+    def __init__(
+        self,
+        path: str,
+        alpha: float = LATENCY_BASELINE_ALPHA,
+        min_slowdown: float = LATENCY_BASELINE_MIN_SLOWDOWN,
+        min_delta_ms: float = LATENCY_BASELINE_MIN_DELTA_MS,
+        update: bool = LATENCY_BASELINE_UPDATE,
+    ):
+        """
+        Args:
+            path: JSON file with baseline samples
+            alpha: Significance level of the regression test
+            min_slowdown: Relative median slowdown ignored even when
+                significant, e.g. 0.2 - up to 20% slower
+            min_delta_ms: Absolute median slowdown ignored even when
+                significant, run-to-run noise of fast local servers
+            update: Save samples of passing checks as new baselines at
+                the end of the run, off by default
+        """
+        self.path = path
+        self.alpha = alpha
+        self.min_slowdown = min_slowdown
+        self.min_delta_ms = min_delta_ms
+        self.update = update
+        self.comparisons: list[LatencyComparison] = []
+        # Samples of checks without a regression, saved as new baselines
+        self.updates: dict[str, list[float]] = {}
+        self._baselines: dict[str, list[float]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def baselines(self) -> dict[str, list[float]]:
+        if self._baselines is None:
+            self._baselines = {}
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as file:
+                    self._baselines = json.load(file)
+        return self._baselines
+
+    def compare(
+        self,
+        key: str,
+        samples: list[float],
+        budget_ms: Optional[float] = LATENCY_BUDGET_MS,
+        against_baseline: bool = True,
+    ) -> LatencyComparison:
+        """
+        Compare latency samples with the stored baseline
+
+        Args:
+            key: Check identifier, e.g. test node ID
+            samples: Latencies in milliseconds
+            budget_ms: Median latency allowed when there is no baseline,
+                None - any
+            against_baseline: False checks the budget only and never saves
+                the samples as a baseline, for too few samples to compare
+
+        Returns:
+            Comparison, regressed if the slowdown is significant or, without
+            a baseline, the median exceeds the budget
+        """
+        current_median = statistics.median(samples)
+        with self._lock:
+            baseline = self.baselines.get(key) if against_baseline else None
+
+        if baseline:
+            baseline_median = statistics.median(baseline)
+            p_value = mann_whitney_u_test(samples, baseline)
+            comparison = LatencyComparison(
+                key=key,
+                current_median=current_median,
+                baseline_median=baseline_median,
+                p_value=p_value,
+                regressed=p_value < self.alpha
+                and current_median > baseline_median * (1 + self.min_slowdown)
+                and current_median - baseline_median > self.min_delta_ms,
+            )
+        else:
+            comparison = LatencyComparison(
+                key=key,
+                current_median=current_median,
+                regressed=budget_ms is not None and current_median > budget_ms,
+                budget_ms=budget_ms,
+            )
+
+        with self._lock:
+            self.comparisons.append(comparison)
+            if against_baseline and not comparison.regressed:
+                self.updates[key] = samples
+        return comparison
+
+    def to_state(self) -> dict:
+        """Raw state to merge in another process, e.g. an xdist controller"""
+        with self._lock:
+            return {
+                "comparisons": [asdict(item) for item in self.comparisons],
+                "updates": self.updates,
+            }
+
+    def merge_state(self, state: dict) -> None:
+        """Add comparisons made by another store, see to_state()"""
+        with self._lock:
+            self.comparisons.extend(
+                LatencyComparison(**item) for item in state["comparisons"]
+            )
+            self.updates.update(state["updates"])
+
+    def save(self) -> None:
+        """Store samples of checks without a regression as new baselines"""
+        if not self.update or not self.updates:
+            return
+        with self._lock:
+            baselines = {**self.baselines, **self.updates}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as file:
+                json.dump(baselines, file, indent=1, sort_keys=True)
+
+
+class LatencyBaseline:
+    """Latency regression checks of a single test"""
+
+    def __init__(
+        self, store: BaselineStore, test_id: str, resample: bool = False
+    ):
+        """
+        Args:
+            store: Baseline store of the run
+            test_id: Test node ID, used as the baseline key
+            resample: Repeat every checked call LATENCY_BASELINE_SAMPLES
+                times and compare with the baseline; otherwise a single
+                call is checked against the latency budget
+        """
+        self.store = store
+        self.test_id = test_id
+        self.resample = resample
+
+    def assert_no_regression(
+        self,
+        call: Callable[[], Response],
+        name: str = None,
+        samples: int = None,
+        budget_ms: Optional[float] = LATENCY_BUDGET_MS,
+    ) -> LatencyComparison:
+        """
+        Time an API call and fail if it became significantly slower
+
+        Args:
+            call: Call returning a response, its elapsed time is sampled
+            name: Check name when a test makes several checks
+            samples: Number of calls, LATENCY_BASELINE_SAMPLES when
+                resampling and 1 otherwise
+            budget_ms: Median latency allowed when there is no baseline
+
+        Returns:
+            Comparison with the baseline
+        """
+        from framework.api.cache import bypass_cache
+
+        key = f"{self.test_id}::{name}" if name else self.test_id
+        if samples is None:
+            samples = LATENCY_BASELINE_SAMPLES if self.resample else 1
+        # Latencies of cached responses say nothing about the server
+        with bypass_cache():
+            latencies = [
+                call().elapsed.total_seconds() * 1000 for _ in range(samples)
+            ]
+        comparison = self.store.compare(
+            key, latencies, budget_ms, against_baseline=self.resample
+        )
+        assert not comparison.regressed, f"Latency regression: {comparison}"
+        return comparison
+
+
+# Baselines of the current process, saved at session end
+latency_baselines = BaselineStore(LATENCY_BASELINE_PATH)
@@ -0,0 +1,273 @@
+"""
+Compact in-memory storage of a poem corpus.
+
+A list of PoemResponse models costs a model object with its field dict,
+a list and a separate str for every line of every poem. Corpus keeps the
+same data in a few flat columns instead: interned author and title
+strings, linecount as a 32-bit integer, and the lines of all poems as one
+UTF-8 buffer with arrays of poem and line offsets. Poems are materialized
+only when accessed, as slotted CompactPoem views or PoemResponse models.
+
+The columns may also be read-only views of a buffer, e.g. a memory-mapped
+snapshot file (see framework.corpus.snapshot), so a corpus can be opened
+without copying or parsing its text.
+"""
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from typing import Optional, Union
+
+from framework.api.models.response_types import PoemResponse
+from framework.api.services.author_service import AuthorService
+
+PoemData = Union[PoemResponse, "CompactPoem", dict]
+
+
+class CompactPoem:
+    """Read-only view of one poem of a Corpus"""
+
+    __slots__ = ("_corpus", "_index")
+
+    def __init__(self, corpus: "Corpus", index: int):
+        self._corpus = corpus
+        self._index = index
+
+    @property
+    def title(self) -> str:
+        return self._corpus._titles[self._index]
+
+    @property
+    def author(self) -> str:
+        return self._corpus._authors[self._index]
+
+    @property
+    def linecount(self) -> int:
+        return self._corpus._linecounts[self._index]
+
+    @property
+    def lines(self) -> list[str]:
+        return self._corpus._lines(self._index)
+
+    def to_response(self) -> PoemResponse:
+        """Build the API model of the poem"""
+        return PoemResponse.model_construct(
+            title=self.title,
+            author=self.author,
+            lines=self.lines,
+            linecount=str(self.linecount),
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CompactPoem):
+            other = other.to_response()
+        if isinstance(other, PoemResponse):
+            return self.to_response() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactPoem(title={self.title!r}, author={self.author!r}, "
+            f"linecount={self.linecount})"
+        )
+
+
+class Corpus(Sequence[PoemResponse]):
+    """
+    Poems stored column by column
+
+    Indexing and iteration return PoemResponse models built on access;
+    poem() and records() return lightweight CompactPoem views.
+    """
+
+    def __init__(self, poems: Iterable[PoemData] = ()):
+        """
+        Args:
+            poems: Poems as models or PoetryDB JSON objects
+        """
+        self._titles: list[str] = []
+        self._authors: list[str] = []
+        self._linecounts = array("I")
+        # Index of the first line of every poem, and one past the last
+        self._first_lines = array("Q", [0])
+        # Offset of every poem in the text buffer
+        self._text_starts = array("Q")
+        # End offset of every line from the start of its poem
+        self._line_ends = array("I")
+        self._text = bytearray()
+        self.extend(poems)
+
+    @classmethod
+    def from_columns(
+        cls,
+        titles: list[str],
+        authors: list[str],
+        linecounts: Sequence[int],
+        first_lines: Sequence[int],
+        text_starts: Sequence[int],
+        line_ends: Sequence[int],
+        text: Union[bytes, bytearray, memoryview],
+    ) -> "Corpus":
+        """
+        Wrap existing columns without copying them
+
+        Args:
+            titles: Title of every poem
+            authors: Author of every poem
+            linecounts: Line count of every poem
+            first_lines: Index of the first line of every poem and one
+                past the last line
+            text_starts: Offset of every poem in the text
+            line_ends: End offset of every line from the start of its poem
+            text: UTF-8 lines of all poems
+
+        Returns:
+            Corpus, read-only unless all columns are mutable
+        """
+        corpus = cls.__new__(cls)
+        corpus._titles = titles
+        corpus._authors = authors
+        corpus._linecounts = linecounts
+        corpus._first_lines = first_lines
+        corpus._text_starts = text_starts
+        corpus._line_ends = line_ends
+        corpus._text = text
+        return corpus
+
+    @classmethod
+    def from_service(
+        cls,
+        author_service: AuthorService,
+        authors: Iterable[str] = None,
+        max_workers: int = None,
+    ) -> "Corpus":
+        """
+        Download the poems of all or the given authors
+
+        Args:
+            author_service: Author service
+            authors: Author names, all authors by default
+            max_workers: Number of requests in flight
+
+        Returns:
+            Corpus in the order responses arrive, one poem per author and
+            title
+        """
+        if authors is None:
+            authors = author_service.get_all_authors()[0].authors
+        corpus = cls()
+        downloaded = set()
+        for author, poems, _ in author_service.get_poems_by_authors(
+            authors, max_workers
+        ):
+            for poem in poems:
+                key = (poem.author, poem.title)
+                if poem.author == author and key not in downloaded:
+                    downloaded.add(key)
+                    corpus.append(poem)
+        return corpus
+
+    def append(self, poem: PoemData) -> None:
+        """Add a poem"""
+        if isinstance(poem, dict):
+            title, author = poem["title"], poem["author"]
+            lines, linecount = poem["lines"], poem["linecount"]
+        else:
+            title, author = poem.title, poem.author
+            lines, linecount = poem.lines, poem.linecount
+
+        self._titles.append(sys.intern(title))
+        self._authors.append(sys.intern(author))
+        self._linecounts.append(int(linecount))
+        text_start = len(self._text)
+        self._text_starts.append(text_start)
+        for line in lines:
+            self._text += line.encode()
+            self._line_ends.append(len(self._text) - text_start)
+        self._first_lines.append(len(self._line_ends))
+
+    def extend(self, poems: Iterable[PoemData]) -> None:
+        """Add poems"""
+        for poem in poems:
+            self.append(poem)
+
+    def _lines(self, index: int) -> list[str]:
+        first = self._first_lines[index]
+        last = self._first_lines[index + 1]
+        if first == last:
+            return []
+        text_start = self._text_starts[index]
+        text_end = text_start + self._line_ends[last - 1]
+        text = self._text[text_start:text_end]
+        lines = []
+        start = 0
+        for end in self._line_ends[first:last]:
+            lines.append(str(text[start:end], "utf-8"))
+            start = end
+        return lines
+
+    def _index(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Corpus index out of range")
+        return index
+
+    def poem(self, index: int) -> CompactPoem:
+        """View of the poem at the index"""
+        return CompactPoem(self, self._index(index))
+
+    def records(self) -> Iterator[CompactPoem]:
+        """Iterate over views of all poems"""
+        for index in range(len(self)):
+            yield CompactPoem(self, index)
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [
+                self.poem(number).to_response()
+                for number in range(*index.indices(len(self)))
+            ]
+        return self.poem(index).to_response()
+
+    def __iter__(self) -> Iterator[PoemResponse]:
+        for record in self.records():
+            yield record.to_response()
+
+    def by_author(self, author: str) -> list[CompactPoem]:
+        """Poems of an author, exact match"""
+        return [
+            CompactPoem(self, index)
+            for index, name in enumerate(self._authors)
+            if name == author
+        ]
+
+    def find_title(self, title: str) -> Optional[CompactPoem]:
+        """First poem with the exact title"""
+        try:
+            return CompactPoem(self, self._titles.index(title))
+        except ValueError:
+            return None
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by the corpus"""
+        strings = {id(value): value for value in self._titles + self._authors}
+        return (
+            len(self._text)
+            + sum(
+                column.itemsize * len(column)
+                for column in (
+                    self._linecounts,
+                    self._first_lines,
+                    self._text_starts,
+                    self._line_ends,
+                )
+            )
+            + sys.getsizeof(self._titles)
+            + sys.getsizeof(self._authors)
+            + sum(sys.getsizeof(value) for value in strings.values())
+        )
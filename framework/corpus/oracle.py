@@ -0,0 +1,305 @@
+"""
+Expected PoetryDB responses computed from a local corpus.
+
+CorpusOracle answers /author, /title and /lines queries the way PoetryDB
+does (case-insensitive partial match, exact match with the ":abs"
+suffix) from indexes built once over a Corpus:
+
+- authors and titles: dictionaries of exact lower-cased values;
+- title and line substrings: trigram inverted indexes, whose rarest
+  posting list gives a small candidate set that is then checked directly.
+
+Indexes are built on first use, so an oracle used for author queries
+only never pays for the full-text index.
+"""
+
+import random
+import re
+from array import array
+from collections.abc import Iterable
+from functools import cached_property
+from typing import Optional, Union
+
+from framework.api.endpoints import AuthorAPI, Endpoint, LinesAPI, TitleAPI
+from framework.api.models.response_types import PoemResponse
+from framework.corpus.compact import Corpus
+
+NOT_FOUND = {"status": 404, "reason": "Not found"}
+
+SEARCH_FIELDS = ("author", "title", "lines")
+OUTPUT_FIELDS = ("title", "author", "lines", "linecount")
+
+# Length of the substrings indexed by the inverted indexes
+GRAM = 3
+
+
+def parse_search(path: str) -> Optional[tuple[str, str, Optional[list[str]]]]:
+    """
+    Split a search path, e.g. "/author/Emily Dickinson/title,linecount"
+
+    Returns:
+        Input field, search term and output fields (None - all fields),
+        or None if the path is not a search
+    """
+    parts = path.strip("/").split("/", 1)
+    if len(parts) != 2 or parts[0] not in SEARCH_FIELDS:
+        return None
+    field, term = parts
+    head, separator, tail = term.rpartition("/")
+    outputs = tail.split(",")
+    if separator and all(output in OUTPUT_FIELDS for output in outputs):
+        return field, head, outputs
+    return field, term, None
+
+
+def trigrams(text: str) -> set[str]:
+    """Distinct substrings of GRAM characters"""
+    return {
+        text[start:end]
+        for start, end in zip(range(len(text)), range(GRAM, len(text) + 1))
+    }
+
+
+def project(poems: list[dict], outputs: Optional[list[str]]) -> list | dict:
+    """Body of a search with the requested output fields"""
+    if not poems:
+        return NOT_FOUND
+    if outputs is None:
+        return poems
+    return [{output: poem[output] for output in outputs} for poem in poems]
+
+
+def _build_gram_index(documents: Iterable[str]) -> dict[str, array]:
+    index: dict[str, array] = {}
+    for number, text in enumerate(documents):
+        for gram in trigrams(text):
+            postings = index.get(gram)
+            if postings is None:
+                postings = index[gram] = array("I")
+            postings.append(number)
+    return index
+
+
+class CorpusOracle:
+    """PoetryDB query semantics over the poems of a Corpus"""
+
+    def __init__(self, corpus: Corpus):
+        """
+        Args:
+            corpus: Poems to answer queries from
+        """
+        self.corpus = corpus
+
+    @classmethod
+    def from_poems(cls, poems: Iterable[Union[PoemResponse, dict]]):
+        """Build an oracle over poems as models or PoetryDB JSON objects"""
+        return cls(Corpus(poems))
+
+    @cached_property
+    def authors(self) -> list[str]:
+        """Sorted distinct authors, as returned by /author"""
+        return sorted(set(self.corpus._authors))
+
+    @cached_property
+    def titles(self) -> list[str]:
+        """Sorted distinct titles, as returned by /title"""
+        return sorted(set(self.corpus._titles))
+
+    @cached_property
+    def _lower_authors(self) -> dict[str, list[int]]:
+        ids: dict[str, list[int]] = {}
+        for number, author in enumerate(self.corpus._authors):
+            ids.setdefault(author.lower(), []).append(number)
+        return ids
+
+    @cached_property
+    def _lower_titles(self) -> list[str]:
+        return [title.lower() for title in self.corpus._titles]
+
+    @cached_property
+    def _title_ids(self) -> dict[str, list[int]]:
+        ids: dict[str, list[int]] = {}
+        for number, title in enumerate(self._lower_titles):
+            ids.setdefault(title, []).append(number)
+        return ids
+
+    @cached_property
+    def _title_grams(self) -> dict[str, array]:
+        return _build_gram_index(self._lower_titles)
+
+    @cached_property
+    def _lower_lines(self) -> list[str]:
+        # Lines cannot contain a query (no newlines), so searching the
+        # joined text finds exactly the substrings of single lines
+        return [
+            "\n".join(self.corpus._lines(number)).lower()
+            for number in range(len(self.corpus))
+        ]
+
+    @cached_property
+    def _line_grams(self) -> dict[str, array]:
+        return _build_gram_index(self._lower_lines)
+
+    def _candidates(self, grams: dict[str, array], text: str) -> array:
+        """Poem numbers that may contain the text, in corpus order"""
+        # Checking the rarest posting list directly is cheaper than
+        # intersecting it with the others: the check is a single substring
+        # search in a cached string
+        return min(
+            (grams.get(gram, array("I")) for gram in trigrams(text)), key=len
+        )
+
+    def find(self, field: str, text: str) -> list[int]:
+        """
+        Find poems like PoetryDB
+
+        Args:
+            field: "author", "title" or "lines"
+            text: Query, case-insensitive substring or, with the ":abs"
+                suffix, the exact author or title
+
+        Returns:
+            Numbers of matching poems in the corpus, in corpus order
+        """
+        text = text.lower()
+        exact = text.endswith(":abs")
+        text = text.removesuffix(":abs")
+
+        if field == "author":
+            if exact:
+                return list(self._lower_authors.get(text, ()))
+            return sorted(
+                number
+                for author, numbers in self._lower_authors.items()
+                if text in author
+                for number in numbers
+            )
+
+        if field == "title":
+            if exact:
+                return list(self._title_ids.get(text, ()))
+            if len(text) < GRAM:
+                return [
+                    number
+                    for number, title in enumerate(self._lower_titles)
+                    if text in title
+                ]
+            return [
+                number
+                for number in self._candidates(self._title_grams, text)
+                if text in self._lower_titles[number]
+            ]
+
+        if field == "lines":
+            numbers = (
+                range(len(self.corpus))
+                if len(text) < GRAM
+                else self._candidates(self._line_grams, text)
+            )
+            return [
+                number
+                for number in numbers
+                if text in self._lower_lines[number]
+            ]
+
+        raise ValueError(f"Unknown field: {field}")
+
+    def expected_poems(self, endpoint: str) -> list[PoemResponse]:
+        """
+        Poems PoetryDB returns for a search endpoint
+
+        Args:
+            endpoint: Endpoint such as AuthorAPI.by_name(...),
+                TitleAPI.by_name(...) or LinesAPI.by_line_text(...)
+
+        Returns:
+            Matching poems, empty if PoetryDB reports "Not found"
+        """
+        search = parse_search(endpoint)
+        if search is None:
+            raise ValueError(f"Not a search endpoint: {endpoint}")
+        field, text, _ = search
+        return [
+            self.corpus.poem(number).to_response()
+            for number in self.find(field, text)
+        ]
+
+    def expected_json(self, endpoint: str) -> Union[list, dict]:
+        """
+        Body PoetryDB returns for an endpoint
+
+        Args:
+            endpoint: /author, /title or a search endpoint, optionally
+                with output fields
+
+        Returns:
+            Decoded JSON body
+        """
+        path = endpoint.strip("/")
+        if path == "author":
+            return {"authors": self.authors}
+        if path == "title":
+            return {"titles": self.titles}
+        search = parse_search(path)
+        if search is None:
+            return NOT_FOUND
+        return project(
+            [poem.model_dump() for poem in self.expected_poems(path)],
+            search[2],
+        )
+
+    def sample_queries(
+        self, count: int, seed: int = None, min_length: int = 8
+    ) -> list[Endpoint]:
+        """
+        Generate search endpoints that match poems of the corpus
+
+        Args:
+            count: Number of endpoints
+            seed: Random seed, the same seed gives the same queries
+            min_length: Shortest title and line substring to search for
+
+        Returns:
+            Author, partial title and line text endpoints in turn
+        """
+        generator = random.Random(seed)
+        # Poems are drawn in a fixed order: the corpus is in the order its
+        # responses arrived, which differs between runs
+        order = sorted(
+            range(len(self.corpus)),
+            key=lambda number: (
+                self.corpus._authors[number],
+                self.corpus._titles[number],
+            ),
+        )
+        queries = []
+        # Give up on corpora without long enough titles or lines
+        for _ in range(count * 100 if order else 0):
+            if len(queries) == count:
+                break
+            poem = self.corpus.poem(order[generator.randrange(len(order))])
+            kind = len(queries) % 3
+            if kind == 0:
+                queries.append(AuthorAPI.by_name(poem.author))
+                continue
+            text = (
+                poem.title
+                if kind == 1
+                else generator.choice(poem.lines or [""])
+            )
+            # Skip text that PoetryDB cannot take in a URL path
+            text = text.strip()
+            if len(text) < min_length or re.search(r"[/?#%]", text):
+                continue
+            length = generator.randint(min_length, len(text))
+            start = generator.randint(0, len(text) - length)
+            end = start + length
+            fragment = text[start:end].strip()
+            if len(fragment) < min_length:
+                continue
+            queries.append(
+                TitleAPI.by_name(fragment)
+                if kind == 1
+                else LinesAPI.by_line_text(fragment)
+            )
+        return queries
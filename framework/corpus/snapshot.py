@@ -0,0 +1,410 @@
+"""
+Corpus snapshot on disk, synced incrementally from PoetryDB.
+
+A snapshot directory holds two files:
+
+- poems.bin: the columns of a Corpus as they are laid out in memory,
+  opened with mmap so that test processes share the page cache and read
+  lines straight from the file, without downloading or parsing anything;
+- manifest.json: where and when the snapshot was synced and a hash of
+  the title list of every author.
+
+A sync first compares the hashes of /author and /title with the
+manifest and stops if both are unchanged. Otherwise it fetches the
+titles of every author by exact name (title output field only, a
+fraction of the poems) and downloads the poems of new and changed
+authors only; poems of unchanged authors are copied from the previous
+snapshot. Edits that keep every title list as it was are only picked
+up by a full sync.
+
+Usage:
+    python -m framework.corpus.snapshot sync [--path DIR] [--full]
+    python -m framework.corpus.snapshot info [--path DIR]
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+from framework.api.services.author_service import AuthorService
+from framework.api.services.title_service import TitleService
+from framework.corpus.compact import Corpus
+from settings import CORPUS_SNAPSHOT
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+MAGIC = b"PDBC"
+VERSION = 1
+# Magic, version, poems, lines, text bytes and strings bytes in native
+# byte order: a file from a machine of the other byte order fails the
+# version check instead of being misread
+HEADER = struct.Struct("=4sIQQQQ")
+# Columns start at multiples of the largest item size
+ALIGNMENT = 8
+
+POEMS_FILE = "poems.bin"
+MANIFEST_FILE = "manifest.json"
+LOCK_FILE = ".lock"
+
+
+def titles_hash(titles: Iterable[str]) -> str:
+    """Hash of a title list, independent of its order"""
+    digest = hashlib.sha256()
+    for title in sorted(titles):
+        digest.update(title.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _padding(offset: int) -> int:
+    return -offset % ALIGNMENT
+
+
+def write_corpus(corpus: Corpus, path: str) -> None:
+    """
+    Write the columns of a corpus to a snapshot file
+
+    Args:
+        corpus: Corpus
+        path: File path, replaced atomically
+    """
+    # Authors repeat, so store them once and refer to them by number
+    author_ids: dict[str, int] = {}
+    authors = array(
+        "I",
+        (
+            author_ids.setdefault(name, len(author_ids))
+            for name in corpus._authors
+        ),
+    )
+    strings = json.dumps(
+        {"titles": corpus._titles, "authors": list(author_ids)},
+        ensure_ascii=False,
+    ).encode()
+    columns = [
+        array("I", corpus._linecounts),
+        authors,
+        array("Q", corpus._first_lines),
+        array("Q", corpus._text_starts),
+        array("I", corpus._line_ends),
+        bytes(corpus._text),
+        strings,
+    ]
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(corpus),
+                len(corpus._line_ends),
+                len(corpus._text),
+                len(strings),
+            )
+        )
+        offset = HEADER.size
+        for column in columns:
+            padding = _padding(offset)
+            file.write(b"\0" * padding)
+            data = memoryview(column).cast("B")
+            file.write(data)
+            offset += padding + len(data)
+        file.flush()
+        os.fsync(file.fileno())
+    # Processes that mapped the old file keep reading it until they close it
+    os.replace(temporary, path)
+
+
+def open_corpus(path: str) -> Corpus:
+    """
+    Open a snapshot file as a read-only corpus without copying its columns
+
+    Args:
+        path: File path
+
+    Returns:
+        Corpus backed by the memory-mapped file
+
+    Raises:
+        ValueError: If the file is not a snapshot of this version
+    """
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"Not a corpus snapshot: {path}")
+    magic, version, poems, lines, text_bytes, strings_bytes = (
+        HEADER.unpack_from(buffer)
+    )
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a corpus snapshot of version {VERSION}: {path}")
+
+    view = memoryview(buffer)
+    offset = HEADER.size
+
+    def column(size: int, item_format: str = "B") -> memoryview:
+        nonlocal offset
+        offset += _padding(offset)
+        start = offset
+        offset += size * struct.calcsize(item_format)
+        if offset > len(buffer):
+            raise ValueError(f"Truncated corpus snapshot: {path}")
+        return view[start:offset].cast(item_format)
+
+    linecounts = column(poems, "I")
+    author_ids = column(poems, "I")
+    first_lines = column(poems + 1, "Q")
+    text_starts = column(poems, "Q")
+    line_ends = column(lines, "I")
+    text = column(text_bytes)
+    strings = json.loads(bytes(column(strings_bytes)))
+    # One str per distinct author, shared by all of its poems
+    names = strings["authors"]
+    return Corpus.from_columns(
+        titles=strings["titles"],
+        authors=[names[number] for number in author_ids],
+        linecounts=linecounts,
+        first_lines=first_lines,
+        text_starts=text_starts,
+        line_ends=line_ends,
+        text=text,
+    )
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    """Outcome of a snapshot sync"""
+
+    poems: int = 0
+    authors: int = 0
+    # Authors whose poems were downloaded
+    fetched: list[str] = field(default_factory=list)
+    # Authors no longer served, dropped from the snapshot
+    removed: list[str] = field(default_factory=list)
+    # The snapshot was up to date and left as it was
+    unchanged: bool = False
+
+    def __str__(self) -> str:
+        if self.unchanged:
+            return f"up to date, {self.poems} poems of {self.authors} authors"
+        return (
+            f"{self.poems} poems of {self.authors} authors, "
+            f"fetched={len(self.fetched)}, removed={len(self.removed)}"
+        )
+
+
+class CorpusSnapshot:
+    """Snapshot directory of a corpus"""
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory: Directory of the snapshot files, created on sync
+        """
+        self.directory = directory
+        self.poems_path = os.path.join(directory, POEMS_FILE)
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+
+    def manifest(self) -> Optional[dict]:
+        """Manifest of the snapshot, None if there is no snapshot"""
+        try:
+            with open(self.manifest_path, encoding="utf-8") as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def open(self) -> Optional[Corpus]:
+        """Open the snapshot zero-copy, None if there is no snapshot"""
+        if self.manifest() is None:
+            return None
+        return open_corpus(self.poems_path)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        # Parallel workers syncing at startup wait for the first one
+        # and then find the snapshot up to date
+        os.makedirs(self.directory, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        fd = os.open(
+            os.path.join(self.directory, LOCK_FILE),
+            os.O_RDWR | os.O_CREAT,
+            0o644,
+        )
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            os.close(fd)
+
+    def sync(
+        self,
+        author_service: AuthorService,
+        title_service: TitleService,
+        full: bool = False,
+        max_workers: int = None,
+    ) -> SyncResult:
+        """
+        Bring the snapshot up to date with the API
+
+        Args:
+            author_service: Author service
+            title_service: Title service
+            full: Download the poems of all authors again
+            max_workers: Number of requests in flight
+
+        Returns:
+            What was downloaded
+        """
+        with self._locked():
+            return self._sync(author_service, title_service, full, max_workers)
+
+    def _sync(
+        self,
+        author_service: AuthorService,
+        title_service: TitleService,
+        full: bool,
+        max_workers: Optional[int],
+    ) -> SyncResult:
+        source = author_service.api_client.base_url
+        manifest = self.manifest()
+        if manifest is not None and manifest.get("source") != source:
+            manifest = None
+        previous = None if manifest is None else self.open()
+
+        authors = author_service.get_all_authors()[0].authors
+        titles = title_service.get_all_titles()[0].titles
+        authors_hash = titles_hash(authors)
+        all_titles_hash = titles_hash(titles)
+        if (
+            not full
+            and previous is not None
+            and manifest["authors_hash"] == authors_hash
+            and manifest["titles_hash"] == all_titles_hash
+        ):
+            return SyncResult(
+                poems=len(previous), authors=len(authors), unchanged=True
+            )
+
+        # An author whose title list is unchanged keeps its poems
+        known = {} if manifest is None else manifest["authors"]
+        author_titles = author_service.get_titles_by_authors(
+            authors, max_workers
+        )
+        hashes = {
+            author: titles_hash(title.title for title in poems)
+            for author, poems, _ in author_titles
+        }
+        changed = [
+            author
+            for author in authors
+            if full or known.get(author) != hashes[author]
+        ]
+        fetched = {
+            author: poems
+            for author, poems, _ in author_service.get_poems_by_authors(
+                changed, max_workers
+            )
+        }
+
+        kept: dict[str, list[int]] = {}
+        if previous is not None:
+            for number, author in enumerate(previous._authors):
+                if author not in fetched:
+                    kept.setdefault(author, []).append(number)
+
+        corpus = Corpus()
+        for author in authors:
+            if author in fetched:
+                corpus.extend(fetched[author])
+            else:
+                corpus.extend(
+                    previous.poem(number) for number in kept.get(author, ())
+                )
+
+        write_corpus(corpus, self.poems_path)
+        self._write_manifest(
+            {
+                "format": VERSION,
+                "synced_at": datetime.now(timezone.utc).isoformat(),
+                "source": source,
+                "poems": len(corpus),
+                "authors_hash": authors_hash,
+                "titles_hash": all_titles_hash,
+                "authors": hashes,
+            }
+        )
+        return SyncResult(
+            poems=len(corpus),
+            authors=len(authors),
+            fetched=changed,
+            removed=sorted(set(known) - set(hashes)),
+        )
+
+    def _write_manifest(self, manifest: dict) -> None:
+        # Written after the poems, so a manifest always describes a
+        # complete poems file
+        temporary = f"{self.manifest_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, ensure_ascii=False, indent=2)
+        os.replace(temporary, self.manifest_path)
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Sync the PoetryDB corpus into a local snapshot"
+    )
+    parser.add_argument("command", choices=["sync", "info"])
+    parser.add_argument(
+        "--path",
+        default=CORPUS_SNAPSHOT or os.path.join("reports", "corpus"),
+        help="Snapshot directory",
+    )
+    parser.add_argument(
+        "--full", action="store_true", help="Download all authors again"
+    )
+    parser.add_argument(
+        "--max-workers", type=int, default=None, help="Requests in flight"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] = None) -> None:
+    args = parse_args(argv)
+    snapshot = CorpusSnapshot(args.path)
+    if args.command == "sync":
+        author_service = AuthorService()
+        title_service = TitleService(author_service.api_client)
+        result = snapshot.sync(
+            author_service, title_service, args.full, args.max_workers
+        )
+        print(f"Snapshot {args.path}: {result}")
+        return
+
+    manifest = snapshot.manifest()
+    if manifest is None:
+        print(f"No snapshot in {args.path}")
+        return
+    print(
+        f"Snapshot {args.path}: {manifest['poems']} poems of "
+        f"{len(manifest['authors'])} authors from {manifest['source']}, "
+        f"synced at {manifest['synced_at']}, "
+        f"{os.path.getsize(snapshot.poems_path)} bytes"
+    )
+
+
+if __name__ == "__main__":
+    main()
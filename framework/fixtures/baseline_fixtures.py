@@ -0,0 +1,19 @@
+import pytest
+
+from framework.baseline import LatencyBaseline, latency_baselines
+
+
+@pytest.fixture
+def latency_baseline(request):
+    """
+    Fixture that checks latencies of the test against the latency budget
+    or, with --run-perf, samples them and compares with the baseline
+
+    Returns:
+        LatencyBaseline: Checks keyed by the test node ID
+    """
+    return LatencyBaseline(
+        latency_baselines,
+        request.node.nodeid,
+        resample=request.config.getoption("--run-perf"),
+    )
@@ -0,0 +1,33 @@
+import pytest
+
+from framework.logger import APILogger
+from settings import CORPUS_SNAPSHOT, CORPUS_SNAPSHOT_SYNC
+
+
+@pytest.fixture(scope="session")
+def corpus_oracle(api_client):
+    """
+    Fixture that loads the corpus once and answers queries locally
+
+    The corpus is opened from CORPUS_SNAPSHOT if it is configured, synced
+    with the API first when CORPUS_SNAPSHOT_SYNC is on or there is no
+    snapshot yet, and downloaded in full otherwise.
+
+    Returns:
+        CorpusOracle: Expected responses of the search endpoints
+    """
+    from framework.api.services.author_service import AuthorService
+    from framework.api.services.title_service import TitleService
+    from framework.corpus.compact import Corpus
+    from framework.corpus.oracle import CorpusOracle
+    from framework.corpus.snapshot import CorpusSnapshot
+
+    author_service = AuthorService(api_client)
+    if not CORPUS_SNAPSHOT:
+        return CorpusOracle(Corpus.from_service(author_service))
+
+    snapshot = CorpusSnapshot(CORPUS_SNAPSHOT)
+    if CORPUS_SNAPSHOT_SYNC or snapshot.manifest() is None:
+        result = snapshot.sync(author_service, TitleService(api_client))
+        APILogger.log_info(f"Corpus snapshot {CORPUS_SNAPSHOT}: {result}")
+    return CorpusOracle(snapshot.open())
@@ -0,0 +1,50 @@
+import pytest
+
+from settings import (
+    HTTP_CIRCUIT_FAILURE_THRESHOLD,
+    HTTP_CIRCUIT_RESET_TIMEOUT,
+    HTTP_RETRY_BACKOFF,
+    LOAD_HTTP_CIRCUIT_BREAKER,
+    LOAD_HTTP_RETRIES,
+)
+
+
+@pytest.fixture
+def load_runner(request, api_client):
+    """
+    Fixture that provides a load runner configured by the "load" marker
+
+    The marker takes LoadProfile fields and an optional "mix" of operation
+    weights, e.g. @pytest.mark.load(rate=20, duration=10, ramp_up=2)
+
+    Retries and the circuit breaker are turned on for the test
+    (LOAD_HTTP_RETRIES, LOAD_HTTP_CIRCUIT_BREAKER) unless the client
+    already has them, and restored afterwards.
+
+    Returns:
+        LoadRunner: Runner to start with run()
+    """
+    # Load tests are opt-in, most runs never import the load engine
+    from framework.api.resilience import CircuitBreaker, RetryPolicy
+    from framework.load_test import LoadProfile, LoadRunner, default_operations
+
+    marker = request.node.get_closest_marker("load")
+    options = dict(marker.kwargs) if marker else {}
+    mix = options.pop("mix", None)
+    profile = LoadProfile(**options)
+    operations = default_operations(api_client, mix, profile.seed)
+
+    retry, circuit_breaker = api_client.retry, api_client.circuit_breaker
+    if retry is None and LOAD_HTTP_RETRIES:
+        api_client.retry = RetryPolicy(
+            retries=LOAD_HTTP_RETRIES, backoff=HTTP_RETRY_BACKOFF
+        )
+    if circuit_breaker is None and LOAD_HTTP_CIRCUIT_BREAKER:
+        api_client.circuit_breaker = CircuitBreaker(
+            failure_threshold=HTTP_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=HTTP_CIRCUIT_RESET_TIMEOUT,
+        )
+
+    yield LoadRunner(operations, profile)
+
+    api_client.retry, api_client.circuit_breaker = retry, circuit_breaker
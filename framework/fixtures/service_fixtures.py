@@ -1,26 +1,60 @@
 import pytest
 
-from framework.api.services.author_service import AuthorService
-from framework.api.services.lines_services import LinesService
-from framework.api.services.random_services import RandomService
-from framework.api.services.title_service import TitleService
+# Services are imported by their fixtures: pytest startup should not load
+# the service modules and their pydantic models before a test needs them
 
 
 @pytest.fixture
 def author_service(api_client):
+    from framework.api.services.author_service import AuthorService
+
     return AuthorService(api_client)
 
 
 @pytest.fixture
 def title_service(api_client):
+    from framework.api.services.title_service import TitleService
+
     return TitleService(api_client)
 
 
 @pytest.fixture
 def random_service(api_client):
+    from framework.api.services.random_services import RandomService
+
     return RandomService(api_client)
 
 
 @pytest.fixture
 def lines_service(api_client):
+    from framework.api.services.lines_services import LinesService
+
     return LinesService(api_client)
+
+
+@pytest.fixture
+def async_author_service(async_api_client):
+    from framework.api.services.author_service import AsyncAuthorService
+
+    return AsyncAuthorService(async_api_client)
+
+
+@pytest.fixture
+def async_title_service(async_api_client):
+    from framework.api.services.title_service import AsyncTitleService
+
+    return AsyncTitleService(async_api_client)
+
+
+@pytest.fixture
+def async_random_service(async_api_client):
+    from framework.api.services.random_services import AsyncRandomService
+
+    return AsyncRandomService(async_api_client)
+
+
+@pytest.fixture
+def async_lines_service(async_api_client):
+    from framework.api.services.lines_services import AsyncLinesService
+
+    return AsyncLinesService(async_api_client)
@@ -0,0 +1,35 @@
+import pytest
+
+from settings import API_URL, USE_STUB_SERVER
+
+
+@pytest.fixture(scope="session")
+def stub_server():
+    """
+    Fixture that serves the test poems from memory on an ephemeral port
+
+    Returns:
+        StubServer: Running stub server
+    """
+    # The store builds the corpus oracle, only needed with the stub
+    from framework.stub_server import PoetryStore, StubServer, seed_poems
+
+    server = StubServer(PoetryStore(seed_poems()))
+    server.start()
+
+    yield server
+
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def api_url(request):
+    """
+    Fixture that provides the base URL of the API under test
+
+    Returns:
+        str: Stub server URL if USE_STUB_SERVER is set, API_URL otherwise
+    """
+    if USE_STUB_SERVER:
+        return request.getfixturevalue("stub_server").url
+    return API_URL
@@ -0,0 +1,265 @@
+"""
+Compact, early-exit comparison of JSON bodies with expected data.
+
+`assert resp.json() == expected` parses the whole body before comparing
+and, on a mismatch, makes pytest render a repr diff of both structures,
+which takes long and is unreadable for large payloads. assert_json_matches
+compares array bodies item by item while the response is parsed
+(streamed responses are read incrementally), stops after a few
+differences and reports each of them by path:
+
+    [3].lines[12]: expected 'Sleep! Cast thy canopy', got 'Sleep!'
+
+Equal subtrees are skipped with a single C-level comparison, so only the
+parts that differ are walked.
+"""
+
+import itertools
+import json
+import operator
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+from pydantic import BaseModel
+from requests import Response
+
+from framework.api.streaming import CHUNK_SIZE, iter_json_array
+
+# Item key of order-insensitive lists: a field name or a function of the item
+ItemKey = Union[str, Callable[[Any], Any], None]
+
+MISSING = object()
+
+# Longest rendering of a value in a difference
+MAX_REPR = 80
+
+
+def _short(value: Any) -> str:
+    if value is MISSING:
+        return "<missing>"
+    text = repr(value)
+    if len(text) <= MAX_REPR:
+        return text
+    end = MAX_REPR - 3
+    return text[:end] + "..."
+
+
+@dataclass(frozen=True)
+class Difference:
+    """Value that differs from the expected one"""
+
+    path: str
+    expected: Any
+    actual: Any
+
+    def __str__(self) -> str:
+        return (
+            f"{self.path or 'body'}: expected {_short(self.expected)}, "
+            f"got {_short(self.actual)}"
+        )
+
+
+def _plain(value: Any) -> Any:
+    """JSON-like value of a model, other values as they are"""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    return value
+
+
+def _normalize(line: str) -> str:
+    return " ".join(line.split())
+
+
+class _Differ:
+    def __init__(self, key: ItemKey, normalize_lines: bool):
+        self.label = key if isinstance(key, str) else "key"
+        self.key = operator.itemgetter(key) if isinstance(key, str) else key
+        self.normalize_lines = normalize_lines
+
+    def values(
+        self, path: str, actual: Any, expected: Any, in_lines: bool = False
+    ) -> Iterator[Difference]:
+        actual, expected = _plain(actual), _plain(expected)
+        if actual == expected:
+            return
+        if isinstance(actual, dict) and isinstance(expected, dict):
+            yield from self.objects(path, actual, expected)
+        elif isinstance(actual, list) and isinstance(expected, list):
+            yield from self.ordered(path, actual, expected, in_lines)
+        elif (
+            in_lines
+            and self.normalize_lines
+            and isinstance(actual, str)
+            and isinstance(expected, str)
+            and _normalize(actual) == _normalize(expected)
+        ):
+            return
+        else:
+            yield Difference(path, expected, actual)
+
+    def objects(
+        self, path: str, actual: dict, expected: dict
+    ) -> Iterator[Difference]:
+        for name in itertools.chain(
+            expected, (name for name in actual if name not in expected)
+        ):
+            yield from self.values(
+                f"{path}.{name}" if path else name,
+                actual.get(name, MISSING),
+                expected.get(name, MISSING),
+                in_lines=name == "lines",
+            )
+
+    def ordered(
+        self,
+        path: str,
+        actual: Iterable,
+        expected: list,
+        in_lines: bool = False,
+    ) -> Iterator[Difference]:
+        count = 0
+        for index, item in enumerate(actual):
+            count += 1
+            yield from self.values(
+                f"{path}[{index}]",
+                item,
+                expected[index] if index < len(expected) else MISSING,
+                in_lines,
+            )
+        for index in range(count, len(expected)):
+            yield Difference(f"{path}[{index}]", expected[index], MISSING)
+
+    def keyed(
+        self, path: str, actual: Iterable, expected: list
+    ) -> Iterator[Difference]:
+        # Items with the same key are matched in order
+        remaining: dict[Any, list] = {}
+        for item in reversed(expected):
+            item = _plain(item)
+            remaining.setdefault(self._key(item), []).append(item)
+        for item in actual:
+            item = _plain(item)
+            key = self._key(item)
+            matches = remaining.get(key)
+            yield from self.values(
+                f"{path}[{self.label}={key!r}]",
+                item,
+                matches.pop() if matches else MISSING,
+            )
+        for key, items in remaining.items():
+            for item in reversed(items):
+                yield Difference(f"{path}[{self.label}={key!r}]", item, MISSING)
+
+    def _key(self, item: Any) -> Any:
+        try:
+            return self.key(item)
+        except (AttributeError, TypeError, KeyError):
+            return None
+
+
+def _iter_body(response: Response) -> tuple[Optional[Iterator], Any]:
+    """
+    Items of an array body parsed incrementally, or the whole parsed body
+
+    Returns:
+        (items, None) for an array, (None, body) for any other JSON value
+    """
+    chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+    head = []
+    for chunk in chunks:
+        head.append(chunk)
+        if chunk.strip():
+            break
+    body = itertools.chain(head, chunks)
+    if b"".join(head).lstrip().startswith(b"["):
+        return iter_json_array(body, response.encoding or "utf-8"), None
+    return None, json.loads(b"".join(body))
+
+
+def diff_json(
+    actual: Any,
+    expected: Any,
+    key: ItemKey = None,
+    normalize_lines: bool = False,
+    max_differences: Optional[int] = 10,
+) -> list[Difference]:
+    """
+    Find differences between a body and expected data
+
+    Args:
+        actual: Response, JSON body bytes, decoded JSON (a str is a
+            decoded JSON string, not parsed), a model or a list or iterator
+            of models, e.g. from iter_poems_by_author()
+        expected: Expected decoded JSON or models
+        key: Match items of a top-level array by this field, e.g. "title",
+            or function of the item, in any order; None - in order
+        normalize_lines: Ignore differences of whitespace within items of
+            "lines" arrays
+        max_differences: Stop after this many differences, None - find all
+
+    Returns:
+        Differences, empty if the body matches
+    """
+    differ = _Differ(key, normalize_lines)
+    expected = _plain(expected)
+    if isinstance(actual, Response):
+        with actual:
+            items, body = _iter_body(actual)
+            if items is None:
+                return diff_json(
+                    body, expected, key, normalize_lines, max_differences
+                )
+            return diff_json(
+                items, expected, key, normalize_lines, max_differences
+            )
+    if isinstance(actual, (bytes, bytearray)):
+        actual = json.loads(actual)
+
+    if actual == expected:
+        return []
+    if isinstance(actual, (list, Iterator)) and isinstance(expected, list):
+        # Items are compared as they are produced, e.g. parsed from a
+        # stream, and the rest is never produced after max_differences
+        compare = differ.ordered if key is None else differ.keyed
+        differences = compare("", actual, expected)
+    else:
+        differences = differ.values("", _plain(actual), expected)
+    return list(itertools.islice(differences, max_differences))
+
+
+def assert_json_matches(
+    actual: Any,
+    expected: Any,
+    key: ItemKey = None,
+    normalize_lines: bool = False,
+    max_differences: int = 10,
+    message: str = "Response should match the expected data",
+) -> None:
+    """
+    Fail with a compact, path-based diff if a body differs from expected
+
+    Args:
+        actual: Response, JSON body bytes, models or decoded JSON
+        expected: Expected decoded JSON or models
+        key: Match items of a top-level array by this field or function,
+            in any order; None - in order
+        normalize_lines: Ignore whitespace differences within lines
+        max_differences: Differences to report before giving up
+        message: First line of the failure message
+
+    Raises:
+        AssertionError: If the body differs
+    """
+    __tracebackhide__ = True
+    differences = diff_json(
+        actual, expected, key, normalize_lines, max_differences
+    )
+    if differences:
+        shown = "\n".join(f"  {difference}" for difference in differences)
+        limit = (
+            f" (first {max_differences})"
+            if len(differences) == max_differences
+            else ""
+        )
+        raise AssertionError(f"{message}, differences{limit}:\n{shown}")
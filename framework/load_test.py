@@ -0,0 +1,369 @@
+"""
+Load generation with the framework's service layer.
+
+A weighted mix of service calls is replayed either open-loop, at a target
+arrival rate, or closed-loop, by a fixed number of concurrent users. In the
+open-loop mode latency is measured from the intended start of every call,
+so time spent waiting for a free worker when the system falls behind is
+recorded too (no coordinated omission).
+
+Usage:
+    python -m framework.load_test --rate 50 --duration 30 --ramp-up 5
+    python -m framework.load_test --concurrency 10 --duration 30 \\
+        --mix get_poem_by_title=60,get_poems_by_author=30,get_random_poem=10
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import traceback
+from collections import Counter
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+from requests import Response
+
+from framework.api.api_client import APIClient
+from framework.api.cache import bypass_cache
+from framework.api.services.author_service import AuthorService
+from framework.api.services.random_services import RandomService
+from framework.api.services.title_service import TitleService
+from framework.logger import APILogger
+from settings import API_URL
+from utilities.histogram import LatencyHistogram
+
+DEFAULT_MIX = {
+    "get_poem_by_title": 60,
+    "get_poems_by_author": 30,
+    "get_random_poem": 10,
+}
+
+
+@dataclass
+class Operation:
+    """Service call replayed by the load runner"""
+
+    name: str
+    weight: float
+    call: Callable[[], Response]
+
+
+@dataclass
+class LoadProfile:
+    """Shape of the generated load"""
+
+    # Target arrivals per second (open-loop), ignored when concurrency is set
+    rate: float = 10.0
+    # Number of concurrent users (closed-loop)
+    concurrency: Optional[int] = None
+    # Seconds of the whole run, including ramp-up
+    duration: float = 10.0
+    # Seconds to linearly increase the rate or the number of users
+    ramp_up: float = 0.0
+    # Worker threads of the open-loop mode
+    max_in_flight: int = 256
+    seed: Optional[int] = None
+
+
+@dataclass
+class OperationStats:
+    """Latencies and errors of one operation"""
+
+    # Intended start to completion (open-loop) or service time (closed-loop)
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    # Actual start to completion
+    service_time: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+    # Calls failed with an exception, by exception type
+    exceptions: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load run"""
+
+    operations: dict[str, OperationStats]
+    elapsed: float
+
+    @property
+    def total(self) -> OperationStats:
+        total = OperationStats()
+        for stats in self.operations.values():
+            total.latency.merge(stats.latency)
+            total.service_time.merge(stats.service_time)
+            total.errors += stats.errors
+            total.exceptions.update(stats.exceptions)
+        return total
+
+    @property
+    def throughput(self) -> float:
+        """Completed calls per second"""
+        return self.total.latency.count / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "elapsed": round(self.elapsed, 3),
+            "throughput": round(self.throughput, 2),
+            "operations": {
+                name: {
+                    "latency_ms": stats.latency.to_dict(),
+                    "service_time_ms": stats.service_time.to_dict(),
+                    "errors": stats.errors,
+                    "exceptions": dict(stats.exceptions),
+                }
+                for name, stats in {
+                    **self.operations,
+                    "total": self.total,
+                }.items()
+            },
+        }
+
+    def __str__(self) -> str:
+        columns = ("count", "p50", "p90", "p99", "max")
+        lines = [
+            f"{'operation':<24}"
+            + "".join(f"{column:>10}" for column in columns)
+            + f"{'errors':>10}"
+        ]
+        for name, stats in {**self.operations, "total": self.total}.items():
+            row = stats.latency.to_dict()
+            lines.append(
+                f"{name:<24}"
+                + "".join(f"{row[column]:>10}" for column in columns)
+                + f"{stats.errors:>10}"
+            )
+        for name, stats in self.operations.items():
+            if stats.exceptions:
+                counts = ", ".join(
+                    f"{error}={count}"
+                    for error, count in stats.exceptions.most_common()
+                )
+                lines.append(f"{name} exceptions: {counts}")
+        lines.append(
+            f"Elapsed {self.elapsed:.1f} s, "
+            f"throughput {self.throughput:.1f} calls/s (latency in ms)"
+        )
+        return "\n".join(lines)
+
+
+def default_operations(
+    api_client: APIClient, mix: dict[str, float] = None, seed: int = None
+) -> list[Operation]:
+    """
+    Build the weighted service call mix
+
+    Authors and titles used as call arguments are fetched from the API.
+
+    Args:
+        api_client: API client shared by all calls
+        mix: Operation name to weight, DEFAULT_MIX if not set
+        seed: Seed for argument selection
+
+    Returns:
+        Operations with their weights
+    """
+    author_service = AuthorService(api_client)
+    title_service = TitleService(api_client)
+    random_service = RandomService(api_client)
+    authors = author_service.get_all_authors()[0].authors
+    titles = title_service.get_all_titles()[0].titles
+    choose = random.Random(seed).choice
+
+    calls = {
+        "get_poem_by_title": lambda: title_service.get_poem_by_title(
+            choose(titles)
+        )[1],
+        "get_poems_by_author": lambda: author_service.get_poems_by_author(
+            choose(authors)
+        )[1],
+        "get_random_poem": lambda: random_service.get_random_poem()[1],
+    }
+
+    unknown = set(mix or {}) - set(calls)
+    if unknown:
+        raise ValueError(f"Unknown operations: {', '.join(sorted(unknown))}")
+
+    return [
+        Operation(name=name, weight=weight, call=calls[name])
+        for name, weight in (mix or DEFAULT_MIX).items()
+    ]
+
+
+class LoadRunner:
+    """Replays a weighted operation mix according to a load profile"""
+
+    def __init__(self, operations: list[Operation], profile: LoadProfile):
+        self.operations = operations
+        self.profile = profile
+        self._random = random.Random(profile.seed)
+        self._stats = {
+            operation.name: OperationStats() for operation in operations
+        }
+        self._lock = threading.Lock()
+
+    def _pick(self) -> Operation:
+        return self._random.choices(
+            self.operations,
+            weights=[operation.weight for operation in self.operations],
+        )[0]
+
+    def _execute(self, operation: Operation, intended_start: float) -> None:
+        started = time.perf_counter()
+        error = None
+        try:
+            # Worker threads do not inherit the context of the test, and
+            # cached or coalesced responses would not load the server
+            with bypass_cache():
+                failed = operation.call().status_code >= 400
+        except Exception as exception:
+            failed = True
+            error = exception
+        finished = time.perf_counter()
+
+        with self._lock:
+            stats = self._stats[operation.name]
+            stats.latency.record((finished - intended_start) * 1000)
+            stats.service_time.record((finished - started) * 1000)
+            stats.errors += failed
+            if error is not None:
+                error_type = type(error).__name__
+                first = error_type not in stats.exceptions
+                stats.exceptions[error_type] += 1
+
+        # Later occurrences are only counted, the first one is logged whole
+        if error is not None and first:
+            APILogger.log_error(
+                f"{operation.name} failed with {error_type}:\n"
+                + "".join(traceback.format_exception(error))
+            )
+
+    def arrival_offsets(self) -> list[float]:
+        """
+        Intended start offsets of the open-loop mode
+
+        During ramp-up the rate grows linearly, so n arrivals happen by
+        sqrt(2 * ramp_up * n / rate) seconds; afterwards the rate is constant.
+        """
+        rate, ramp_up = self.profile.rate, self.profile.ramp_up
+        offsets = []
+        arrival = 0
+        while True:
+            if arrival < rate * ramp_up / 2:
+                offset = math.sqrt(2 * ramp_up * arrival / rate)
+            else:
+                offset = ramp_up / 2 + arrival / rate
+            if offset >= self.profile.duration:
+                return offsets
+            offsets.append(offset)
+            arrival += 1
+
+    def _run_open_loop(self) -> None:
+        with ThreadPoolExecutor(
+            max_workers=self.profile.max_in_flight
+        ) as executor:
+            started = time.perf_counter()
+            for offset in self.arrival_offsets():
+                intended_start = started + offset
+                delay = intended_start - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                executor.submit(self._execute, self._pick(), intended_start)
+
+    def _run_closed_loop(self) -> None:
+        users = self.profile.concurrency
+        started = time.perf_counter()
+        deadline = started + self.profile.duration
+
+        def user(number: int) -> None:
+            time.sleep(self.profile.ramp_up * number / users)
+            while time.perf_counter() < deadline:
+                with self._lock:
+                    operation = self._pick()
+                self._execute(operation, time.perf_counter())
+
+        threads = [
+            threading.Thread(target=user, args=(number,), daemon=True)
+            for number in range(users)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def run(self) -> LoadResult:
+        """
+        Generate the load and wait for all calls to complete
+
+        Returns:
+            Latency and error statistics per operation
+        """
+        started = time.perf_counter()
+        if self.profile.concurrency:
+            self._run_closed_loop()
+        else:
+            self._run_open_loop()
+        return LoadResult(
+            operations=self._stats, elapsed=time.perf_counter() - started
+        )
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """Parse "name=weight,name=weight" into a mix"""
+    mix = {}
+    for item in value.split(","):
+        name, weight = item.split("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Drive the API services at a target load"
+    )
+    parser.add_argument("--url", default=API_URL, help="API base URL")
+    parser.add_argument(
+        "--rate", type=float, default=10.0, help="Arrivals per second"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, help="Concurrent users instead of a rate"
+    )
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--ramp-up", type=float, default=0.0)
+    parser.add_argument("--max-in-flight", type=int, default=256)
+    parser.add_argument(
+        "--mix", type=parse_mix, help="Weights, e.g. get_random_poem=10,..."
+    )
+    parser.add_argument("--seed", type=int)
+    parser.add_argument(
+        "--json", action="store_true", help="Print results as JSON"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] = None) -> None:
+    args = parse_args(argv)
+    profile = LoadProfile(
+        rate=args.rate,
+        concurrency=args.concurrency,
+        duration=args.duration,
+        ramp_up=args.ramp_up,
+        max_in_flight=args.max_in_flight,
+        seed=args.seed,
+    )
+    api_client = APIClient(
+        base_url=args.url,
+        pool_maxsize=args.concurrency or args.max_in_flight,
+    )
+    operations = default_operations(api_client, args.mix, args.seed)
+    result = LoadRunner(operations, profile).run()
+
+    print(json.dumps(result.to_dict(), indent=2) if args.json else result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Merge log shards written by pytest-xdist workers into the run's logs.
+
+Workers write the text log as JSON lines of [created, message] so that
+entries from all shards can be merged in time order; the merged output is
+the usual plain text log. Structured call logs are merged by their "ts".
+"""
+
+import glob
+import heapq
+import json
+import logging
+import os
+from collections.abc import Iterator
+
+
+class ShardFormatter(logging.Formatter):
+    """Formatter that keeps the record time next to the formatted message"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return json.dumps(
+            [record.created, record.getMessage()], separators=(",", ":")
+        )
+
+
+def _read_text_shard(path: str) -> Iterator[tuple[float, str]]:
+    with open(path, encoding="utf-8") as shard:
+        for line in shard:
+            created, message = json.loads(line)
+            yield created, message
+
+
+def _read_structured_shard(path: str) -> Iterator[tuple[float, str]]:
+    with open(path, encoding="utf-8") as shard:
+        for line in shard:
+            yield json.loads(line)["ts"], line.rstrip("\n")
+
+
+def merge_shards(
+    target_path: str, shard_paths: list[str], structured: bool = False
+) -> None:
+    """
+    Append shard entries to the target log in time order and remove shards
+
+    Args:
+        target_path: Merged log file (appended to)
+        shard_paths: Worker log shards
+        structured: Whether shards are structured JSON lines call logs
+    """
+    read_shard = _read_structured_shard if structured else _read_text_shard
+    # Every shard is already ordered, so a streaming k-way merge is enough
+    entries = heapq.merge(
+        *(read_shard(path) for path in shard_paths), key=lambda entry: entry[0]
+    )
+    with open(target_path, "a", encoding="utf-8") as target:
+        for _, message in entries:
+            target.write(message + "\n")
+
+    for path in shard_paths:
+        os.remove(path)
+
+
+def merge_worker_logs(log_directory: str, log_name: str) -> None:
+    """
+    Merge all worker shards of a run into the run's text and JSON lines logs
+
+    Args:
+        log_directory: Directory containing the logs
+        log_name: Log file name of the run without extension
+    """
+    for extension, structured in ((".log", False), (".jsonl", True)):
+        shard_paths = sorted(
+            glob.glob(os.path.join(log_directory, f"{log_name}_gw*{extension}"))
+        )
+        if shard_paths:
+            merge_shards(
+                os.path.join(log_directory, f"{log_name}{extension}"),
+                shard_paths,
+                structured=structured,
+            )
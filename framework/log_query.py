@@ -0,0 +1,163 @@
+"""
+Filter and aggregate structured API call logs (api_test_log_*.jsonl).
+
+Files are streamed line by line and latencies are collected into
+fixed-size histograms, so multi-GB logs are processed in constant memory.
+
+Usage:
+    python -m framework.log_query reports/logs/*.jsonl
+    python -m framework.log_query reports/logs/*.jsonl --group-by test
+    python -m framework.log_query reports/logs/*.jsonl --group-by path
+    python -m framework.log_query run.jsonl --method GET --status 500 --json
+"""
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from utilities.histogram import LatencyHistogram
+
+GROUP_KEYS = ("endpoint", "path", "test", "status", "method")
+
+
+@dataclass
+class CallStats:
+    """Aggregated statistics for a group of API calls"""
+
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+    response_bytes: int = 0
+
+    def add(self, record: dict) -> None:
+        self.histogram.record(record["latency_ms"])
+        self.response_bytes += record.get("resp_bytes", 0)
+        if record["status"] >= 400:
+            self.errors += 1
+
+    def to_dict(self) -> dict:
+        count = self.histogram.count
+        return {
+            **self.histogram.to_dict(),
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "resp_bytes": self.response_bytes,
+        }
+
+
+def read_records(paths: Iterable[str]) -> Iterator[dict]:
+    """
+    Stream call records from JSON lines files, skipping broken lines and
+    follow-up records of parsed bodies
+    """
+    for path in paths:
+        with open(path, encoding="utf-8") as log_file:
+            for line in log_file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "event" not in record:
+                    yield record
+
+
+def group_key(record: dict, group_by: str) -> str:
+    """Get the aggregation key of a record"""
+    # Endpoints are grouped by template, e.g. every /author/{name} call
+    # together; records without one by their path
+    if group_by == "endpoint" and record.get("template"):
+        return f"{record['method']} {record['template']}"
+    if group_by in ("endpoint", "path"):
+        return f"{record['method']} {urlsplit(record['url']).path}"
+    if group_by == "test":
+        return record.get("test") or "N/A"
+    return str(record[group_by])
+
+
+def matches(record: dict, args: argparse.Namespace) -> bool:
+    """Check a record against the command line filters"""
+    if args.method and record["method"] != args.method.upper():
+        return False
+    if args.status and record["status"] != args.status:
+        return False
+    if args.errors_only and record["status"] < 400:
+        return False
+    if args.url and args.url not in record["url"]:
+        return False
+    if args.test and args.test not in (record.get("test") or ""):
+        return False
+    if args.since and record["ts"] < args.since:
+        return False
+    return True
+
+
+def aggregate(
+    records: Iterable[dict], args: argparse.Namespace
+) -> dict[str, CallStats]:
+    """Aggregate filtered records by the requested key"""
+    groups: dict[str, CallStats] = defaultdict(CallStats)
+    for record in records:
+        if matches(record, args):
+            groups[group_key(record, args.group_by)].add(record)
+    return groups
+
+
+def print_table(groups: dict[str, CallStats]) -> None:
+    columns = ("count", "errors", "p50", "p95", "p99", "max")
+    key_width = max([len(key) for key in groups] + [len("key")])
+    print(
+        f"{'key':<{key_width}}  "
+        + "  ".join(f"{column:>9}" for column in columns)
+    )
+    for key, stats in sorted(
+        groups.items(), key=lambda item: -item[1].histogram.count
+    ):
+        row = stats.to_dict()
+        print(
+            f"{key:<{key_width}}  "
+            + "  ".join(f"{row[column]:>9}" for column in columns)
+        )
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Filter and aggregate structured API call logs"
+    )
+    parser.add_argument("paths", nargs="+", help="JSON lines log files")
+    parser.add_argument("--group-by", choices=GROUP_KEYS, default="endpoint")
+    parser.add_argument("--method", help="Only calls with this HTTP method")
+    parser.add_argument("--status", type=int, help="Only this status code")
+    parser.add_argument(
+        "--errors-only", action="store_true", help="Only status >= 400"
+    )
+    parser.add_argument("--url", help="Only URLs containing this text")
+    parser.add_argument("--test", help="Only test ids containing this text")
+    parser.add_argument(
+        "--since", type=float, help="Only calls after this UNIX timestamp"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print results as JSON"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] = None) -> None:
+    args = parse_args(argv)
+    groups = aggregate(read_records(args.paths), args)
+
+    if args.json:
+        json.dump(
+            {key: stats.to_dict() for key, stats in groups.items()},
+            sys.stdout,
+            indent=2,
+        )
+        print()
+    else:
+        print_table(groups)
+
+
+if __name__ == "__main__":
+    main()
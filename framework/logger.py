@@ -1,13 +1,85 @@
+import atexit
+import contextvars
+import itertools
+import json
 import logging
 import os
-import traceback
-from dataclasses import dataclass
+import queue
+import sys
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 from requests import PreparedRequest, Response
 
-from settings import CONSOLE_LOGS, LOG_DIRECTORY
+from framework.log_merge import ShardFormatter, merge_worker_logs
+from settings import (
+    ASYNC_LOGS,
+    CONSOLE_LOGS,
+    LOG_BODIES_ON_FAILURE_ONLY,
+    LOG_DIRECTORY,
+    LOG_MAX_BODY_BYTES,
+    LOG_REDACTED_HEADERS,
+    LOG_SUCCESS_SAMPLE_RATE,
+    STRUCTURED_LOG_BODIES,
+    STRUCTURED_LOGS,
+)
+
+
+@dataclass
+class CapturePolicy:
+    """Rules deciding which API calls are logged and how much of their bodies"""
+
+    # Maximum body size kept in the log, 0 - no limit
+    max_body_bytes: int = LOG_MAX_BODY_BYTES
+    # Log one of every N successful calls, failures are always logged
+    success_sample_rate: int = LOG_SUCCESS_SAMPLE_RATE
+    # Buffer calls per test and keep bodies only if the test fails
+    bodies_on_failure_only: bool = LOG_BODIES_ON_FAILURE_ONLY
+    # Comma-separated headers whose values are not logged
+    redacted_headers: str = LOG_REDACTED_HEADERS
+
+    REDACTED = "<redacted>"
+
+    def __post_init__(self):
+        self._success_counter = itertools.count()
+        self._redacted = {
+            name.strip().lower()
+            for name in self.redacted_headers.split(",")
+            if name.strip()
+        }
+
+    def should_log(self, status_code: int) -> bool:
+        """Check whether a call with this status code should be logged"""
+        if status_code >= 400 or self.success_sample_rate <= 1:
+            return True
+        return next(self._success_counter) % self.success_sample_rate == 0
+
+    def truncate(self, body: str | bytes | None) -> str | bytes | None:
+        """Keep the head and the tail of a body that exceeds the limit"""
+        if not body or not self.max_body_bytes:
+            return body
+        if len(body) <= self.max_body_bytes:
+            return body
+
+        half = self.max_body_bytes // 2
+        note = (
+            f"\n... [{len(body) - 2 * half} of {len(body)} bytes truncated]"
+            f" ...\n"
+        )
+        if isinstance(body, bytes):
+            note = note.encode()
+        return body[:half] + note + body[-half:]
+
+    def redact(self, headers: Mapping[str, str]) -> dict:
+        """Headers with the values of sensitive ones replaced"""
+        return {
+            name: self.REDACTED if name.lower() in self._redacted else value
+            for name, value in headers.items()
+        }
 
 
 @dataclass
@@ -16,11 +88,29 @@ class ResponseLogData:
 
     timestamp: datetime
     status_code: int
-    response_text: str
+    content: Optional[bytes]
+    encoding: Optional[str]
     headers: dict
+    size: int = 0
+    streamed: bool = False
+    # Request phases in milliseconds, see RequestTimings
+    timings: Optional[dict] = None
 
     LOG_SEPARATOR = "\n-----\n"
 
+    @property
+    def response_text(self) -> str:
+        """Response body decoded only when the entry is formatted"""
+        if self.streamed:
+            return "<streamed, not logged>"
+        if self.content is None:
+            return f"<omitted, {self.size} bytes>"
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def without_body(self) -> "ResponseLogData":
+        """Copy of the entry with the response body omitted"""
+        return replace(self, content=None)
+
     def format_log_entry(self) -> str:
         """Format response data for logging"""
         return (
@@ -28,9 +118,16 @@ class ResponseLogData:
             f"Response code: {self.status_code}\n"
             f"Response text: {self.response_text}\n"
             f"Response headers: {self.headers}\n"
-            f"{self.LOG_SEPARATOR}"
+            + (
+                f"Response timings (ms): {self.timings}\n"
+                if self.timings
+                else ""
+            )
+            + f"{self.LOG_SEPARATOR}"
         )
 
+    __str__ = format_log_entry
+
 
 @dataclass
 class RequestLogData:
@@ -38,7 +135,7 @@ class RequestLogData:
 
     timestamp: datetime
     test_name: Optional[str]
-    function_name: str
+    function_name: Optional[str]
     method: str
     url: str
     payload: str | bytes | None
@@ -59,6 +156,210 @@ class RequestLogData:
             f"Request data: {self.payload}\n"
         )
 
+    __str__ = format_log_entry
+
+    def without_body(self) -> "RequestLogData":
+        """Copy of the entry with the request payload omitted"""
+        if self.payload is None:
+            return self
+        return replace(self, payload=f"<omitted, {len(self.payload)} bytes>")
+
+
+@dataclass
+class CallLogData:
+    """Class for formatting one compact structured record per API call"""
+
+    timestamp: float
+    test_name: Optional[str]
+    method: str
+    url: str
+    status_code: int
+    latency: float
+    request_size: int
+    response_size: int
+    # Endpoint template, e.g. "/author/{name}", None if unknown
+    template: Optional[str] = None
+    body: Optional[bytes] = None
+    body_ref: Optional[str] = None
+    timings: Optional[dict] = None
+
+    def format_log_entry(self) -> str:
+        """Format call data as a single JSON line"""
+        return json.dumps(
+            {
+                "ts": round(self.timestamp, 6),
+                "test": self.test_name,
+                "method": self.method,
+                "url": self.url,
+                "template": self.template,
+                "status": self.status_code,
+                "latency_ms": round(self.latency * 1000, 3),
+                "req_bytes": self.request_size,
+                "resp_bytes": self.response_size,
+                "body_ref": self.body_ref,
+                **({"timings": self.timings} if self.timings else {}),
+            },
+            separators=(",", ":"),
+        )
+
+    __str__ = format_log_entry
+
+
+@dataclass
+class ParseLogData:
+    """
+    Class for formatting the follow-up record of a call whose body was
+    parsed, with all phases including JSON decode and validation
+    """
+
+    timestamp: float
+    test_name: Optional[str]
+    method: str
+    url: str
+    timings: dict
+
+    def format_log_entry(self) -> str:
+        """Format parse data as a single JSON line"""
+        return json.dumps(
+            {
+                "ts": round(self.timestamp, 6),
+                "event": "parsed",
+                "test": self.test_name,
+                "method": self.method,
+                "url": self.url,
+                "timings": self.timings,
+            },
+            separators=(",", ":"),
+        )
+
+    __str__ = format_log_entry
+
+
+# Records written as JSON lines by StructuredLogHandler
+STRUCTURED_RECORDS = (CallLogData, ParseLogData)
+
+
+class DeferredFileHandler(logging.FileHandler):
+    """
+    File handler that creates its directory and file on the first record,
+    so runs that log nothing (e.g. --collect-only) leave no empty logs
+    """
+
+    def __init__(self, filename: str):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class StructuredLogHandler(DeferredFileHandler):
+    """
+    Handler writing CallLogData and ParseLogData records as JSON lines.
+    Response bodies of calls,
+    when captured, are appended to a side file and referenced from the
+    record as "<file name>:<offset>:<length>".
+    """
+
+    def __init__(self, filename: str, bodies_filename: str = None):
+        super().__init__(filename)
+        self.bodies_filename = bodies_filename
+        self.bodies_file = None
+        self.addFilter(
+            lambda record: isinstance(record.msg, STRUCTURED_RECORDS)
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        call_data = record.msg
+        if (
+            self.bodies_filename
+            and isinstance(call_data, CallLogData)
+            and call_data.body is not None
+        ):
+            if self.bodies_file is None:
+                os.makedirs(
+                    os.path.dirname(self.bodies_filename), exist_ok=True
+                )
+                self.bodies_file = open(self.bodies_filename, "ab")
+            offset = self.bodies_file.tell()
+            self.bodies_file.write(call_data.body)
+            call_data.body_ref = (
+                f"{os.path.basename(self.bodies_file.name)}:"
+                f"{offset}:{len(call_data.body)}"
+            )
+        super().emit(record)
+
+    def flush(self) -> None:
+        super().flush()
+        if self.bodies_file is not None:
+            self.bodies_file.flush()
+
+    def close(self) -> None:
+        if self.bodies_file is not None:
+            self.bodies_file.close()
+            self.bodies_file = None
+        super().close()
+
+
+def is_text_log_record(record: logging.LogRecord) -> bool:
+    """Keep structured call records out of the text log"""
+    return not isinstance(record.msg, STRUCTURED_RECORDS)
+
+
+# Running test as "<node id> (<phase>)", set by conftest and inherited by
+# asyncio tasks and by calls submitted through APIClient.map_get
+current_test: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "current_test", default=None
+)
+
+
+@contextmanager
+def attribute_to_test(test_name: str) -> Iterator[None]:
+    """Attribute API calls made in this context to the given test"""
+    token = current_test.set(test_name)
+    try:
+        yield
+    finally:
+        current_test.reset(token)
+
+
+def get_current_test() -> Optional[str]:
+    """Get the running test, falling back to the pytest environment variable"""
+    return current_test.get() or os.environ.get("PYTEST_CURRENT_TEST")
+
+
+def get_caller() -> Optional[str]:
+    """
+    Get the function calling the API: the innermost named function outside
+    the framework, e.g. the test, skipping lambdas and comprehensions
+
+    Returns:
+        Function name, None if the call was started by a worker thread or
+        an asyncio task, which must name the caller themselves
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "").split(".")[0]
+        name = frame.f_code.co_name
+        if module in ("asyncio", "concurrent", "threading"):
+            return None
+        if module != "framework" and (
+            not name.startswith("<") or name == "<module>"
+        ):
+            return name
+        frame = frame.f_back
+    return None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that enqueues records untouched, so message formatting
+    happens in the QueueListener thread instead of on the request path
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
 
 class APILogger:
     """Logger for API requests and responses"""
@@ -67,60 +368,214 @@ class APILogger:
     logger = logging.getLogger("api_test_framework")
     logger.setLevel(logging.INFO)
 
-    # Create a unique log file for this session
-    date_now = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    log_file_path = os.path.join(LOG_DIRECTORY, f"api_test_log_{date_now}.log")
+    capture_policy = CapturePolicy()
+    # Entries of the running test kept until its outcome is known
+    test_records: list[RequestLogData | ResponseLogData] = []
+
+    # Create a unique log file for this session. The timestamp is shared
+    # with pytest-xdist workers through the environment, and every worker
+    # writes its own shard that is merged into the run's log at the end
+    date_now = os.environ.setdefault(
+        "API_TEST_RUN_ID", datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    )
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER")
+    log_name = f"api_test_log_{date_now}"
+    shard_name = f"{log_name}_{worker_id}" if worker_id else log_name
+    log_file_path = os.path.join(LOG_DIRECTORY, f"{shard_name}.log")
 
-    # File handler
-    file_handler = logging.FileHandler(log_file_path)
+    # File handler, the file is created when the first entry is logged
+    file_handler = DeferredFileHandler(log_file_path)
     file_handler.setLevel(logging.INFO)
-    logger.addHandler(file_handler)
+    file_handler.addFilter(is_text_log_record)
+    if worker_id:
+        file_handler.setFormatter(ShardFormatter())
+    handlers = [file_handler]
 
     # Console handler (optional)
     if CONSOLE_LOGS:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
-        logger.addHandler(console_handler)
+        console_handler.addFilter(is_text_log_record)
+        handlers.append(console_handler)
+
+    # Structured JSON lines handler (optional)
+    structured_handler = None
+    if STRUCTURED_LOGS:
+        structured_handler = StructuredLogHandler(
+            os.path.join(LOG_DIRECTORY, f"{shard_name}.jsonl"),
+            bodies_filename=(
+                os.path.join(LOG_DIRECTORY, f"{shard_name}.bodies")
+                if STRUCTURED_LOG_BODIES
+                else None
+            ),
+        )
+        structured_handler.setLevel(logging.INFO)
+        handlers.append(structured_handler)
+
+    # Queue-backed mode: the request path only enqueues raw records,
+    # formatting, decoding and IO happen in the listener thread
+    listener = None
+    if ASYNC_LOGS:
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        logger.addHandler(DeferredQueueHandler(log_queue))
+        # Records carry unformatted messages and must not be formatted
+        # synchronously by handlers of parent loggers
+        logger.propagate = False
+        listener.start()
+        atexit.register(listener.stop)
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
 
     @classmethod
-    def log_api_call(cls, response: Response) -> None:
-        """Log both request and response for an API call"""
-        cls.log_request(response.request)
-        cls.log_response(response)
+    def log_api_call(
+        cls,
+        response: Response,
+        streamed: bool = False,
+        template: str = None,
+        caller: str = None,
+    ) -> None:
+        """
+        Log both request and response for an API call
+
+        Args:
+            response: Response of the call
+            streamed: Whether the body is streamed and must not be read
+            template: Endpoint template the URL was built from
+            caller: Function that called the API, see get_caller()
+        """
+        if cls.structured_handler is not None:
+            cls.log_call(response, streamed, template)
+        if not cls.capture_policy.should_log(response.status_code):
+            return
+        cls.log_request(response.request, caller)
+        cls.log_response(response, streamed)
 
     @classmethod
-    def log_request(cls, request: PreparedRequest) -> None:
+    def log_request(cls, request: PreparedRequest, caller: str = None) -> None:
         """Log HTTP request details"""
         # Get a test name from pytest if available
-        test_name = os.environ.get("PYTEST_CURRENT_TEST")
-
-        # Get calling function name
-        stack = traceback.extract_stack()
-        function_name = stack[-3][2]
+        test_name = get_current_test()
 
         log_data = RequestLogData(
             timestamp=datetime.now(),
             test_name=test_name,
-            function_name=function_name,
+            function_name=caller,
             method=request.method,
             url=request.url,
-            headers=dict(request.headers),
-            payload=request.body,
+            headers=cls.capture_policy.redact(request.headers),
+            payload=cls.capture_policy.truncate(request.body),
         )
 
-        cls.logger.info(log_data.format_log_entry())
+        cls._emit(log_data)
 
     @classmethod
-    def log_response(cls, response: Response) -> None:
+    def log_response(cls, response: Response, streamed: bool = False) -> None:
         """Log HTTP response details"""
         log_data = ResponseLogData(
             timestamp=datetime.now(),
             status_code=response.status_code,
-            response_text=response.text,
-            headers=dict(response.headers),
+            content=(
+                None
+                if streamed
+                else cls.capture_policy.truncate(response.content)
+            ),
+            encoding=response.encoding,
+            headers=cls.capture_policy.redact(response.headers),
+            size=cls._body_size(response, streamed),
+            streamed=streamed,
+            timings=cls._timings(response),
+        )
+
+        cls._emit(log_data)
+
+    @classmethod
+    def log_call(
+        cls, response: Response, streamed: bool = False, template: str = None
+    ) -> None:
+        """Log a compact structured record of an API call"""
+        test_name = get_current_test()
+        request_body = response.request.body
+
+        log_data = CallLogData(
+            timestamp=datetime.now().timestamp(),
+            # Strip the " (call)" phase suffix to get the test node id
+            test_name=test_name.rsplit(" ", 1)[0] if test_name else None,
+            method=response.request.method,
+            url=response.request.url,
+            status_code=response.status_code,
+            latency=response.elapsed.total_seconds(),
+            request_size=len(request_body) if request_body else 0,
+            response_size=cls._body_size(response, streamed),
+            template=template,
+            body=(
+                cls.capture_policy.truncate(response.content)
+                if STRUCTURED_LOG_BODIES and not streamed
+                else None
+            ),
+            timings=cls._timings(response),
         )
 
-        cls.logger.info(log_data.format_log_entry())
+        cls.logger.info(log_data)
+
+    @classmethod
+    def log_parse(cls, response: Response) -> None:
+        """
+        Log a follow-up structured record of a call once its body is
+        parsed, as the call record is written before JSON decode and
+        validation are timed
+
+        Args:
+            response: Response with timings
+        """
+        if cls.structured_handler is None:
+            return
+        test_name = get_current_test()
+        cls.logger.info(
+            ParseLogData(
+                timestamp=datetime.now().timestamp(),
+                test_name=test_name.rsplit(" ", 1)[0] if test_name else None,
+                method=response.request.method,
+                url=response.request.url,
+                timings=cls._timings(response),
+            )
+        )
+
+    @staticmethod
+    def _timings(response: Response) -> Optional[dict]:
+        """Request phases measured so far, in the instrumentation mode"""
+        timings = getattr(response, "timings", None)
+        return timings.to_dict() if timings is not None else None
+
+    @staticmethod
+    def _body_size(response: Response, streamed: bool) -> int:
+        """Body size without reading the body of a streamed response"""
+        if streamed:
+            return int(response.headers.get("Content-Length", 0))
+        return len(response.content)
+
+    @classmethod
+    def _emit(cls, log_data: RequestLogData | ResponseLogData) -> None:
+        """Write the entry or buffer it until the test outcome is known"""
+        if cls.capture_policy.bodies_on_failure_only and get_current_test():
+            cls.test_records.append(log_data)
+        else:
+            cls.logger.info(log_data)
+
+    @classmethod
+    def release_test_records(cls, failed: bool) -> None:
+        """
+        Write entries buffered for the finished test
+
+        Args:
+            failed: Whether the test failed; bodies are dropped otherwise
+        """
+        records, cls.test_records = cls.test_records, []
+        for log_data in records:
+            cls.logger.info(log_data if failed else log_data.without_body())
 
     @classmethod
     def log_info(cls, message: str) -> None:
@@ -131,3 +586,60 @@ class APILogger:
     def log_error(cls, message: str) -> None:
         """Log error message"""
         cls.logger.error(message)
+
+    @classmethod
+    def flush(cls) -> None:
+        """Write out all queued records and flush the handlers"""
+        if cls.listener is not None:
+            # Stopping the listener drains the queue before it returns
+            cls.listener.stop()
+            cls.listener.start()
+        for handler in cls.handlers:
+            handler.flush()
+
+    @classmethod
+    @contextmanager
+    def redirect(cls, directory: str) -> Iterator[None]:
+        """
+        Write the log files of the block into another directory, e.g. the
+        temporary directory of a unit test
+
+        Args:
+            directory: Directory of the log files, created on first use
+        """
+        cls.flush()
+        handlers = {
+            handler: (
+                handler.baseFilename,
+                getattr(handler, "bodies_filename", None),
+            )
+            for handler in cls.handlers
+            if isinstance(handler, DeferredFileHandler)
+        }
+
+        def move(handler: DeferredFileHandler, filename: str, bodies: str):
+            # Closed handlers open the file again on their next record
+            with handler.lock:
+                handler.close()
+                handler.baseFilename = filename
+                if bodies:
+                    handler.bodies_filename = bodies
+
+        for handler, (filename, bodies) in handlers.items():
+            move(
+                handler,
+                os.path.join(directory, os.path.basename(filename)),
+                bodies and os.path.join(directory, os.path.basename(bodies)),
+            )
+        try:
+            yield
+        finally:
+            cls.flush()
+            for handler, (filename, bodies) in handlers.items():
+                move(handler, filename, bodies)
+
+    @classmethod
+    def merge_worker_logs(cls) -> None:
+        """Merge log shards of pytest-xdist workers into this run's logs"""
+        cls.flush()
+        merge_worker_logs(LOG_DIRECTORY, cls.log_name)
@@ -0,0 +1,161 @@
+"""
+Latency metrics of all API calls made during a test run.
+
+Every call is recorded into a fixed-memory histogram of its endpoint
+template ("GET /author/{name}"), so percentiles and throughput cover the
+whole run rather than single assertions.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from utilities.histogram import LatencyHistogram
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Template of an endpoint built by framework.api.endpoints"""
+    return getattr(endpoint, "template", endpoint)
+
+
+@dataclass
+class EndpointMetrics:
+    """Latencies and errors of calls to one endpoint template"""
+
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+
+    def to_dict(self, elapsed: float) -> dict:
+        return {
+            **self.latency.to_dict(),
+            "errors": self.errors,
+            "throughput": round(
+                self.latency.count / elapsed if elapsed else 0.0, 3
+            ),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe per-endpoint latency histograms"""
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointMetrics] = {}
+        # Wall clock time of the first and the last recorded call
+        self.started: float = None
+        self.finished: float = None
+        self._lock = threading.Lock()
+
+    def record(
+        self, method: str, endpoint: str, latency: float, status_code: int
+    ) -> None:
+        """
+        Record a completed API call
+
+        Args:
+            method: HTTP method
+            endpoint: Requested endpoint, grouped by its template
+            latency: Call latency in seconds
+            status_code: Response status code
+        """
+        key = f"{method} {endpoint_template(endpoint)}"
+        now = time.time()
+        with self._lock:
+            metrics = self.endpoints.get(key)
+            if metrics is None:
+                metrics = self.endpoints[key] = EndpointMetrics()
+            metrics.latency.record(latency * 1000)
+            metrics.errors += status_code >= 400
+            if self.started is None:
+                self.started = now - latency
+            self.finished = now
+
+    def percentile(
+        self, method: str, endpoint: str, percent: float, min_samples: int = 1
+    ) -> Optional[float]:
+        """
+        Get a latency percentile of an endpoint template
+
+        Args:
+            method: HTTP method
+            endpoint: Endpoint, grouped by its template
+            percent: Percentile in range 0-100
+            min_samples: Calls needed for a meaningful percentile
+
+        Returns:
+            Latency in milliseconds, None if there are fewer calls
+        """
+        key = f"{method} {endpoint_template(endpoint)}"
+        with self._lock:
+            metrics = self.endpoints.get(key)
+            if metrics is None or metrics.latency.count < min_samples:
+                return None
+            return metrics.latency.percentile(percent)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds between the first and the last recorded call"""
+        if self.started is None:
+            return 0.0
+        return self.finished - self.started
+
+    def to_state(self) -> dict:
+        """Raw state to merge in another process, e.g. an xdist controller"""
+        with self._lock:
+            return {
+                "started": self.started,
+                "finished": self.finished,
+                "endpoints": {
+                    key: {
+                        "latency": asdict(metrics.latency),
+                        "errors": metrics.errors,
+                    }
+                    for key, metrics in self.endpoints.items()
+                },
+            }
+
+    def merge_state(self, state: dict) -> None:
+        """Add metrics recorded by another registry, see to_state()"""
+        with self._lock:
+            for key, recorded in state["endpoints"].items():
+                metrics = self.endpoints.get(key)
+                if metrics is None:
+                    metrics = self.endpoints[key] = EndpointMetrics()
+                metrics.latency.merge(LatencyHistogram(**recorded["latency"]))
+                metrics.errors += recorded["errors"]
+            if state["started"] is not None:
+                self.started = min(
+                    self.started or state["started"], state["started"]
+                )
+                self.finished = max(
+                    self.finished or state["finished"], state["finished"]
+                )
+
+    def summary(self) -> dict:
+        """
+        Get percentiles and throughput of every endpoint template
+
+        Returns:
+            Run duration and per-endpoint metrics, latencies in milliseconds
+        """
+        elapsed = self.elapsed
+        with self._lock:
+            return {
+                "elapsed": round(elapsed, 3),
+                "endpoints": {
+                    key: self.endpoints[key].to_dict(elapsed)
+                    for key in sorted(self.endpoints)
+                },
+            }
+
+    def write_json(self, path: str) -> None:
+        """Write the summary as a JSON artifact"""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.summary(), file, indent=2)
+
+
+# Metrics of the current process, recorded by the API clients
+api_metrics = MetricsRegistry()
@@ -0,0 +1,371 @@
+"""
+In-memory stand-in for the PoetryDB endpoints used by the tests.
+
+Serves /author, /title, /lines and /random from a list of poems, either
+over HTTP on a local port (asyncio, keep-alive) or in-process through a
+transport adapter mounted on APIClient, so runs need no network.
+
+Usage:
+    python -m framework.stub_server --port 3000 --generate 10000
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+from datetime import timedelta
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from framework.corpus.oracle import (
+    NOT_FOUND,
+    CorpusOracle,
+    parse_search,
+    project,
+)
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+}
+
+BAD_REQUEST = json.dumps({"status": 400, "reason": "Bad request"}).encode()
+
+WORDS = (
+    "moon night sleep love death soul light sun sea star song heart dream "
+    "winter summer rose shadow silence river morning memory thought wind "
+    "grave bird flower time eternity stranger passion home"
+).split()
+
+
+def seed_poems() -> list[dict]:
+    """
+    Poems expected by the test suite
+
+    The suite checks only the author and title of the Bob Willett poem, so
+    its lines are synthetic placeholders, not the text of the poem.
+    """
+    from tests.data.test_data import (
+        exp_emily_dickinson_poems,
+        exp_the_moon_maiden_song,
+    )
+
+    return [
+        *exp_emily_dickinson_poems,
+        exp_the_moon_maiden_song,
+        {
+            "title": "A Soap Opera (How",
+            "author": "Bob Willett",
+            "lines": ["Synthetic stub line, not the text of the poem"],
+            "linecount": "1",
+        },
+    ]
+
+
+def generate_poems(count: int, seed: int = 0) -> list[dict]:
+    """
+    Generate a corpus of poems for load tests and benchmarks
+
+    Args:
+        count: Number of poems
+        seed: Random seed, the same seed gives the same corpus
+
+    Returns:
+        Poems of about count / 20 generated authors
+    """
+    generator = random.Random(seed)
+    authors = [
+        f"Generated Author {number}" for number in range(count // 20 + 1)
+    ]
+    poems = []
+    for number in range(count):
+        lines = [
+            " ".join(generator.choices(WORDS, k=generator.randint(3, 8)))
+            for _ in range(generator.randint(4, 40))
+        ]
+        poems.append(
+            {
+                "title": f"{' '.join(generator.choices(WORDS, k=3))} {number}",
+                "author": generator.choice(authors),
+                "lines": lines,
+                "linecount": str(len(lines)),
+            }
+        )
+    return poems
+
+
+class PoetryStore:
+    """PoetryDB endpoints over an in-memory list of poems"""
+
+    def __init__(self, poems: list[dict], seed: int = None):
+        """
+        Args:
+            poems: Poems with title, author, lines and linecount
+            seed: Seed of the /random endpoint
+        """
+        self.poems = poems
+        self.oracle = CorpusOracle.from_poems(poems)
+        self.authors = self.oracle.authors
+        self.titles = self.oracle.titles
+        self._random = random.Random(seed)
+        # Rendered bodies of repeated queries
+        self._render = lru_cache(maxsize=4096)(self._render_query)
+
+    def _render_query(self, path: str) -> bytes:
+        parts = path.strip("/").split("/", 1)
+        search = parse_search(path)
+        if parts == ["author"]:
+            body = {"authors": self.authors}
+        elif parts == ["title"]:
+            body = {"titles": self.titles}
+        elif search is not None:
+            field, text, outputs = search
+            body = project(
+                [
+                    self.poems[number]
+                    for number in self.oracle.find(field, text)
+                ],
+                outputs,
+            )
+        else:
+            body = NOT_FOUND
+        return json.dumps(body).encode()
+
+    def handle(self, method: str, path: str) -> tuple[int, bytes]:
+        """
+        Answer a request
+
+        Args:
+            method: HTTP method
+            path: URL-decoded request path without the query string
+
+        Returns:
+            HTTP status code and JSON body; like PoetryDB, unknown resources
+            are reported in the body of a 200 response
+        """
+        if method not in ("GET", "HEAD"):
+            return 405, json.dumps({"status": 405}).encode()
+
+        parts = path.strip("/").split("/")
+        if parts[0] == "random" and len(parts) <= 2 and self.poems:
+            count = int(parts[1]) if parts[-1].isdigit() else 1
+            return (
+                200,
+                json.dumps(
+                    self._random.sample(self.poems, min(count, len(self.poems)))
+                ).encode(),
+            )
+
+        return 200, self._render(path)
+
+
+def _http_response(status: int, body: bytes, close: bool) -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        + ("Connection: close\r\n" if close else "")
+        + "\r\n"
+    )
+    return head.encode() + body
+
+
+class StubServer:
+    """
+    Keep-alive HTTP server for a PoetryStore. Runs its own event loop in
+    a daemon thread, so it can serve tests of the same process.
+    """
+
+    def __init__(
+        self,
+        store: PoetryStore,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        delay: float = 0.0,
+    ):
+        """
+        Args:
+            store: Poems to serve
+            host: Interface to listen on
+            port: Port to listen on, 0 - an ephemeral port
+            delay: Simulated server latency in seconds
+        """
+        self.store = store
+        self.host = host
+        self.port = port
+        self.delay = delay
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._server: Optional[asyncio.Server] = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @staticmethod
+    async def _read_request(
+        reader: asyncio.StreamReader,
+    ) -> tuple[str, str, bool]:
+        # Method, target and whether the client closes the connection
+        head = await reader.readuntil(b"\r\n\r\n")
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        method, target, _ = request_line.split(" ", 2)
+        close = False
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                await reader.readexactly(int(value))
+            elif name == "connection":
+                close = value.strip().lower() == "close"
+        return method, target, close
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                try:
+                    method, target, close = await self._read_request(reader)
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Malformed request line or Content-Length, or a head
+                    # over the stream limit: the rest cannot be framed
+                    writer.write(_http_response(400, BAD_REQUEST, True))
+                    await writer.drain()
+                    break
+
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                status, body = self.store.handle(
+                    method, unquote(urlsplit(target).path)
+                )
+                writer.write(
+                    _http_response(
+                        status, b"" if method == "HEAD" else body, close
+                    )
+                )
+                await writer.drain()
+                if close:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _serve(self) -> None:
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port, backlog=1024
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _shutdown(self) -> None:
+        # Cancel the server and open connections of the loop thread
+        tasks = [
+            task
+            for task in asyncio.all_tasks()
+            if task is not asyncio.current_task()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _run(self) -> None:
+        self._loop.create_task(self._serve())
+        self._loop.run_forever()
+
+    def start(self) -> str:
+        """Start serving in a background thread and return the base URL"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        return self.url
+
+    def stop(self) -> None:
+        """Stop serving and close open connections"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def serve_forever(self) -> None:
+        """Serve in the current thread until interrupted"""
+        asyncio.run(self._serve())
+
+
+class StubAdapter(BaseAdapter):
+    """Transport adapter answering requests from a PoetryStore in-process"""
+
+    def __init__(self, store: PoetryStore):
+        super().__init__()
+        self.store = store
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        status, body = self.store.handle(
+            request.method, unquote(urlsplit(request.url).path)
+        )
+
+        response = Response()
+        response.status_code = status
+        response.reason = REASONS.get(status)
+        response.headers = CaseInsensitiveDict(
+            {
+                "Content-Type": "application/json",
+                "Content-Length": str(len(body)),
+            }
+        )
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(0)
+        response._content = b"" if request.method == "HEAD" else body
+        response._content_consumed = True
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Serve PoetryDB endpoints from memory"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument(
+        "--generate", type=int, default=0, help="Generated poems to add"
+    )
+    parser.add_argument(
+        "--delay", type=float, default=0.0, help="Latency in seconds"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] = None) -> None:
+    args = parse_args(argv)
+    store = PoetryStore(
+        seed_poems() + generate_poems(args.generate, args.seed), args.seed
+    )
+    server = StubServer(store, args.host, args.port, args.delay)
+    print(f"Serving {len(store.poems)} poems at {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
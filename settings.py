@@ -6,13 +6,128 @@ load_dotenv()
 
 # System Under Test Environment
 LOCAL_RUNNER = bool(int(os.getenv("LOCAL_RUNNER", 0)))
-API_URL = os.getenv("API_URL").rstrip("/")
+API_URL = (os.getenv("API_URL") or "").rstrip("/")
+# Run tests against the in-repo PoetryDB stub instead of API_URL
+USE_STUB_SERVER = bool(int(os.getenv("USE_STUB_SERVER", 0)))
+# Answer requests of the sync client in-process, without sockets
+STUB_IN_PROCESS = bool(int(os.getenv("STUB_IN_PROCESS", 0)))
+
+# HTTP Connection Configuration
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", 10))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", 32))
+HTTP_POOL_BLOCK = bool(int(os.getenv("HTTP_POOL_BLOCK", 0)))
+HTTP_KEEP_ALIVE = bool(int(os.getenv("HTTP_KEEP_ALIVE", 1)))
+HTTP_TCP_NODELAY = bool(int(os.getenv("HTTP_TCP_NODELAY", 1)))
+# Timeouts in seconds, 0 - no timeout
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT") or 5) or None
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT") or 30) or None
+# Retries of idempotent requests after connection errors and 429/502/503/504,
+# the first backoff in seconds is doubled on every retry (with full jitter)
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", 0))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", 0.1))
+# Send a backup copy of GET requests slower than HTTP_HEDGE_DELAY seconds,
+# empty - slower than the p95 latency of their endpoint
+HTTP_HEDGE = bool(int(os.getenv("HTTP_HEDGE", 0)))
+HTTP_HEDGE_DELAY = float(os.getenv("HTTP_HEDGE_DELAY") or 0) or None
+# Fail calls to an endpoint fast once this share of its last 20 calls failed,
+# and let a trial call through after the reset timeout in seconds
+HTTP_CIRCUIT_BREAKER = bool(int(os.getenv("HTTP_CIRCUIT_BREAKER", 0)))
+HTTP_CIRCUIT_FAILURE_THRESHOLD = float(
+    os.getenv("HTTP_CIRCUIT_FAILURE_THRESHOLD", 0.5)
+)
+HTTP_CIRCUIT_RESET_TIMEOUT = float(os.getenv("HTTP_CIRCUIT_RESET_TIMEOUT", 30))
+# Load tests turn retries and the circuit breaker on for their run even
+# when functional tests run without them
+LOAD_HTTP_RETRIES = int(os.getenv("LOAD_HTTP_RETRIES", 2))
+LOAD_HTTP_CIRCUIT_BREAKER = bool(int(os.getenv("LOAD_HTTP_CIRCUIT_BREAKER", 1)))
+# Send identical concurrent GET requests once and share the response
+HTTP_SINGLE_FLIGHT = bool(int(os.getenv("HTTP_SINGLE_FLIGHT", 0)))
+# Cassette to record responses to and replay them from, empty - disabled
+HTTP_CASSETTE = os.getenv("HTTP_CASSETTE") or None
+# record, replay or auto (replay recorded requests, record the rest)
+HTTP_CASSETTE_MODE = os.getenv("HTTP_CASSETTE_MODE", "auto")
+# Share of the recorded latency simulated on replay, 0 - reply at once
+HTTP_CASSETTE_LATENCY_SCALE = float(os.getenv("HTTP_CASSETTE_LATENCY_SCALE", 0))
+# Measure DNS, connect, TLS, TTFB and download time of every request
+HTTP_TIMINGS = bool(int(os.getenv("HTTP_TIMINGS", 0)))
+
+# Response cache for GET requests
+RESPONSE_CACHE = bool(int(os.getenv("RESPONSE_CACHE", 0)))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 300))
+RESPONSE_CACHE_MAX_BYTES = int(
+    os.getenv("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+)
+# SQLite file to share cached responses between runs, empty - memory only
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH") or None
+# Size limit and seconds entries are kept in the SQLite file
+RESPONSE_CACHE_DISK_MAX_BYTES = int(
+    os.getenv("RESPONSE_CACHE_DISK_MAX_BYTES", 256 * 1024 * 1024)
+)
+RESPONSE_CACHE_DISK_MAX_AGE = float(
+    os.getenv("RESPONSE_CACHE_DISK_MAX_AGE", 7 * 24 * 60 * 60)
+)
 
 # Logging Configuration
+# Created with the first log entry
 LOG_DIRECTORY = os.path.join(os.path.dirname(__file__), "reports/logs")
-os.makedirs(LOG_DIRECTORY, exist_ok=True)
 CONSOLE_LOGS = bool(int(os.getenv("CONSOLE_LOGS", 0)))
+ASYNC_LOGS = bool(int(os.getenv("ASYNC_LOGS", 0)))
+# Structured JSON lines log, optionally with response bodies in a side file
+STRUCTURED_LOGS = bool(int(os.getenv("STRUCTURED_LOGS", 0)))
+STRUCTURED_LOG_BODIES = bool(int(os.getenv("STRUCTURED_LOG_BODIES", 0)))
+# Request/response body capture policy
+LOG_MAX_BODY_BYTES = int(os.getenv("LOG_MAX_BODY_BYTES", 0))
+LOG_SUCCESS_SAMPLE_RATE = int(os.getenv("LOG_SUCCESS_SAMPLE_RATE", 1))
+LOG_BODIES_ON_FAILURE_ONLY = bool(
+    int(os.getenv("LOG_BODIES_ON_FAILURE_ONLY", 0))
+)
+# Comma-separated request/response headers whose values are not logged
+LOG_REDACTED_HEADERS = os.getenv(
+    "LOG_REDACTED_HEADERS",
+    "Authorization,Proxy-Authorization,Cookie,Set-Cookie,X-API-Key",
+)
 
 # Reporting Configuration
+# Created with the first report written to it
 REPORT_DIRECTORY = os.path.join(os.path.dirname(__file__), "reports")
-os.makedirs(REPORT_DIRECTORY, exist_ok=True)
+# Latency baselines compared between runs, JSON file
+LATENCY_BASELINE_PATH = os.getenv("LATENCY_BASELINE_PATH") or os.path.join(
+    REPORT_DIRECTORY, "latency_baselines.json"
+)
+# Calls sampled by a latency check, only with --run-perf
+LATENCY_BASELINE_SAMPLES = int(os.getenv("LATENCY_BASELINE_SAMPLES", 20))
+# Significance level, relative and absolute median slowdown tolerated
+LATENCY_BASELINE_ALPHA = float(os.getenv("LATENCY_BASELINE_ALPHA", 0.01))
+LATENCY_BASELINE_MIN_SLOWDOWN = float(
+    os.getenv("LATENCY_BASELINE_MIN_SLOWDOWN", 0.2)
+)
+LATENCY_BASELINE_MIN_DELTA_MS = float(
+    os.getenv("LATENCY_BASELINE_MIN_DELTA_MS", 5)
+)
+# Save samples of passing checks as the baseline of the next runs, only when
+# refreshing the reference on purpose
+LATENCY_BASELINE_UPDATE = bool(int(os.getenv("LATENCY_BASELINE_UPDATE", 0)))
+# Median latency of checks without a baseline, ms
+LATENCY_BUDGET_MS = float(os.getenv("LATENCY_BUDGET_MS", 500))
+
+# Generated queries per search endpoint compared with the local corpus
+ORACLE_QUERIES = int(os.getenv("ORACLE_QUERIES", 50))
+ORACLE_SEED = int(os.getenv("ORACLE_SEED", 0))
+# Directory of the corpus snapshot opened instead of downloading the
+# corpus, empty - download it on every run
+CORPUS_SNAPSHOT = os.getenv("CORPUS_SNAPSHOT", "")
+# Sync the snapshot with the API at startup, fetching changed authors only
+CORPUS_SNAPSHOT_SYNC = bool(int(os.getenv("CORPUS_SNAPSHOT_SYNC", 1)))
+
+# Longest import of conftest.py at pytest startup, in milliseconds
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", 250))
+
+# Client-side limits per endpoint template,
+# "template=rate[/burst][:max_in_flight]" items separated by ";",
+# "*" - other endpoints, empty - no limits
+HTTP_RATE_LIMITS = os.getenv("HTTP_RATE_LIMITS", "")
+# Share the limits between processes (xdist workers) through lock files
+HTTP_RATE_LIMITS_SHARED = bool(int(os.getenv("HTTP_RATE_LIMITS_SHARED", 1)))
+HTTP_RATE_LIMITS_DIRECTORY = os.getenv(
+    "HTTP_RATE_LIMITS_DIRECTORY"
+) or os.path.join(REPORT_DIRECTORY, "rate_limits")
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+from framework.api.services.author_service import AsyncAuthorService
+from framework.json_diff import assert_json_matches
+from tests.data.test_data import exp_authors, exp_emily_dickinson_poems
+
+
+@pytest.mark.api
+class TestAsyncAuthorAPI:
+    @pytest.mark.regression
+    async def test_get_poems_for_every_author_concurrently(
+        self, async_author_service: AsyncAuthorService
+    ):
+        # Given: All authors
+        authors, resp = await async_author_service.get_all_authors()
+        assert resp.status_code == 200, "Response should be 200 OK"
+        assert (
+            authors.authors == exp_authors
+        ), "Response should contain correct authors"
+
+        # When: Get every author's poems concurrently
+        results = await asyncio.gather(
+            *(
+                async_author_service.get_poems_by_author(author)
+                for author in authors.authors
+            )
+        )
+
+        # Then: Every response should be correct
+        for author, (poems, resp) in zip(authors.authors, results):
+            assert resp.status_code == 200, "Response should be 200 OK"
+            assert poems, f"Author {author} should have poems"
+            assert all(
+                poem.author == author for poem in poems
+            ), f"Poems should belong to {author}"
+
+        emily_dickinson_resp = results[
+            authors.authors.index("Emily Dickinson")
+        ][1]
+        assert_json_matches(
+            emily_dickinson_resp,
+            exp_emily_dickinson_poems,
+            message="Response should contain correct poems",
+        )
+
+    @pytest.mark.regression
+    async def test_get_poems_by_authors(
+        self, async_author_service: AsyncAuthorService
+    ):
+        # Given: Author names, one of them repeated
+        author_names = ["Emily Dickinson", "Ernest Dowson", "Emily Dickinson"]
+
+        # When: Get poems of the authors as responses arrive
+        results = {
+            author: poems
+            async for author, poems, resp in (
+                async_author_service.get_poems_by_authors(
+                    author_names, max_concurrency=2
+                )
+            )
+        }
+
+        # Then: Every author should be returned once with correct poems
+        assert sorted(results) == [
+            "Emily Dickinson",
+            "Ernest Dowson",
+        ], "Every author should be returned once"
+        assert_json_matches(
+            results["Emily Dickinson"],
+            exp_emily_dickinson_poems,
+            message="Response should contain correct poems",
+        )
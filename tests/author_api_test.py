@@ -1,13 +1,18 @@
 import pytest
 
+from framework.api.endpoints import AuthorAPI
 from framework.api.services.author_service import AuthorService
+from framework.baseline import LatencyBaseline
+from framework.json_diff import assert_json_matches, diff_json
 from tests.data.test_data import exp_authors, exp_emily_dickinson_poems
 
 
 @pytest.mark.api
 class TestAuthorAPI:
     @pytest.mark.smoke
-    def test_get_all_authors(self, author_service: AuthorService):
+    def test_get_all_authors(
+        self, author_service: AuthorService, latency_baseline: LatencyBaseline
+    ):
         # When: Get all authors
         authors, resp = author_service.get_all_authors()
 
@@ -18,12 +23,15 @@ class TestAuthorAPI:
             authors.authors == exp_authors
         ), "Response should contain correct authors"
 
-        assert (
-            resp.elapsed.total_seconds() < 0.5
-        ), "Response should be within 1 second"
+        # And: Latency should not regress against the previous run
+        latency_baseline.assert_no_regression(
+            lambda: author_service.get_all_authors()[1]
+        )
 
     @pytest.mark.smoke
-    def test_get_all_author_poems(self, author_service: AuthorService):
+    def test_get_all_author_poems(
+        self, author_service: AuthorService, latency_baseline: LatencyBaseline
+    ):
         # Given: An author name
         author_name = "Emily Dickinson"
 
@@ -37,6 +45,77 @@ class TestAuthorAPI:
             resp.json() == exp_emily_dickinson_poems
         ), "Response should contain correct poems"
 
+        # And: Latency should not regress against the previous run
+        latency_baseline.assert_no_regression(
+            lambda: author_service.get_poems_by_author(author_name)[1]
+        )
+
+    @pytest.mark.regression
+    def test_iter_author_poems(self, author_service: AuthorService):
+        # Given: An author name
+        author_name = "Emily Dickinson"
+
+        # When: Iterate over author's poems from the streamed response
+        poems = author_service.iter_poems_by_author(author_name)
+
+        # Then: Poems should be correct
+        assert_json_matches(
+            poems,
+            exp_emily_dickinson_poems,
+            message="Response should contain correct poems",
+        )
+
+    @pytest.mark.regression
+    def test_get_poems_by_authors(self, author_service: AuthorService):
+        # Given: All authors
+        authors, resp = author_service.get_all_authors()
+        assert resp.status_code == 200, "Response should be 200 OK"
+
+        # When: Get every author's poems in one batch
+        results = {
+            author: (poems, resp)
+            for author, poems, resp in author_service.get_poems_by_authors(
+                authors.authors, max_workers=2
+            )
+        }
+
+        # Then: Every author should have correct poems
         assert (
-            resp.elapsed.total_seconds() < 0.5
-        ), "Response should be within 1 second"
+            sorted(results) == exp_authors
+        ), "Every author should be returned once"
+        for author, (poems, resp) in results.items():
+            assert resp.status_code == 200, "Response should be 200 OK"
+            assert poems, f"Author {author} should have poems"
+            assert all(
+                poem.author == author for poem in poems
+            ), f"Poems should belong to {author}"
+
+        assert_json_matches(
+            results["Emily Dickinson"][0],
+            exp_emily_dickinson_poems,
+            message="Response should contain correct poems",
+        )
+
+    @pytest.mark.regression
+    def test_author_poems_diff(self, author_service: AuthorService):
+        # Given: Expected poems in another order with one line changed,
+        # and every line padded with whitespace
+        expected = [
+            {**poem, "lines": [f" {line}  " for line in poem["lines"]]}
+            for poem in reversed(exp_emily_dickinson_poems)
+        ]
+        expected[0]["lines"][1] = expected[0]["lines"][1].upper()
+
+        # When: Compare the streamed response by title, ignoring whitespace
+        resp = author_service.api_client.get(
+            AuthorAPI.by_name("Emily Dickinson"), stream=True
+        )
+        differences = diff_json(
+            resp, expected, key="title", normalize_lines=True
+        )
+
+        # Then: Only the changed line should be reported, by its path
+        title = expected[0]["title"]
+        assert [difference.path for difference in differences] == [
+            f"[title={title!r}].lines[1]"
+        ], "Only the changed line should differ"
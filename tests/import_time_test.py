@@ -0,0 +1,42 @@
+import pytest
+
+from settings import IMPORT_TIME_BUDGET_MS
+from utilities.import_time import measure_import
+
+# Modules imported by the fixtures needing them, not at pytest startup
+DEFERRED_MODULES = [
+    "aiohttp",
+    "pydantic",
+    "framework.api.services.author_service",
+    "framework.api.cache",
+    "framework.api.cassette",
+    "framework.api.rate_limit",
+    "framework.stub_server",
+    "framework.corpus.oracle",
+    "framework.load_test",
+]
+
+
+class TestStartup:
+    @pytest.mark.regression
+    def test_conftest_lazy_imports(self):
+        # When: Import conftest.py the way pytest does at startup
+        profile = measure_import("conftest", repeat=1)
+
+        # Then: Heavy modules should be left to the fixtures using them
+        eager = [name for name in DEFERRED_MODULES if name in profile.imported]
+        assert not eager, f"Modules should be imported lazily: {eager}"
+
+    @pytest.mark.perf
+    def test_conftest_import_time(self):
+        # When: Import conftest.py the way pytest does at startup
+        profile = measure_import("conftest")
+
+        # Then: The fastest import should fit in the budget
+        slowest = ", ".join(
+            f"{name} {total:.1f} ms" for name, total in profile.slowest(5)
+        )
+        assert profile.total <= IMPORT_TIME_BUDGET_MS, (
+            f"conftest.py import took {profile.total:.1f} ms, "
+            f"budget {IMPORT_TIME_BUDGET_MS:.0f} ms (slowest: {slowest})"
+        )
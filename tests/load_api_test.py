@@ -0,0 +1,20 @@
+import pytest
+
+from framework.load_test import LoadRunner
+
+
+@pytest.mark.api
+@pytest.mark.no_cache
+class TestLoad:
+    @pytest.mark.load(rate=20, duration=10, ramp_up=2)
+    def test_mixed_load(self, load_runner: LoadRunner):
+        # When: Replay the default call mix at 20 calls per second
+        result = load_runner.run()
+
+        # Then: All calls should succeed within the latency budget
+        total = result.total
+        assert total.latency.count > 0, "Load should produce calls"
+        assert total.errors == 0, "No call should fail under load"
+        assert (
+            total.latency.percentile(99) < 1000
+        ), "p99 latency should be under 1 s"
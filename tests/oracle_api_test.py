@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from framework.api.api_client import APIClient
+from framework.api.services.author_service import AuthorService
+from framework.api.services.title_service import TitleService
+from framework.corpus.compact import Corpus
+from framework.corpus.oracle import CorpusOracle
+from framework.corpus.snapshot import CorpusSnapshot
+from settings import ORACLE_QUERIES, ORACLE_SEED
+
+
+def by_title(body: list | dict) -> list | dict:
+    """Body with poems in a stable order, PoetryDB does not define one"""
+    if isinstance(body, list):
+        return sorted(body, key=lambda poem: (poem["title"], poem["author"]))
+    return body
+
+
+@pytest.mark.api
+class TestOracle:
+    @pytest.mark.regression
+    @pytest.mark.parametrize("field", ["author", "title", "lines"])
+    def test_search_matches_oracle(
+        self, field: str, api_client: APIClient, corpus_oracle: CorpusOracle
+    ):
+        # Given: Generated queries of the field matching corpus poems
+        queries = [
+            endpoint
+            for endpoint in corpus_oracle.sample_queries(
+                ORACLE_QUERIES * 3, ORACLE_SEED
+            )
+            if endpoint.template.startswith(f"/{field}/")
+        ]
+        assert queries, "Corpus should yield queries"
+
+        # When: Send all queries concurrently
+        responses = api_client.imap_get(queries)
+
+        # Then: Every response should match the locally computed one
+        for endpoint, resp in responses:
+            assert resp.status_code == 200, "Response should be 200 OK"
+            assert by_title(resp.json()) == by_title(
+                corpus_oracle.expected_json(endpoint)
+            ), f"Response of {endpoint} should match the oracle"
+
+    @pytest.mark.regression
+    def test_snapshot_syncs_changed_authors(self, tmp_path, api_client):
+        # Given: A snapshot synced from the API
+        author_service = AuthorService(api_client)
+        title_service = TitleService(api_client)
+        snapshot = CorpusSnapshot(str(tmp_path))
+        first = snapshot.sync(author_service, title_service)
+        authors = author_service.get_all_authors()[0].authors
+        assert sorted(first.fetched) == sorted(
+            authors
+        ), "First sync should fetch every author"
+
+        # When: Sync again, then again with one author's titles outdated
+        second = snapshot.sync(author_service, title_service)
+        manifest = snapshot.manifest()
+        manifest["authors"][authors[0]] = ""
+        manifest["titles_hash"] = ""
+        with open(snapshot.manifest_path, "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+        third = snapshot.sync(author_service, title_service)
+
+        # Then: Only the outdated author should be downloaded again
+        assert second.unchanged, "Unchanged API should not be downloaded"
+        assert third.fetched == [
+            authors[0]
+        ], "Only the changed author should be downloaded"
+
+        # And: The snapshot should hold the same poems as a download
+        def key(poem):
+            return poem.title, poem.author
+
+        assert sorted(snapshot.open(), key=key) == sorted(
+            Corpus.from_service(author_service), key=key
+        ), "Snapshot should match the downloaded corpus"
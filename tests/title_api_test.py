@@ -1,13 +1,16 @@
 import pytest
 
 from framework.api.services.title_service import TitleService
+from framework.baseline import LatencyBaseline
 from tests.data.test_data import exp_the_moon_maiden_song, exp_titles
 
 
 @pytest.mark.api
 class TestTitleAPI:
     @pytest.mark.smoke
-    def test_get_all_titles(self, title_service: TitleService):
+    def test_get_all_titles(
+        self, title_service: TitleService, latency_baseline: LatencyBaseline
+    ):
         # When: Get all titles
         titles, resp = title_service.get_all_titles()
 
@@ -18,16 +21,20 @@ class TestTitleAPI:
             titles.titles == exp_titles
         ), "Response should contain correct titles"
 
-        assert (
-            resp.elapsed.total_seconds() < 0.5
-        ), "Response should be within 1 second"
+        # And: Latency should not regress against the previous run
+        latency_baseline.assert_no_regression(
+            lambda: title_service.get_all_titles()[1]
+        )
 
     @pytest.mark.smoke
     @pytest.mark.parametrize(
         "title_name", ["The Moon Maiden's Song", "The Moon Maid"]
     )
     def test_get_poem_by_full_title_match(
-        self, title_name: str, title_service: TitleService
+        self,
+        title_name: str,
+        title_service: TitleService,
+        latency_baseline: LatencyBaseline,
     ):
         # Given: The full and partial title name to match
 
@@ -43,6 +50,32 @@ class TestTitleAPI:
             poems[0].model_dump() == exp_the_moon_maiden_song
         ), "Response should contain correct poem"
 
-        assert (
-            resp.elapsed.total_seconds() < 0.5
-        ), "Response should be within 1 second"
+        # And: Latency should not regress against the previous run
+        latency_baseline.assert_no_regression(
+            lambda: title_service.get_poem_by_title(title_name)[1]
+        )
+
+    @pytest.mark.regression
+    def test_get_poems_by_titles(self, title_service: TitleService):
+        # Given: All titles
+        titles, resp = title_service.get_all_titles()
+        assert resp.status_code == 200, "Response should be 200 OK"
+
+        # When: Get poems of every title in one batch
+        results = {
+            title: poems
+            for title, poems, resp in title_service.get_poems_by_titles(
+                titles.titles, max_workers=2
+            )
+        }
+
+        # Then: Every title should be found
+        assert sorted(results) == exp_titles, "Every title should be returned"
+        for title, poems in results.items():
+            assert any(
+                poem.title == title for poem in poems
+            ), f"Poem {title} should be found"
+
+        assert [
+            poem.model_dump() for poem in results["The Moon Maiden's Song"]
+        ] == [exp_the_moon_maiden_song], "Response should contain correct poem"
@@ -0,0 +1,71 @@
+import pytest
+
+from framework.api.adapters import ConnectionStats
+from framework.api.api_client import APIClient
+from tests.unit.helpers import EchoServer
+
+
+@pytest.fixture(scope="module")
+def server():
+    with EchoServer() as server:
+        yield server
+
+
+@pytest.mark.unit
+class TestConnectionStats:
+    def test_keep_alive_reuses_connection(self, server):
+        # Given: A client keeping connections alive
+        client = APIClient(base_url=server.url)
+
+        # When: Send five requests one after another
+        for _ in range(5):
+            client.get("/author")
+
+        # Then: One connection should be opened and reused four times
+        stats = client.connection_stats()
+        assert (stats.requests, stats.new_connections) == (5, 1)
+        assert stats.reused_connections == 4
+        assert stats.reuse_ratio == 0.8
+
+    def test_without_keep_alive_every_request_connects(self, server):
+        # Given: A client asking the server to close connections
+        client = APIClient(base_url=server.url, keep_alive=False)
+
+        # When: Send three requests
+        for _ in range(3):
+            client.get("/author")
+
+        # Then: Every request should open a new connection
+        stats = client.connection_stats()
+        assert (stats.requests, stats.new_connections) == (3, 3)
+        assert stats.reuse_ratio == 0.0
+
+    def test_concurrent_requests_bounded_by_threads(self, server):
+        # Given: A client sending from four threads
+        client = APIClient(base_url=server.url, pool_maxsize=4)
+
+        # When: Send 40 requests concurrently
+        client.map_get(["/author"] * 40, max_workers=4)
+
+        # Then: At most one connection per thread should be opened
+        stats = client.connection_stats()
+        assert stats.requests == 40
+        assert 1 <= stats.new_connections <= 4
+
+    def test_requests_of_evicted_pools_counted(self, server):
+        # Given: A client keeping a single per-host pool
+        client = APIClient(pool_connections=1)
+        hosts = [server.url, server.url.replace("127.0.0.1", "localhost")]
+
+        # When: Alternate between two hosts
+        for url in hosts * 2:
+            client.get(f"{url}/author")
+
+        # Then: Requests of evicted pools should still be counted
+        stats = client.connection_stats()
+        assert (stats.requests, stats.new_connections) == (4, 4)
+
+    def test_empty(self):
+        stats = ConnectionStats(requests=0, new_connections=0)
+
+        assert (stats.reused_connections, stats.reuse_ratio) == (0, 0.0)
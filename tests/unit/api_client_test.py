@@ -0,0 +1,151 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote
+
+import pytest
+
+from framework.api.api_client import APIClient
+from framework.api.endpoints import AuthorAPI, TitleAPI
+from framework.api.resilience import HedgePolicy
+from framework.logger import (
+    APILogger,
+    CapturePolicy,
+    RequestLogData,
+    attribute_to_test,
+)
+from tests.unit.helpers import EchoServer
+
+AUTHORS = ["Bob Willett", "Emily Dickinson", "Ernest Dowson"]
+TITLES = ["Said Death to Passion", "The Moon Maiden's Song"]
+THREADS = 8
+
+
+class RecordingHandler(logging.Handler):
+    """Keeps the request entries logged by APILogger"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests: list[RequestLogData] = []
+        self._lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if isinstance(record.msg, RequestLogData):
+            with self._lock:
+                self.requests.append(record.msg)
+
+
+@pytest.fixture(scope="module")
+def server():
+    with EchoServer() as server:
+        yield server
+
+
+@pytest.fixture
+def logged_requests(monkeypatch):
+    """Request entries logged during the test, none buffered or sampled"""
+    policy = CapturePolicy(success_sample_rate=1, bodies_on_failure_only=False)
+    monkeypatch.setattr(APILogger, "capture_policy", policy)
+    handler = RecordingHandler()
+    APILogger.logger.addHandler(handler)
+    yield handler.requests
+    APILogger.logger.removeHandler(handler)
+
+
+@pytest.mark.unit
+class TestSharedClient:
+    def test_session_per_thread(self, server):
+        # Given: A client shared by a pool of threads
+        client = APIClient(base_url=server.url)
+        barrier = threading.Barrier(THREADS, timeout=5)
+
+        def sessions():
+            # Every thread holds its session until all threads have one
+            barrier.wait()
+            return client.session, client.session
+
+        # When: Every thread gets the session twice
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            pairs = list(executor.map(lambda _: sessions(), range(THREADS)))
+
+        # Then: Each thread should keep its own session on one shared pool
+        assert all(first is second for first, second in pairs)
+        assert len({id(first) for first, _ in pairs}) == THREADS
+        assert all(
+            first.get_adapter(server.url) is client.adapter
+            for first, _ in pairs
+        )
+
+    def test_map_get_from_many_threads(self, server):
+        # Given: A client shared by threads each sending a batch
+        client = APIClient(base_url=server.url)
+        endpoints = [AuthorAPI.by_name(author) for author in AUTHORS] * 10
+
+        # When: Every thread sends its batch concurrently
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            batches = list(
+                executor.map(
+                    lambda _: client.map_get(endpoints, max_workers=4),
+                    range(THREADS),
+                )
+            )
+
+        # Then: Every response should belong to its own request
+        for responses in batches:
+            assert [
+                unquote(response.json()[0]) for response in responses
+            ] == endpoints
+        stats = client.connection_stats()
+        assert stats.requests == THREADS * len(endpoints)
+
+    def test_calls_attributed_to_their_test(self, server, logged_requests):
+        # Given: Two tests sharing a client from their own threads, one
+        # calling author endpoints with map_get, the other title endpoints
+        # with imap_get
+        client = APIClient(base_url=server.url)
+        author_endpoints = [AuthorAPI.by_name(name) for name in AUTHORS] * 10
+        title_endpoints = [TitleAPI.by_name(title) for title in TITLES] * 10
+
+        def author_test():
+            with attribute_to_test("author_test (call)"):
+                return client.map_get(author_endpoints, max_workers=4)
+
+        def title_test():
+            with attribute_to_test("title_test (call)"):
+                return list(client.imap_get(title_endpoints, max_workers=4))
+
+        # When: Both tests run at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            authors = executor.submit(author_test)
+            titles = executor.submit(title_test)
+            assert len(authors.result()) == len(author_endpoints)
+            assert len(titles.result()) == len(title_endpoints)
+
+        # Then: Every logged call should name the test and the function
+        # that made it
+        assert len(logged_requests) == len(author_endpoints) + len(
+            title_endpoints
+        )
+        for entry in logged_requests:
+            expected = (
+                "author_test" if "/author/" in entry.url else "title_test"
+            )
+            assert entry.test_name == f"{expected} (call)", entry.url
+            assert entry.function_name == expected, entry.url
+
+    def test_hedged_calls_name_their_function(self, server, logged_requests):
+        # Given: A client hedging every GET request at once
+        client = APIClient(base_url=server.url, hedge=HedgePolicy(delay=0))
+
+        def get_author():
+            return client.get(AuthorAPI.by_name(AUTHORS[0]))
+
+        # When: Send a request and wait for both copies
+        get_author()
+        client.close()
+
+        # Then: Both copies should name the function that made the call
+        assert client.resilience_stats().hedges == 1
+        assert [entry.function_name for entry in logged_requests] == [
+            "get_author"
+        ] * 2
@@ -0,0 +1,74 @@
+import pytest
+
+from framework.api.services.author_service import AuthorService
+from framework.stub_server import PoetryStore, StubAdapter
+from tests.unit.helpers import OVERLAPPING_POEMS, scripted_client
+
+
+@pytest.fixture
+def author_service() -> AuthorService:
+    return AuthorService(
+        scripted_client(StubAdapter(PoetryStore(OVERLAPPING_POEMS)))
+    )
+
+
+@pytest.mark.unit
+class TestAuthorBatch:
+    def test_poems_of_overlapping_names(self, author_service: AuthorService):
+        # Given: Authors whose names contain each other
+
+        # When: Get poems of all of them in one batch
+        results = {
+            author: poems
+            for author, poems, _ in author_service.get_poems_by_authors(
+                ["Ann", "Anne", "Anne Finch"]
+            )
+        }
+
+        # Then: Every author should get only their own poems
+        for author, poems in results.items():
+            assert [poem.title for poem in poems] == [
+                f"Poem 0 of {author}",
+                f"Poem 1 of {author}",
+            ]
+
+    def test_titles_of_overlapping_names(self, author_service: AuthorService):
+        # Given: Authors whose names contain each other
+
+        # When: Get titles of all of them in one batch
+        results = {
+            author: titles
+            for author, titles, _ in author_service.get_titles_by_authors(
+                ["Ann", "Anne Finch"]
+            )
+        }
+
+        # Then: Every author should get only the titles of their poems
+        assert {
+            author: [title.title for title in titles]
+            for author, titles in results.items()
+        } == {
+            "Ann": ["Poem 0 of Ann", "Poem 1 of Ann"],
+            "Anne Finch": ["Poem 0 of Anne Finch", "Poem 1 of Anne Finch"],
+        }
+
+    def test_unknown_author_has_no_poems(self, author_service: AuthorService):
+        # Given: A batch with an author missing from the database
+        authors = ["Anne", "Nobody", "Ann"]
+
+        # When: Get poems and titles of the batch
+        poems = {
+            author: poems
+            for author, poems, _ in author_service.get_poems_by_authors(authors)
+        }
+        titles = {
+            author: titles
+            for author, titles, _ in author_service.get_titles_by_authors(
+                authors
+            )
+        }
+
+        # Then: The unknown author should have none, the others theirs
+        assert sorted(poems) == sorted(titles) == sorted(authors)
+        assert poems["Nobody"] == titles["Nobody"] == []
+        assert len(poems["Anne"]) == len(titles["Ann"]) == 2
@@ -0,0 +1,105 @@
+import json
+from datetime import timedelta
+
+import pytest
+
+from framework.baseline import BaselineStore, LatencyBaseline
+from tests.unit.helpers import make_response
+
+
+@pytest.mark.unit
+class TestBaselineStore:
+    def test_budget_without_baseline(self, tmp_path):
+        # Given: A store without baselines
+        store = BaselineStore(str(tmp_path / "baselines.json"))
+
+        # When: Compare checks below and above the budget
+        fast = store.compare("fast", [100.0, 120.0, 110.0], budget_ms=500)
+        slow = store.compare("slow", [600.0, 700.0, 650.0], budget_ms=500)
+
+        # Then: Only the check over the budget should regress
+        assert not fast.regressed
+        assert slow.regressed
+        assert "no baseline, budget 500 ms" in str(slow)
+
+    def test_regression_against_baseline(self, tmp_path):
+        # Given: A baseline around 100 ms
+        path = tmp_path / "baselines.json"
+        path.write_text(json.dumps({"check": [100.0 + i for i in range(20)]}))
+        store = BaselineStore(str(path))
+
+        # When: Compare samples twice as slow, within the budget
+        comparison = store.compare(
+            "check", [200.0 + i for i in range(20)], budget_ms=500
+        )
+
+        # Then: The slowdown should be a regression
+        assert comparison.regressed
+        assert comparison.delta > 0.5
+
+    def test_baselines_pinned_by_default(self, tmp_path):
+        # Given: A store with a baseline and a passing check
+        path = tmp_path / "baselines.json"
+        path.write_text(json.dumps({"check": [100.0] * 5}))
+        store = BaselineStore(str(path))
+        store.compare("check", [90.0] * 5)
+
+        # When: Save the store at the end of the run
+        store.save()
+
+        # Then: The baseline should be unchanged
+        assert json.loads(path.read_text()) == {"check": [100.0] * 5}
+
+    def test_update_on_request(self, tmp_path):
+        # Given: A store refreshing its baselines
+        path = tmp_path / "baselines.json"
+        store = BaselineStore(str(path), update=True)
+        store.compare("check", [90.0] * 5)
+
+        # When: Save the store at the end of the run
+        store.save()
+
+        # Then: The samples should become the baseline
+        assert json.loads(path.read_text()) == {"check": [90.0] * 5}
+
+    def test_budget_only_check_not_saved(self, tmp_path):
+        # Given: A refreshing store with a baseline around 100 ms
+        path = tmp_path / "baselines.json"
+        path.write_text(json.dumps({"check": [100.0 + i for i in range(20)]}))
+        store = BaselineStore(str(path), update=True)
+
+        # When: Check a single slower call against the budget only
+        comparison = store.compare(
+            "check", [200.0], budget_ms=500, against_baseline=False
+        )
+        store.save()
+
+        # Then: It should pass and leave the baseline as it was
+        assert not comparison.regressed
+        assert comparison.baseline_median is None
+        assert json.loads(path.read_text())["check"][0] == 100.0
+
+
+@pytest.mark.unit
+class TestLatencyBaseline:
+    @pytest.mark.parametrize("resample, calls", [(False, 1), (True, 20)])
+    def test_calls_sampled(self, tmp_path, monkeypatch, resample, calls):
+        # Given: A check resampling the call only when asked to
+        from framework import baseline
+
+        monkeypatch.setattr(baseline, "LATENCY_BASELINE_SAMPLES", 20)
+        store = BaselineStore(str(tmp_path / "baselines.json"))
+        check = LatencyBaseline(store, "test", resample=resample)
+        sent = []
+
+        def call():
+            sent.append(1)
+            response = make_response(200)
+            response.elapsed = timedelta(milliseconds=10)
+            return response
+
+        # When: Check the latency of the call
+        check.assert_no_regression(call)
+
+        # Then: The call should be repeated only when resampling
+        assert len(sent) == calls
@@ -0,0 +1,236 @@
+import time
+
+import pytest
+
+from framework.api.cache import (
+    CacheEntry,
+    DiskCacheBackend,
+    MemoryCacheBackend,
+    ResponseCache,
+    bypass_cache,
+)
+from tests.unit.helpers import URL, ScriptedAdapter, scripted_client
+
+
+def make_entry(size: int, stored_at: float = 0) -> CacheEntry:
+    return CacheEntry(
+        url=URL,
+        status_code=200,
+        reason="OK",
+        headers={},
+        encoding="utf-8",
+        content=b"x" * size,
+        stored_at=stored_at,
+    )
+
+
+def cache_key(cache: ResponseCache, endpoint: str) -> str:
+    return cache.key(f"{URL}{endpoint}", None, {})
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    def test_fresh_response_served_from_cache(self):
+        # Given: A client with a response cache
+        adapter = ScriptedAdapter([200])
+        client = scripted_client(adapter, cache=ResponseCache(ttl=60))
+
+        # When: Get the same endpoint twice
+        first = client.get("/author")
+        second = client.get("/author")
+
+        # Then: The second response should come from the cache
+        assert adapter.sent == 1
+        assert second.from_cache
+        assert second.json() == first.json()
+        assert client.cache.stats().hits == 1
+
+    def test_expired_response_requested_again(self):
+        # Given: A cached response older than the TTL
+        adapter = ScriptedAdapter([200])
+        cache = ResponseCache(ttl=60)
+        client = scripted_client(adapter, cache=cache)
+        client.get("/author")
+        cache.memory.get(cache_key(cache, "/author")).stored_at -= 61
+
+        # When: Get the endpoint again
+        response = client.get("/author")
+
+        # Then: The server should be asked again
+        assert adapter.sent == 2
+        assert not getattr(response, "from_cache", False)
+
+    def test_stale_response_revalidated(self):
+        # Given: A stale cached response with an ETag
+        adapter = ScriptedAdapter([200, 304], headers={"ETag": '"v1"'})
+        cache = ResponseCache(ttl=60)
+        client = scripted_client(adapter, cache=cache)
+        client.get("/author")
+        cache.memory.get(cache_key(cache, "/author")).stored_at -= 61
+
+        # When: Get the endpoint again and the server answers 304
+        response = client.get("/author")
+
+        # Then: The stored response should be reused
+        assert adapter.requests[1].headers["If-None-Match"] == '"v1"'
+        assert response.status_code == 200
+        assert response.json() == ["/author"]
+        assert cache.stats().revalidations == 1
+
+    @pytest.mark.parametrize(
+        "cache_control, age, sent",
+        [
+            ("max-age=600", 61, 1),
+            ("public, max-age=10", 11, 2),
+            ("no-cache", 0, 2),
+            ("max-age=600, no-cache", 0, 2),
+        ],
+    )
+    def test_freshness_from_cache_control(self, cache_control, age, sent):
+        # Given: A cached response aged by the given seconds, with a
+        # Cache-Control header overriding the 60 s TTL
+        adapter = ScriptedAdapter(
+            [200, 304], headers={"Cache-Control": cache_control, "ETag": "v"}
+        )
+        cache = ResponseCache(ttl=60)
+        client = scripted_client(adapter, cache=cache)
+        client.get("/author")
+        cache.memory.get(cache_key(cache, "/author")).stored_at -= age
+
+        # When: Get the endpoint again
+        response = client.get("/author")
+
+        # Then: The server should be asked only once the header says so
+        assert adapter.sent == sent
+        assert response.json() == ["/author"]
+
+    @pytest.mark.parametrize(
+        "status, headers", [(404, {}), (200, {"Cache-Control": "no-store"})]
+    )
+    def test_not_stored(self, status, headers):
+        # Given: A response that must not be cached
+        adapter = ScriptedAdapter([status], headers=headers)
+        client = scripted_client(adapter, cache=ResponseCache())
+
+        # When: Get the endpoint twice
+        client.get("/author")
+        client.get("/author")
+
+        # Then: Both requests should reach the server
+        assert adapter.sent == 2
+
+    def test_vary_headers_in_key(self):
+        cache = ResponseCache()
+
+        assert cache.key(URL, None, {"Accept": "application/json"}) != (
+            cache.key(URL, None, {"Accept": "text/html"})
+        )
+        assert cache.key(URL, None, {"X-Trace": "1"}) == cache.key(URL)
+
+    def test_bypass_cache(self):
+        # Given: A client with a cached response
+        adapter = ScriptedAdapter([200])
+        client = scripted_client(adapter, cache=ResponseCache(ttl=60))
+        client.get("/author")
+
+        # When: Get the endpoint while the cache is bypassed
+        with bypass_cache():
+            response = client.get("/author")
+
+        # Then: The request should reach the server
+        assert adapter.sent == 2
+        assert not getattr(response, "from_cache", False)
+
+    def test_disk_backend_survives_restart(self, tmp_path):
+        # Given: A response stored by a cache with a disk backend
+        path = str(tmp_path / "cache.sqlite")
+        client = scripted_client(
+            ScriptedAdapter([200]), cache=ResponseCache(disk_path=path)
+        )
+        client.get("/author")
+
+        # When: A new cache opens the same file, e.g. in the next run
+        adapter = ScriptedAdapter([200])
+        client = scripted_client(adapter, cache=ResponseCache(disk_path=path))
+        response = client.get("/author")
+
+        # Then: The response should be served from disk
+        assert adapter.sent == 0
+        assert response.from_cache
+        assert response.json() == ["/author"]
+
+
+@pytest.mark.unit
+class TestMemoryCacheBackend:
+    def test_evicts_least_recently_used_by_bytes(self):
+        # Given: A backend holding 300 bytes, full with three entries
+        backend = MemoryCacheBackend(max_bytes=300)
+        for key in ("a", "b", "c"):
+            backend.set(key, make_entry(100))
+
+        # When: Use "a", then add an entry
+        backend.get("a")
+        backend.set("d", make_entry(100))
+
+        # Then: "b", the least recently used entry, should be evicted
+        assert backend.get("b") is None
+        assert all(backend.get(key) for key in ("a", "c", "d"))
+        assert (backend.size, backend.evictions) == (300, 1)
+
+    def test_large_entry_evicts_several(self):
+        backend = MemoryCacheBackend(max_bytes=300)
+        for key in ("a", "b", "c"):
+            backend.set(key, make_entry(100))
+
+        backend.set("d", make_entry(250))
+
+        assert [key for key in "abcd" if backend.get(key)] == ["d"]
+        assert backend.size == 250
+
+    def test_oversized_entry_not_stored(self):
+        backend = MemoryCacheBackend(max_bytes=100)
+
+        backend.set("a", make_entry(101))
+
+        assert backend.get("a") is None
+        assert backend.size == 0
+
+    def test_replaced_entry_size(self):
+        backend = MemoryCacheBackend(max_bytes=300)
+        backend.set("a", make_entry(100))
+
+        backend.set("a", make_entry(50))
+
+        assert backend.size == 50
+
+
+@pytest.mark.unit
+class TestDiskCacheBackend:
+    def test_evicts_old_entries(self, tmp_path):
+        # Given: A file keeping entries for a minute, with an older entry
+        path = str(tmp_path / "cache.sqlite")
+        backend = DiskCacheBackend(path, max_age=60)
+        backend.set("old", make_entry(10, stored_at=time.time() - 61))
+
+        # When: Store another entry, or open the file again
+        backend.set("new", make_entry(10, stored_at=time.time()))
+        reopened = DiskCacheBackend(path, max_age=60)
+
+        # Then: Only the old entry should be evicted
+        assert backend.get("old") is None
+        assert reopened.get("new") is not None
+        assert backend.evictions == 1
+
+    def test_evicts_oldest_entries_by_bytes(self, tmp_path):
+        # Given: A file holding 300 bytes, full with three entries
+        backend = DiskCacheBackend(str(tmp_path / "cache.sqlite"), 300)
+        now = time.time()
+        for age, key in enumerate("cba"):
+            backend.set(key, make_entry(100, stored_at=now - age))
+
+        # When: Add an entry
+        backend.set("d", make_entry(100, stored_at=now))
+
+        # Then: "a", the oldest entry, should be evicted
+        assert [key for key in "abcd" if backend.get(key)] == ["b", "c", "d"]
+        assert backend.evictions == 1
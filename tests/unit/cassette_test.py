@@ -0,0 +1,129 @@
+import pytest
+import requests
+
+from framework.api.cassette import (
+    Cassette,
+    CassetteAdapter,
+    CassetteMiss,
+    erase_cassette,
+)
+from tests.unit.helpers import URL, ScriptedAdapter
+
+PATHS = ["/author", "/title", "/author/Emily%20Dickinson"]
+
+
+def session_with(adapter: CassetteAdapter) -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", adapter)
+    return session
+
+
+@pytest.mark.unit
+class TestCassette:
+    def record(self, path: str, paths: list[str]) -> ScriptedAdapter:
+        upstream = ScriptedAdapter([200])
+        cassette = Cassette(path)
+        session = session_with(
+            CassetteAdapter(cassette, upstream, mode="record")
+        )
+        for endpoint in paths:
+            session.get(f"{URL}{endpoint}")
+        session.close()
+        cassette.close()
+        return upstream
+
+    def test_record_then_replay(self, tmp_path):
+        # Given: A cassette recorded from the upstream
+        path = str(tmp_path / "cassette")
+        upstream = self.record(path, PATHS)
+        assert upstream.sent == len(PATHS)
+
+        # When: Replay the requests without an upstream
+        cassette = Cassette(path)
+        session = session_with(CassetteAdapter(cassette, mode="replay"))
+        responses = [session.get(f"{URL}{endpoint}") for endpoint in PATHS]
+
+        # Then: The recorded responses should be returned
+        assert [response.json() for response in responses] == [
+            [endpoint] for endpoint in PATHS
+        ]
+        assert all(response.from_cassette for response in responses)
+
+        # And: Unknown requests should fail in replay mode
+        with pytest.raises(CassetteMiss):
+            session.get(f"{URL}/random")
+        cassette.close()
+
+    def test_auto_records_only_misses(self, tmp_path):
+        # Given: A cassette with one recorded request
+        path = str(tmp_path / "cassette")
+        self.record(path, PATHS[:1])
+
+        # When: Send recorded and new requests in auto mode
+        upstream = ScriptedAdapter([200])
+        cassette = Cassette(path)
+        session = session_with(CassetteAdapter(cassette, upstream))
+        for endpoint in PATHS:
+            session.get(f"{URL}{endpoint}")
+        cassette.close()
+
+        # Then: Only new requests should reach the upstream, and be recorded
+        assert upstream.sent == len(PATHS) - 1
+        replayed = Cassette(path)
+        session = session_with(CassetteAdapter(replayed, mode="replay"))
+        assert session.get(f"{URL}{PATHS[-1]}").json() == [PATHS[-1]]
+        replayed.close()
+
+    def test_workers_merge_index(self, tmp_path):
+        # Given: Two workers recording to the same cassette in turns
+        path = str(tmp_path / "cassette")
+        first, second = Cassette(path), Cassette(path)
+        upstream = ScriptedAdapter([200])
+        sessions = [
+            session_with(CassetteAdapter(cassette, upstream, mode="record"))
+            for cassette in (first, second)
+        ]
+        for number, endpoint in enumerate(PATHS):
+            sessions[number % 2].get(f"{URL}{endpoint}")
+
+        # When: Both workers close the cassette
+        first.close()
+        second.close()
+
+        # Then: Responses of both workers should be replayed
+        cassette = Cassette(path)
+        session = session_with(CassetteAdapter(cassette, mode="replay"))
+        for endpoint in PATHS:
+            assert session.get(f"{URL}{endpoint}").json() == [endpoint]
+        cassette.close()
+
+    def test_erase(self, tmp_path):
+        # Given: A recorded cassette
+        path = str(tmp_path / "cassette")
+        self.record(path, PATHS)
+
+        # When: Erase it before recording again
+        erase_cassette(path)
+
+        # Then: Nothing should be replayed
+        cassette = Cassette(path)
+        session = session_with(CassetteAdapter(cassette, mode="replay"))
+        with pytest.raises(CassetteMiss):
+            session.get(f"{URL}{PATHS[0]}")
+        cassette.close()
+
+    def test_adapter_does_not_close_cassette(self, tmp_path):
+        # Given: A cassette shared by an adapter
+        path = str(tmp_path / "cassette")
+        self.record(path, PATHS)
+        cassette = Cassette(path)
+        adapter = CassetteAdapter(cassette, mode="replay")
+
+        # When: The adapter is closed with its session
+        session = session_with(adapter)
+        session.close()
+
+        # Then: The cassette should still replay, and close once
+        assert session_with(adapter).get(f"{URL}{PATHS[0]}").ok
+        cassette.close()
+        cassette.close()
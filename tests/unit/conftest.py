@@ -0,0 +1,15 @@
+import pytest
+
+from framework.api import api_client, async_api_client
+from framework.logger import APILogger
+from framework.metrics import MetricsRegistry
+
+
+@pytest.fixture(autouse=True)
+def isolated_reports(tmp_path, monkeypatch):
+    """Keep logs and metrics of unit tests out of the reports directory"""
+    metrics = MetricsRegistry()
+    monkeypatch.setattr(api_client, "api_metrics", metrics)
+    monkeypatch.setattr(async_api_client, "api_metrics", metrics)
+    with APILogger.redirect(str(tmp_path / "logs")):
+        yield
@@ -0,0 +1,22 @@
+import pytest
+
+from framework.api.services.author_service import AuthorService
+from framework.corpus.compact import Corpus
+from framework.stub_server import PoetryStore, StubAdapter
+from tests.unit.helpers import OVERLAPPING_POEMS, scripted_client
+
+
+@pytest.mark.unit
+class TestCorpusDownload:
+    def test_poems_downloaded_once(self):
+        # Given: Authors whose names contain each other, a repeated poem
+        store = PoetryStore([*OVERLAPPING_POEMS, OVERLAPPING_POEMS[0]])
+        author_service = AuthorService(scripted_client(StubAdapter(store)))
+
+        # When: Download the poems of all authors
+        corpus = Corpus.from_service(author_service)
+
+        # Then: Every poem should be in the corpus once
+        assert sorted((poem.author, poem.title) for poem in corpus) == sorted(
+            (poem["author"], poem["title"]) for poem in OVERLAPPING_POEMS
+        )
@@ -0,0 +1,117 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from framework.api.api_client import APIClient
+
+URL = "http://poetrydb.test"
+
+# Poems of two authors each, every name is a substring of the next one
+OVERLAPPING_POEMS = [
+    {
+        "title": f"Poem {number} of {author}",
+        "author": author,
+        "lines": [f"Line of {author}"],
+        "linecount": "1",
+    }
+    for author in ("Ann", "Anne", "Anne Finch")
+    for number in range(2)
+]
+
+
+def make_response(
+    status: int, headers: dict = None, content: bytes = b"[]"
+) -> Response:
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.encoding = "utf-8"
+    response._content = content
+    response._content_consumed = True
+    return response
+
+
+class ScriptedAdapter(BaseAdapter):
+    """
+    Adapter answering with scripted statuses, errors and delays; bodies
+    are the JSON list of the request path
+    """
+
+    def __init__(
+        self, outcomes: list, delays: list[float] = (), headers: dict = None
+    ):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.delays = list(delays)
+        self.headers = headers or {}
+        self.requests: list[PreparedRequest] = []
+        self.sent = 0
+        self._lock = threading.Lock()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        with self._lock:
+            number = self.sent
+            self.sent += 1
+            self.requests.append(request)
+        if number < len(self.delays):
+            time.sleep(self.delays[number])
+        outcome = self.outcomes[min(number, len(self.outcomes) - 1)]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        response = make_response(
+            outcome,
+            self.headers,
+            content=json.dumps([request.path_url]).encode(),
+        )
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def scripted_client(adapter: BaseAdapter, **kwargs) -> APIClient:
+    """Client sending its requests through the adapter"""
+    client = APIClient(base_url=URL, **kwargs)
+    client.mount("http://", adapter)
+    return client
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    """Keep-alive handler answering with the JSON list of the request path"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        body = json.dumps([self.path]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class EchoServer:
+    """Local HTTP server of EchoHandler, serving from a daemon thread"""
+
+    def __init__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def __enter__(self) -> "EchoServer":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,37 @@
+import math
+
+import pytest
+
+from utilities.histogram import LatencyHistogram
+
+
+@pytest.mark.unit
+class TestLatencyHistogram:
+    @pytest.mark.parametrize("value", [0.002, 0.05, 0.5, 0.999, 1, 1.5, 250])
+    def test_value_within_its_bucket(self, value):
+        # Given: A histogram with 1% buckets
+        histogram = LatencyHistogram(precision=0.01)
+
+        # When: Get the bucket of a value below and above 1 ms
+        bucket = histogram._bucket(value)
+
+        # Then: The value should lie within the bounds of the bucket
+        low = math.exp(bucket * histogram._log_base)
+        high = math.exp((bucket + 1) * histogram._log_base)
+        assert low <= value < high
+
+    def test_sub_millisecond_percentiles(self):
+        # Given: Sub-millisecond latencies
+        histogram = LatencyHistogram(precision=0.01)
+        values = [0.1 + index / 1000 for index in range(800)]
+
+        # When: Record them
+        for value in values:
+            histogram.record(value)
+
+        # Then: Percentiles should be accurate to the precision
+        for percent in (50, 90, 99):
+            expected = values[math.ceil(len(values) * percent / 100) - 1]
+            assert histogram.percentile(percent) == pytest.approx(
+                expected, rel=0.01
+            )
@@ -0,0 +1,20 @@
+import pytest
+
+from framework.json_diff import diff_json
+
+
+@pytest.mark.unit
+class TestDiffJson:
+    def test_bytes_parsed(self):
+        # Given: A body read as bytes
+        body = b'[{"title": "Ozymandias"}]'
+
+        # Then: It should be parsed before the comparison
+        assert diff_json(body, [{"title": "Ozymandias"}]) == []
+
+    @pytest.mark.parametrize("actual", ["[]", '"[]"', "null"])
+    def test_str_compared_as_value(self, actual):
+        # Given: A decoded JSON string that looks like JSON text
+        # Then: It should be compared as a string, not parsed
+        assert diff_json(actual, actual) == []
+        assert [difference.path for difference in diff_json(actual, [])] == [""]
@@ -0,0 +1,52 @@
+import pytest
+import requests
+
+from framework.load_test import LoadProfile, LoadRunner, Operation
+from framework.logger import APILogger
+from tests.unit.helpers import make_response
+
+
+def failing_call(errors: list[Exception]):
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return make_response(200)
+
+    return call
+
+
+@pytest.mark.unit
+class TestLoadRunner:
+    def test_exceptions_counted_by_type(self, monkeypatch):
+        # Given: An operation timing out twice and refused once, then passing
+        logged = []
+        monkeypatch.setattr(APILogger, "log_error", logged.append)
+        errors = [
+            requests.Timeout(),
+            requests.ConnectionError(),
+            requests.Timeout(),
+        ]
+        runner = LoadRunner(
+            [Operation("get_author", 1, failing_call(errors))],
+            LoadProfile(concurrency=1, duration=0.05, seed=1),
+        )
+
+        # When: Run the load
+        result = runner.run()
+
+        # Then: Failures should be counted by exception type
+        stats = result.operations["get_author"]
+        assert stats.errors == 3
+        assert stats.exceptions == {"Timeout": 2, "ConnectionError": 1}
+        assert result.to_dict()["operations"]["total"]["exceptions"] == {
+            "Timeout": 2,
+            "ConnectionError": 1,
+        }
+        assert "get_author exceptions: Timeout=2, ConnectionError=1" in str(
+            result
+        )
+
+        # And: Only the first occurrence of each type should be logged
+        assert len(logged) == 2
+        assert logged[0].startswith("get_author failed with Timeout")
+        assert "Traceback" in logged[0]
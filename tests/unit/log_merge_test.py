@@ -0,0 +1,120 @@
+import json
+import logging
+
+import pytest
+
+from framework.log_merge import ShardFormatter, merge_shards, merge_worker_logs
+
+
+def write_text_shard(path, entries: list[tuple[float, str]]) -> str:
+    path.write_text(
+        "".join(
+            json.dumps([created, message]) + "\n"
+            for created, message in entries
+        )
+    )
+    return str(path)
+
+
+def write_structured_shard(path, timestamps: list[float]) -> str:
+    path.write_text(
+        "".join(
+            json.dumps({"ts": ts, "url": f"{path.stem}/{ts}"}) + "\n"
+            for ts in timestamps
+        )
+    )
+    return str(path)
+
+
+@pytest.mark.unit
+class TestLogMerge:
+    def test_shard_formatter(self):
+        record = logging.LogRecord(
+            "api", logging.INFO, __file__, 1, "GET %s", ("/author",), None
+        )
+
+        assert json.loads(ShardFormatter().format(record)) == [
+            record.created,
+            "GET /author",
+        ]
+
+    def test_merge_text_shards_in_time_order(self, tmp_path):
+        # Given: Three worker shards with interleaved entries
+        shards = [
+            write_text_shard(
+                tmp_path / "gw0.log", [(1.0, "a1"), (4.0, "a4"), (7.0, "a7")]
+            ),
+            write_text_shard(tmp_path / "gw1.log", [(2.0, "b2"), (3.0, "b3")]),
+            write_text_shard(
+                tmp_path / "gw2.log", [(0.5, "c0"), (5.0, "c5\nsecond line")]
+            ),
+        ]
+        target = tmp_path / "run.log"
+        target.write_text("controller\n")
+
+        # When: Merge them into the run's log
+        merge_shards(str(target), shards)
+
+        # Then: Entries should be appended in time order, shards removed
+        assert target.read_text().splitlines() == [
+            "controller",
+            "c0",
+            "a1",
+            "b2",
+            "b3",
+            "a4",
+            "c5",
+            "second line",
+            "a7",
+        ]
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["run.log"]
+
+    def test_merge_keeps_shard_order_of_ties(self, tmp_path):
+        shards = [
+            write_text_shard(tmp_path / "gw0.log", [(1.0, "a"), (2.0, "a2")]),
+            write_text_shard(tmp_path / "gw1.log", [(1.0, "b"), (2.0, "b2")]),
+        ]
+        target = tmp_path / "run.log"
+
+        merge_shards(str(target), shards)
+
+        assert target.read_text().split() == ["a", "b", "a2", "b2"]
+
+    def test_merge_structured_shards_by_ts(self, tmp_path):
+        # Given: JSON lines shards of two workers
+        shards = [
+            write_structured_shard(tmp_path / "gw0.jsonl", [1.0, 3.0]),
+            write_structured_shard(tmp_path / "gw1.jsonl", [2.0, 4.0]),
+        ]
+        target = tmp_path / "run.jsonl"
+
+        # When: Merge them
+        merge_shards(str(target), shards, structured=True)
+
+        # Then: Records should be kept verbatim, ordered by "ts"
+        records = [json.loads(line) for line in target.read_text().splitlines()]
+        assert [record["url"] for record in records] == [
+            "gw0/1.0",
+            "gw1/2.0",
+            "gw0/3.0",
+            "gw1/4.0",
+        ]
+
+    def test_merge_worker_logs(self, tmp_path):
+        # Given: Text and structured shards of this run and another run
+        write_text_shard(tmp_path / "run_gw0.log", [(2.0, "gw0")])
+        write_text_shard(tmp_path / "run_gw1.log", [(1.0, "gw1")])
+        write_structured_shard(tmp_path / "run_gw0.jsonl", [1.0])
+        write_text_shard(tmp_path / "other_gw0.log", [(0.0, "other")])
+
+        # When: Merge the logs of the run
+        merge_worker_logs(str(tmp_path), "run")
+
+        # Then: Only its shards should be merged, by extension
+        assert (tmp_path / "run.log").read_text().split() == ["gw1", "gw0"]
+        assert len((tmp_path / "run.jsonl").read_text().splitlines()) == 1
+        assert sorted(path.name for path in tmp_path.iterdir()) == [
+            "other_gw0.log",
+            "run.jsonl",
+            "run.log",
+        ]
@@ -0,0 +1,149 @@
+import json
+
+import pytest
+
+from framework.log_query import aggregate, main, parse_args, read_records
+
+URL = "http://poetrydb.test"
+
+RECORDS = [
+    {
+        "ts": 100.0,
+        "test": "tests/author_api_test.py::test_a",
+        "method": "GET",
+        "url": f"{URL}/author/Emily%20Dickinson",
+        "template": "/author/{name}",
+        "status": 200,
+        "latency_ms": 10.0,
+        "resp_bytes": 1000,
+    },
+    {
+        "ts": 101.0,
+        "test": "tests/author_api_test.py::test_b",
+        "method": "GET",
+        "url": f"{URL}/author/Ernest%20Dowson",
+        "template": "/author/{name}",
+        "status": 404,
+        "latency_ms": 30.0,
+        "resp_bytes": 50,
+    },
+    {
+        "ts": 102.0,
+        "test": None,
+        "method": "GET",
+        "url": f"{URL}/title",
+        "template": "/title",
+        "status": 200,
+        "latency_ms": 20.0,
+        "resp_bytes": 500,
+    },
+    # Written before records had a template
+    {
+        "ts": 103.0,
+        "test": "tests/title_api_test.py::test_c",
+        "method": "POST",
+        "url": f"{URL}/lines/moon",
+        "status": 500,
+        "latency_ms": 40.0,
+    },
+]
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    path = tmp_path / "api_test_log.jsonl"
+    lines = [json.dumps(record) for record in RECORDS]
+    # A line cut short by a crashed run
+    lines.insert(2, '{"ts": 101.5, "meth')
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def query(log_path: str, *options: str) -> dict:
+    args = parse_args([log_path, *options])
+    return {
+        key: stats.to_dict()
+        for key, stats in aggregate(read_records(args.paths), args).items()
+    }
+
+
+@pytest.mark.unit
+class TestLogQuery:
+    def test_read_records_skips_broken_lines(self, log_path):
+        assert list(read_records([log_path])) == RECORDS
+
+    def test_group_by_endpoint_template(self, log_path):
+        # When: Aggregate the calls by endpoint
+        groups = query(log_path)
+
+        # Then: Calls should be grouped by template, or by path without one
+        assert sorted(groups) == [
+            "GET /author/{name}",
+            "GET /title",
+            "POST /lines/moon",
+        ]
+        author = groups["GET /author/{name}"]
+        assert (author["count"], author["errors"]) == (2, 1)
+        assert author["error_rate"] == 0.5
+        assert author["resp_bytes"] == 1050
+
+    def test_group_by_path(self, log_path):
+        groups = query(log_path, "--group-by", "path")
+
+        assert sorted(groups) == [
+            "GET /author/Emily%20Dickinson",
+            "GET /author/Ernest%20Dowson",
+            "GET /title",
+            "POST /lines/moon",
+        ]
+
+    @pytest.mark.parametrize(
+        "group_by, expected",
+        [
+            (
+                "test",
+                {
+                    "N/A": 1,
+                    "tests/author_api_test.py::test_a": 1,
+                    "tests/author_api_test.py::test_b": 1,
+                    "tests/title_api_test.py::test_c": 1,
+                },
+            ),
+            ("status", {"200": 2, "404": 1, "500": 1}),
+            ("method", {"GET": 3, "POST": 1}),
+        ],
+    )
+    def test_group_by(self, log_path, group_by, expected):
+        groups = query(log_path, "--group-by", group_by)
+
+        assert {key: row["count"] for key, row in groups.items()} == expected
+
+    @pytest.mark.parametrize(
+        "options, expected",
+        [
+            (["--method", "post"], ["POST /lines/moon"]),
+            (["--status", "404"], ["GET /author/{name}"]),
+            (["--errors-only"], ["GET /author/{name}", "POST /lines/moon"]),
+            (["--url", "/title"], ["GET /title"]),
+            (["--test", "title_api"], ["POST /lines/moon"]),
+            (["--since", "102"], ["GET /title", "POST /lines/moon"]),
+        ],
+    )
+    def test_filters(self, log_path, options, expected):
+        assert sorted(query(log_path, *options)) == expected
+
+    def test_filtered_latency(self, log_path):
+        groups = query(log_path, "--status", "404")
+
+        assert groups["GET /author/{name}"]["max"] == pytest.approx(
+            30.0, rel=0.01
+        )
+
+    def test_main_json(self, log_path, capsys):
+        main([log_path, "--group-by", "method", "--json"])
+
+        output = json.loads(capsys.readouterr().out)
+        assert {key: row["count"] for key, row in output.items()} == {
+            "GET": 3,
+            "POST": 1,
+        }
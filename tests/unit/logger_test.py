@@ -0,0 +1,113 @@
+import json
+
+import pytest
+
+from framework.api.api_client import APIClient
+from framework.api.services.author_service import AuthorService
+from framework.logger import APILogger, CapturePolicy, StructuredLogHandler
+
+
+@pytest.mark.unit
+class TestCapturePolicy:
+    @pytest.mark.parametrize("body", ["x" * 100, b"x" * 100])
+    def test_truncate_keeps_head_and_tail(self, body):
+        # Given: A policy keeping 20 bytes of a 100-byte body
+        policy = CapturePolicy(max_body_bytes=20)
+        body = body[:1].upper() + body[1:-1] + body[-1:].upper()
+
+        # When: Truncate the body
+        truncated = policy.truncate(body)
+
+        # Then: Its head and tail should be kept, with the cut noted
+        note = "\n... [80 of 100 bytes truncated] ...\n"
+        if isinstance(body, bytes):
+            note = note.encode()
+        assert truncated == body[:10] + note + body[-10:]
+        assert type(truncated) is type(body)
+
+    @pytest.mark.parametrize(
+        "max_body_bytes, body",
+        [(20, "x" * 20), (0, "x" * 1000), (20, None), (20, b"")],
+    )
+    def test_truncate_leaves_short_bodies(self, max_body_bytes, body):
+        policy = CapturePolicy(max_body_bytes=max_body_bytes)
+
+        assert policy.truncate(body) == body
+
+    def test_redact(self):
+        # Given: The default policy
+        policy = CapturePolicy()
+        headers = {
+            "authorization": "Bearer secret",
+            "Cookie": "session=secret",
+            "X-Api-Key": "secret",
+            "Accept": "application/json",
+        }
+
+        # When: Redact the headers of a call
+        redacted = policy.redact(headers)
+
+        # Then: Credentials should be hidden, whatever their case
+        assert redacted == {
+            "authorization": "<redacted>",
+            "Cookie": "<redacted>",
+            "X-Api-Key": "<redacted>",
+            "Accept": "application/json",
+        }
+        assert "secret" in headers["Cookie"], "Headers should be copied"
+
+    def test_redact_configured_headers(self):
+        policy = CapturePolicy(redacted_headers="X-Trace, ")
+
+        assert policy.redact({"X-Trace": "1", "Cookie": "a"}) == {
+            "X-Trace": "<redacted>",
+            "Cookie": "a",
+        }
+
+    def test_sampling_keeps_failures(self):
+        # Given: A policy logging one of every 3 successful calls
+        policy = CapturePolicy(success_sample_rate=3)
+
+        # When: Check six successful and six failed calls
+        successes = [policy.should_log(200) for _ in range(6)]
+        failures = [policy.should_log(500) for _ in range(6)]
+
+        # Then: Every failure and a third of the successes should be logged
+        assert successes == [True, False, False, True, False, False]
+        assert all(failures)
+
+
+@pytest.fixture
+def structured_log(tmp_path, monkeypatch):
+    """Path of a JSON lines log written synchronously during the test"""
+    path = tmp_path / "calls.jsonl"
+    handler = StructuredLogHandler(str(path))
+    monkeypatch.setattr(APILogger, "structured_handler", handler)
+    APILogger.logger.addHandler(handler)
+    yield path
+    APILogger.logger.removeHandler(handler)
+    handler.close()
+
+
+@pytest.mark.unit
+class TestStructuredLog:
+    def test_parse_phases_logged(self, stub_server, structured_log):
+        # Given: A service on a client measuring request phases
+        service = AuthorService(APIClient(stub_server.url, timings=True))
+
+        # When: Get and parse the poems of an author
+        _, response = service.get_poems_by_author("Emily Dickinson")
+
+        # Then: The call record should be followed by a record with all
+        # phases, the ones measured while parsing included
+        call, parsed = [
+            json.loads(line) for line in structured_log.read_text().splitlines()
+        ]
+        assert "event" not in call
+        assert parsed["event"] == "parsed"
+        assert parsed["url"] == call["url"] == response.request.url
+        assert parsed["timings"] == response.timings.to_dict()
+        assert {"ttfb", "download", "json_decode", "validation"} <= set(
+            parsed["timings"]
+        )
+        assert set(call["timings"]) < set(parsed["timings"])
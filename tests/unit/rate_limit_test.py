@@ -0,0 +1,178 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.synchronize import Event
+
+import pytest
+
+from framework.api.rate_limit import (
+    FileSemaphore,
+    FileTokenBucket,
+    RateLimit,
+    RateLimiter,
+    TokenBucket,
+    parse_rate_limits,
+)
+
+# Worker processes share the lock files through fork
+fork = multiprocessing.get_context("fork")
+
+
+def reserve_tokens(path: str, count: int) -> list[float]:
+    bucket = FileTokenBucket(path, rate=10, capacity=1)
+    return [bucket.reserve() for _ in range(count)]
+
+
+def hold_slot(path: str, held: Event, seconds: float) -> None:
+    semaphore = FileSemaphore(path, 1)
+    fd = semaphore.acquire()
+    held.set()
+    time.sleep(seconds)
+    semaphore.release(fd)
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    def test_refill_at_rate(self):
+        # Given: An empty bucket of 10 tokens per second
+        # When: Half a second passes
+        tokens, wait = TokenBucket._take(
+            tokens=0, updated=0, now=0.5, rate=10, capacity=8
+        )
+
+        # Then: 5 tokens should be refilled, one of them taken
+        assert tokens == pytest.approx(4)
+        assert wait == 0
+
+    def test_refill_capped_at_capacity(self):
+        tokens, wait = TokenBucket._take(
+            tokens=0, updated=0, now=60, rate=10, capacity=8
+        )
+
+        assert tokens == pytest.approx(7)
+        assert wait == 0
+
+    def test_waiting_callers_reserve_slots_in_order(self):
+        # Given: A bucket with its burst used up
+        tokens, waits = -1.0, []
+
+        # When: Three callers take tokens at the same time
+        for _ in range(3):
+            tokens, wait = TokenBucket._take(
+                tokens, updated=0, now=0, rate=10, capacity=1
+            )
+            waits.append(wait)
+
+        # Then: Each should wait for the next free slot
+        assert waits == pytest.approx([0.2, 0.3, 0.4])
+
+    def test_burst_then_wait(self):
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        waits = [bucket.reserve() for _ in range(3)]
+
+        assert waits[:2] == [0, 0]
+        assert waits[2] == pytest.approx(0.1, abs=0.01)
+
+
+@pytest.mark.unit
+class TestSharedLimits:
+    def test_bucket_shared_by_processes(self, tmp_path):
+        # Given: Two processes sharing one bucket of 10 tokens per second
+        path = str(tmp_path / "bucket")
+
+        # When: Each takes three tokens at once
+        with fork.Pool(2) as pool:
+            results = pool.starmap(reserve_tokens, [(path, 3), (path, 3)])
+
+        # Then: The six requests should be spread over one global budget
+        waits = sorted(wait for waits in results for wait in waits)
+        assert waits == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4, 0.5], abs=0.05)
+
+    def test_semaphore_shared_by_processes(self, tmp_path):
+        # Given: A process holding the only slot for 0.3 s
+        path = str(tmp_path / "slot")
+        held = fork.Event()
+        process = fork.Process(target=hold_slot, args=(path, held, 0.3))
+        process.start()
+        assert held.wait(5), "The other process should take the slot"
+
+        # When: This process asks for a slot
+        started = time.monotonic()
+        semaphore = FileSemaphore(path, 1)
+        fd = semaphore.acquire()
+        waited = time.monotonic() - started
+        semaphore.release(fd)
+        process.join(5)
+
+        # Then: It should wait until the other process releases it
+        assert waited >= 0.2
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    def test_parse(self):
+        limits = parse_rate_limits(
+            "*=50/100:8; /lines/{text}=5:2; /title=:4; /random=2/5"
+        )
+
+        assert limits == {
+            "*": RateLimit(rate=50, burst=100, max_in_flight=8),
+            "/lines/{text}": RateLimit(rate=5, max_in_flight=2),
+            "/title": RateLimit(max_in_flight=4),
+            "/random": RateLimit(rate=2, burst=5),
+        }
+
+    @pytest.mark.parametrize("spec", ["/author=fast", "/author=/10:2"])
+    def test_parse_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_rate_limits(spec)
+
+    def test_max_in_flight(self):
+        # Given: A limit of two requests in flight
+        limiter = RateLimiter({"/author": RateLimit(max_in_flight=2)})
+        in_flight, peak = 0, 0
+        lock = threading.Lock()
+
+        def request():
+            nonlocal in_flight, peak
+            with limiter.limit("/author"):
+                with lock:
+                    in_flight += 1
+                    peak = max(peak, in_flight)
+                time.sleep(0.01)
+                with lock:
+                    in_flight -= 1
+
+        # When: Eight threads send requests at once
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(8):
+                executor.submit(request)
+
+        # Then: At most two should be in flight
+        assert peak == 2
+        assert limiter.stats()["/author"].throttled > 0
+
+    def test_default_limit_shared(self):
+        # Given: A "*" limit and templates without their own limit
+        limiter = RateLimiter({"*": RateLimit(rate=10, burst=1)})
+
+        # When: Send a request to each template
+        started = time.monotonic()
+        for template in ("/author", "/title"):
+            with limiter.limit(template):
+                pass
+        elapsed = time.monotonic() - started
+
+        # Then: They should share one budget
+        assert elapsed >= 0.09
+        assert limiter.stats()["*"].requests == 2
+
+    def test_unlimited_template(self):
+        limiter = RateLimiter({"/lines/{text}": RateLimit(rate=1)})
+
+        with limiter.limit("/author"):
+            pass
+
+        assert limiter.stats() == {}
@@ -0,0 +1,289 @@
+import random
+import time
+
+import pytest
+import requests
+
+from framework.api.api_client import APIClient
+from framework.api.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgePolicy,
+    RetryPolicy,
+)
+from tests.unit.helpers import (
+    URL,
+    ScriptedAdapter,
+    make_response,
+    scripted_client,
+)
+
+
+@pytest.mark.unit
+class TestRetryPolicy:
+    @pytest.mark.parametrize("attempt", range(8))
+    def test_delay_within_jitter_bounds(self, attempt):
+        # Given: A policy doubling a 0.1 s backoff up to 1 s
+        policy = RetryPolicy(backoff=0.1, max_backoff=1.0)
+        random.seed(attempt)
+
+        # When: Draw delays of the attempt
+        delays = [policy.delay(attempt) for _ in range(1000)]
+
+        # Then: Delays should be spread over [0, capped backoff]
+        bound = min(1.0, 0.1 * 2**attempt)
+        assert all(0 <= delay <= bound for delay in delays)
+        assert max(delays) > bound * 0.9, "Jitter should reach the bound"
+        assert min(delays) < bound * 0.1, "Jitter should start near zero"
+
+    def test_retry_after_takes_precedence(self):
+        # Given: A 503 response asking to retry after 2 s
+        policy = RetryPolicy(backoff=0.1)
+        response = make_response(503, {"Retry-After": "2"})
+
+        # Then: The policy should wait as long as the server asked
+        assert policy.should_retry("GET", 0, response)
+        assert policy.delay(0, response) == 2.0
+
+    def test_retry_after_too_long(self):
+        # Given: A 503 response asking to retry after a minute
+        policy = RetryPolicy(max_retry_after=30)
+        response = make_response(503, {"Retry-After": "60"})
+
+        # Then: The response should be returned instead of waiting
+        assert not policy.should_retry("GET", 0, response)
+
+    @pytest.mark.parametrize(
+        "method, attempt, status, error, expected",
+        [
+            ("GET", 0, 503, None, True),
+            ("GET", 0, 500, None, False),
+            ("GET", 2, 503, None, False),
+            ("POST", 0, 503, None, False),
+            ("GET", 0, None, requests.ConnectionError(), True),
+            ("GET", 0, None, requests.Timeout(), True),
+            ("GET", 0, None, CircuitOpenError(), False),
+            ("GET", 0, None, ValueError(), False),
+        ],
+    )
+    def test_should_retry(self, method, attempt, status, error, expected):
+        policy = RetryPolicy(retries=2)
+        response = make_response(status) if status else None
+
+        assert policy.should_retry(method, attempt, response, error) is expected
+
+    def test_client_retries_until_success(self):
+        # Given: A server failing twice with 503
+        adapter = ScriptedAdapter([503, 503, 200])
+        client = scripted_client(
+            adapter, retry=RetryPolicy(retries=2, backoff=0.001)
+        )
+
+        # When: Send a GET request
+        response = client.get("/author")
+
+        # Then: The third attempt should be returned
+        assert response.status_code == 200
+        assert adapter.sent == 3
+        assert client.resilience_stats().retries == 2
+
+    def test_client_does_not_retry_other_errors(self):
+        # Given: A request failing with an error unrelated to the network
+        adapter = ScriptedAdapter([ValueError("bad request")])
+        client = scripted_client(
+            adapter, retry=RetryPolicy(retries=2, backoff=0.001)
+        )
+
+        # Then: The error should be raised at once
+        with pytest.raises(ValueError):
+            client.get("/author")
+        assert adapter.sent == 1
+
+
+@pytest.mark.unit
+class TestHedgePolicy:
+    def test_backup_wins_over_slow_primary(self):
+        # Given: A primary request slower than the hedging delay, which
+        # leaves the primary time to reach the adapter first even on a
+        # busy machine, as delays are scripted in the order of arrival
+        adapter = ScriptedAdapter([200], delays=[0.5, 0])
+        client = scripted_client(adapter, hedge=HedgePolicy(delay=0.1))
+
+        # When: Send a GET request
+        started = time.perf_counter()
+        response = client.get("/author")
+        elapsed = time.perf_counter() - started
+
+        # Then: The backup copy should answer first
+        assert response.status_code == 200
+        assert elapsed < 0.4, "The backup should not wait for the primary"
+        stats = client.resilience_stats()
+        assert (stats.hedges, stats.hedge_wins) == (1, 1)
+
+        # And: Closing the client should wait for the abandoned primary
+        client.close()
+        assert time.perf_counter() - started >= 0.5
+
+    def test_fast_primary_not_hedged(self):
+        # Given: A primary request faster than the hedging delay
+        adapter = ScriptedAdapter([200])
+        client = scripted_client(adapter, hedge=HedgePolicy(delay=1.0))
+
+        # When: Send a GET request
+        client.get("/author")
+
+        # Then: No backup copy should be sent
+        assert adapter.sent == 1
+        assert client.resilience_stats().hedges == 0
+
+    @pytest.mark.parametrize(
+        "method, kwargs", [("POST", {}), ("GET", {"stream": True})]
+    )
+    def test_not_hedged(self, method, kwargs):
+        # Given: A request that is not idempotent or is streamed
+        client = APIClient(base_url=URL)
+        policy = HedgePolicy(delay=0.01)
+
+        # Then: It should never be hedged
+        assert client._hedge_delay(method, "/author", policy, kwargs) is None
+
+    def test_delay_from_endpoint_percentile(self, monkeypatch):
+        # Given: An endpoint whose p95 latency is 250 ms
+        from framework.api import api_client
+
+        monkeypatch.setattr(
+            api_client.api_metrics,
+            "percentile",
+            lambda method, endpoint, percentile, min_samples: 250.0,
+        )
+        client = APIClient(base_url=URL)
+
+        # Then: Requests should be hedged after 0.25 s
+        delay = client._hedge_delay("GET", "/author", HedgePolicy(), {})
+        assert delay == 0.25
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    def open_breaker(self, reset_timeout: float) -> CircuitBreaker:
+        breaker = CircuitBreaker(
+            failure_threshold=0.5,
+            window=4,
+            min_calls=4,
+            reset_timeout=reset_timeout,
+        )
+        for failed in (False, True, False, True):
+            breaker.before_call("GET /author")
+            breaker.record("GET /author", failed)
+        return breaker
+
+    def test_closed_until_threshold(self):
+        # Given: A breaker opening at 50% failures of 4 calls
+        breaker = CircuitBreaker(failure_threshold=0.5, window=4, min_calls=4)
+
+        # When: Record one failure in three calls
+        for failed in (False, True, False):
+            breaker.record("GET /author", failed)
+
+        # Then: The circuit should stay closed
+        assert breaker.before_call("GET /author") is None
+        assert breaker.open_circuits() == []
+
+    def test_opens_at_threshold(self):
+        # Given: An endpoint failing half of its last 4 calls
+        breaker = self.open_breaker(reset_timeout=60)
+
+        # Then: Its calls should be rejected, other endpoints not
+        assert breaker.open_circuits() == ["GET /author"]
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call("GET /author")
+        assert breaker.before_call("GET /title") is None
+
+    def test_half_open_lets_one_trial_through(self):
+        # Given: An open circuit past its reset timeout
+        breaker = self.open_breaker(reset_timeout=0)
+
+        # When: Two calls arrive
+        trial = breaker.before_call("GET /author")
+
+        # Then: Only the first one should be let through, as the trial
+        assert trial is not None
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call("GET /author")
+
+    def test_trial_success_closes(self):
+        breaker = self.open_breaker(reset_timeout=0)
+        trial = breaker.before_call("GET /author")
+
+        breaker.record("GET /author", False, trial)
+
+        assert breaker.open_circuits() == []
+        assert breaker.before_call("GET /author") is None
+
+    def test_trial_failure_reopens(self):
+        breaker = self.open_breaker(reset_timeout=0)
+        trial = breaker.before_call("GET /author")
+        breaker.reset_timeout = 60
+
+        breaker.record("GET /author", True, trial)
+
+        assert breaker.open_circuits() == ["GET /author"]
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call("GET /author")
+
+    def test_stale_call_does_not_resolve_trial(self):
+        # Given: A trial call in flight of a half-open circuit
+        breaker = self.open_breaker(reset_timeout=0)
+        trial = breaker.before_call("GET /author")
+
+        # When: A call let through before the circuit opened succeeds
+        breaker.record("GET /author", False)
+
+        # Then: The circuit should stay open until the trial completes
+        assert breaker.open_circuits() == ["GET /author"]
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call("GET /author")
+        breaker.record("GET /author", False, trial)
+        assert breaker.open_circuits() == []
+
+    def test_cancelled_trial_hands_over(self):
+        # Given: A trial call that failed with an unrelated error
+        breaker = self.open_breaker(reset_timeout=0)
+        trial = breaker.before_call("GET /author")
+
+        # When: The trial is cancelled
+        breaker.cancel("GET /author", trial)
+
+        # Then: The next call should become the trial
+        assert breaker.open_circuits() == ["GET /author"]
+        assert breaker.before_call("GET /author") is not None
+
+    def test_client_records_only_network_failures(self):
+        # Given: A client with a breaker and an endpoint raising an error
+        # unrelated to the network
+        adapter = ScriptedAdapter([ValueError("bad request")])
+        client = scripted_client(adapter, circuit_breaker=True)
+
+        # When: Call it more often than the breaker needs to open
+        for _ in range(client.circuit_breaker.min_calls):
+            with pytest.raises(ValueError):
+                client.get("/author")
+
+        # Then: The circuit should stay closed
+        assert client.resilience_stats().open_circuits == ()
+
+    def test_client_rejects_calls_of_open_circuit(self):
+        # Given: A client whose endpoint keeps timing out
+        adapter = ScriptedAdapter([requests.Timeout()])
+        client = scripted_client(adapter, circuit_breaker=True)
+        for _ in range(client.circuit_breaker.min_calls):
+            with pytest.raises(requests.Timeout):
+                client.get("/author")
+
+        # When: Call it again
+        with pytest.raises(CircuitOpenError):
+            client.get("/author")
+
+        # Then: The call should be rejected without reaching the server
+        assert adapter.sent == client.circuit_breaker.min_calls
+        assert client.resilience_stats().rejected == 1
@@ -0,0 +1,104 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from framework.api.single_flight import SingleFlight
+
+CALLERS = 8
+
+
+def wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Condition not met in time"
+        time.sleep(0.001)
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    def test_one_leader_followers_share_result(self):
+        # Given: A call that blocks until every caller has joined it
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def function():
+            calls.append(threading.current_thread().name)
+            release.wait(5)
+            return object()
+
+        # When: Many callers make the same call at once
+        with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+            futures = [
+                executor.submit(single_flight.do, "key", function)
+                for _ in range(CALLERS)
+            ]
+            wait_for(lambda: single_flight.stats().coalesced == CALLERS - 1)
+            release.set()
+            results = [future.result() for future in futures]
+
+        # Then: The call should run once and all callers get its result
+        assert len(calls) == 1
+        assert all(result is results[0] for result in results)
+        stats = single_flight.stats()
+        assert (stats.executed, stats.coalesced) == (1, CALLERS - 1)
+
+    def test_followers_share_exception(self):
+        # Given: A call that fails after every caller has joined it
+        single_flight = SingleFlight()
+        release = threading.Event()
+        error = ValueError("upstream failed")
+
+        def function():
+            release.wait(5)
+            raise error
+
+        # When: Many callers make the same call at once
+        with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+            futures = [
+                executor.submit(single_flight.do, "key", function)
+                for _ in range(CALLERS)
+            ]
+            wait_for(lambda: single_flight.stats().coalesced == CALLERS - 1)
+            release.set()
+            errors = [future.exception(timeout=5) for future in futures]
+
+        # Then: Every caller should get the exception of the one call
+        assert all(raised is error for raised in errors)
+
+    def test_completed_call_not_reused(self):
+        # Given: A call that has completed
+        single_flight = SingleFlight()
+        single_flight.do("key", lambda: 1)
+
+        # When: Make the same call again
+        result = single_flight.do("key", lambda: 2)
+
+        # Then: It should run again
+        assert result == 2
+        assert single_flight.stats().executed == 2
+
+    def test_different_keys_not_coalesced(self):
+        # Given: Calls with different keys in flight at the same time
+        single_flight = SingleFlight()
+        started = threading.Barrier(2, timeout=5)
+
+        def function(value):
+            started.wait()
+            return value
+
+        # When: Make both calls concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [
+                executor.submit(
+                    single_flight.do, key, lambda key=key: function(key)
+                )
+                for key in ("a", "b")
+            ]
+            results = [future.result() for future in futures]
+
+        # Then: Each should run on its own
+        assert results == ["a", "b"]
+        assert single_flight.stats().coalesced == 0
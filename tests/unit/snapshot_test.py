@@ -0,0 +1,54 @@
+import pytest
+
+from framework.api.services.author_service import AuthorService
+from framework.api.services.title_service import TitleService
+from framework.corpus.snapshot import CorpusSnapshot
+from framework.stub_server import PoetryStore, StubAdapter
+from tests.unit.helpers import OVERLAPPING_POEMS, scripted_client
+
+
+def sync(snapshot: CorpusSnapshot, poems: list[dict]):
+    client = scripted_client(StubAdapter(PoetryStore(poems)))
+    return snapshot.sync(AuthorService(client), TitleService(client))
+
+
+def poem_keys(poems) -> list[tuple[str, str]]:
+    return sorted((poem["author"], poem["title"]) for poem in poems)
+
+
+@pytest.mark.unit
+class TestSnapshotSync:
+    def test_overlapping_names(self, tmp_path):
+        # Given: Authors whose names contain each other
+        snapshot = CorpusSnapshot(str(tmp_path))
+
+        # When: Sync the snapshot
+        result = sync(snapshot, OVERLAPPING_POEMS)
+
+        # Then: Every poem should be stored once, under its own author
+        corpus = snapshot.open()
+        assert result.poems == len(OVERLAPPING_POEMS)
+        assert poem_keys(
+            {"author": poem.author, "title": poem.title} for poem in corpus
+        ) == poem_keys(OVERLAPPING_POEMS)
+
+    def test_only_changed_author_fetched(self, tmp_path):
+        # Given: A synced snapshot
+        snapshot = CorpusSnapshot(str(tmp_path))
+        sync(snapshot, OVERLAPPING_POEMS)
+        added = {
+            "title": "New poem",
+            "author": "Anne Finch",
+            "lines": ["New line"],
+            "linecount": "1",
+        }
+
+        # When: The longest name gets a new poem and the snapshot syncs
+        result = sync(snapshot, [*OVERLAPPING_POEMS, added])
+
+        # Then: Only that author should be downloaded again
+        assert result.fetched == ["Anne Finch"]
+        assert [poem.title for poem in snapshot.open().by_author("Ann")] == [
+            "Poem 0 of Ann",
+            "Poem 1 of Ann",
+        ]
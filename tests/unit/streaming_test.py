@@ -0,0 +1,109 @@
+import functools
+import io
+import json
+
+import pytest
+from requests import HTTPError
+
+from framework.api.services.author_service import AuthorService
+from framework.api.services.lines_services import LinesService
+from framework.api.services.title_service import TitleService
+from framework.api.streaming import iter_json_array
+from tests.unit.helpers import ScriptedAdapter, scripted_client
+
+BODY = json.dumps(
+    [
+        {"title": "Ode", "lines": ["Sleep! Cast thy canopy", ""]},
+        [1, 2.5, -3e2],
+        "Émily ✓",
+        12.75,
+        True,
+        None,
+    ],
+    ensure_ascii=False,
+).encode()
+
+
+def chunked(body: bytes, size: int) -> list[bytes]:
+    return list(iter(functools.partial(io.BytesIO(body).read, size), b""))
+
+
+@pytest.mark.unit
+class TestIterJsonArray:
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(BODY)])
+    def test_items_split_between_chunks(self, size):
+        # Given: An array body read in chunks splitting items, numbers and
+        # multi-byte characters
+
+        # When: Parse it incrementally
+        items = list(iter_json_array(chunked(BODY, size)))
+
+        # Then: The items should be the ones of the whole body
+        assert items == json.loads(BODY)
+
+    @pytest.mark.parametrize(
+        "body", [b"[]", b" [ ] ", b"[1]\n", b'[\n  {"a": [1, 2]},\n  3\n]\n']
+    )
+    def test_whitespace_and_empty_arrays(self, body):
+        assert list(iter_json_array(chunked(body, 1))) == json.loads(body)
+
+    def test_large_item_in_small_chunks(self):
+        # Given: A single item much larger than the chunks
+        lines = [f"line {number}" for number in range(20_000)]
+        body = json.dumps([{"lines": lines}]).encode()
+
+        # When: Parse it from 64-byte chunks
+        items = list(iter_json_array(chunked(body, 64)))
+
+        # Then: The item should be parsed whole
+        assert items == [{"lines": lines}]
+
+    @pytest.mark.parametrize(
+        "body, message",
+        [
+            (b"[1 2]", "Expected ',' or ']'"),
+            (b'[{"a": 1} {"b": 2}]', "Expected ',' or ']'"),
+            (b"[1,,2]", "Expected an array item"),
+            (b"[,1]", "Expected an array item"),
+            (b"[1,]", "Expected an array item"),
+            (b"[1] 2", "Unexpected data after JSON array"),
+            (b"[1]]", "Unexpected data after JSON array"),
+            (b"[1][2]", "Unexpected data after JSON array"),
+            (b"[1, 2", "Unexpected end of JSON array"),
+            (b"", "Unexpected end of JSON array"),
+            (b'{"status": 404}', "Expected a JSON array"),
+        ],
+    )
+    @pytest.mark.parametrize("size", [1, 64])
+    def test_malformed_body(self, body, message, size):
+        # Given: A body that is not a single well-formed array
+
+        # When/Then: Parsing it should fail instead of yielding items
+        with pytest.raises(ValueError, match=message):
+            list(iter_json_array(chunked(body, size)))
+
+    def test_malformed_item(self):
+        with pytest.raises(ValueError):
+            list(iter_json_array(chunked(b'[1, {"a": }]', 4)))
+
+
+@pytest.mark.unit
+class TestStreamedServices:
+    @pytest.mark.parametrize(
+        "iterate",
+        [
+            lambda client: AuthorService(client).iter_poems_by_author("A"),
+            lambda client: TitleService(client).iter_poems_by_title("T"),
+            lambda client: LinesService(client).iter_poems_by_text_in_lines(
+                "L"
+            ),
+        ],
+        ids=["author", "title", "lines"],
+    )
+    def test_error_status_raised_before_streaming(self, iterate):
+        # Given: An API answering with a server error
+        client = scripted_client(ScriptedAdapter([503]))
+
+        # When/Then: The call itself should raise, not the iteration
+        with pytest.raises(HTTPError, match="503"):
+            iterate(client)
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from framework.stub_server import PoetryStore, StubServer
+from tests.unit.helpers import OVERLAPPING_POEMS
+
+
+class RecordingWriter:
+    """Stream writer keeping what the server sends"""
+
+    def __init__(self):
+        self.data = b""
+        self.closed = False
+
+    def write(self, data: bytes) -> None:
+        self.data += data
+
+    async def drain(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
+async def serve(requests: bytes, limit: int = 2**16) -> RecordingWriter:
+    reader = asyncio.StreamReader(limit=limit)
+    reader.feed_data(requests)
+    reader.feed_eof()
+    writer = RecordingWriter()
+    await StubServer(PoetryStore(OVERLAPPING_POEMS))._handle(reader, writer)
+    return writer
+
+
+@pytest.mark.unit
+class TestStubServer:
+    @pytest.mark.parametrize(
+        "request_head",
+        [
+            b"GARBAGE\r\n\r\n",
+            b"GET /author HTTP/1.1\r\nContent-Length: many\r\n\r\n",
+            b"GET /author HTTP/1.1\r\nContent-Length: -1\r\n\r\n",
+            b"GET /" + b"a" * 100 + b" HTTP/1.1\r\n\r\n",
+        ],
+        ids=["request line", "length", "negative length", "head over limit"],
+    )
+    async def test_malformed_request_answered_400(self, request_head):
+        # Given: A malformed request, or one with a head over the limit,
+        # followed by a valid one on the same connection
+        valid = b"GET /author HTTP/1.1\r\n\r\n"
+
+        # When: The server reads them
+        writer = await serve(request_head + valid, limit=64)
+
+        # Then: It should answer 400 and close, as the rest cannot be framed
+        assert writer.data.startswith(b"HTTP/1.1 400 Bad Request\r\n")
+        assert b"Connection: close\r\n" in writer.data
+        assert writer.data.count(b"HTTP/1.1") == 1
+        assert writer.closed
+
+    async def test_keep_alive_requests_served(self):
+        # Given: Two valid requests on one connection
+        valid = b"GET /author HTTP/1.1\r\n\r\n"
+
+        # When: The server reads them
+        writer = await serve(valid * 2)
+
+        # Then: Both should be answered
+        assert writer.data.count(b"HTTP/1.1 200 OK\r\n") == 2
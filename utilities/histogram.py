@@ -0,0 +1,87 @@
+import math
+from dataclasses import dataclass, field
+
+
+@dataclass
+class LatencyHistogram:
+    """
+    Fixed-precision latency histogram with logarithmic buckets.
+
+    Values are recorded in milliseconds and every bucket spans `precision`
+    relative width, so percentiles are accurate to about that ratio while
+    memory stays bounded by the value range rather than the sample count.
+    """
+
+    precision: float = 0.01
+    counts: dict[int, int] = field(default_factory=dict)
+    count: int = 0
+    total: float = 0.0
+    min: float = math.inf
+    max: float = 0.0
+
+    def __post_init__(self):
+        self._log_base = math.log1p(self.precision)
+
+    def _bucket(self, value: float) -> int:
+        # Sub-microsecond values share the lowest bucket
+        return math.floor(math.log(max(value, 0.001)) / self._log_base)
+
+    def _bucket_value(self, bucket: int) -> float:
+        # Midpoint of the bucket range
+        return math.exp((bucket + 0.5) * self._log_base)
+
+    def record(self, value: float) -> None:
+        """Record a latency value in milliseconds"""
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add all values recorded by another histogram"""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get the value below which the given percent of values fall
+
+        Args:
+            percent: Percentile in range 0-100
+
+        Returns:
+            Latency in milliseconds, 0 if nothing was recorded
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                value = self._bucket_value(bucket)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        """Summary of the recorded values in milliseconds"""
+        return {
+            "count": self.count,
+            "min": round(self.min if self.count else 0.0, 3),
+            "mean": round(self.mean, 3),
+            "p50": round(self.percentile(50), 3),
+            "p90": round(self.percentile(90), 3),
+            "p95": round(self.percentile(95), 3),
+            "p99": round(self.percentile(99), 3),
+            "max": round(self.max, 3),
+        }
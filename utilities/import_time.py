@@ -0,0 +1,98 @@
+import os
+import subprocess
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+# Root of the repository, where conftest.py and settings.py are imported from
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules pytest has imported before it imports conftest.py
+PYTEST_MODULES = ("pytest", "pytest_asyncio", "pytest_metadata.plugin")
+
+
+@dataclass(frozen=True)
+class ImportProfile:
+    """
+    Import time of a module, measured with python -X importtime
+
+    Only modules imported for the module itself are counted, not the
+    ones imported before it.
+    """
+
+    module: str
+    # Cumulative import time of the module in milliseconds
+    total: float
+    # Every module imported for it
+    imported: frozenset[str]
+    # Direct imports of the module with their cumulative time in ms
+    children: tuple[tuple[str, float], ...]
+
+    def slowest(self, count: int = 10) -> list[tuple[str, float]]:
+        """Direct imports taking the longest"""
+        return sorted(self.children, key=lambda child: -child[1])[:count]
+
+
+def _parse(stderr: str, module: str) -> ImportProfile:
+    # Lines are "import time: self [us] | cumulative | <indent>name",
+    # written after the imports of the module they belong to
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(cumulative) / 1000))
+
+    # Entries of the module end with its own top-level entry and start
+    # after the previous top-level entry
+    end = max(
+        index
+        for index, (depth, name, _) in enumerate(entries)
+        if depth == 0 and name == module
+    )
+    start = max(
+        (index + 1 for index in range(end) if entries[index][0] == 0),
+        default=0,
+    )
+    own = entries[start:end]
+    return ImportProfile(
+        module=module,
+        total=entries[end][2],
+        imported=frozenset(name for _, name, _ in own),
+        children=tuple(
+            (name, total) for depth, name, total in own if depth == 1
+        ),
+    )
+
+
+def measure_import(
+    module: str,
+    preload: Sequence[str] = PYTEST_MODULES,
+    repeat: int = 5,
+) -> ImportProfile:
+    """
+    Measure the import time of a module in fresh interpreters
+
+    Args:
+        module: Module name, e.g. "conftest"
+        preload: Modules imported first and not counted
+        repeat: Number of interpreters, the fastest one is reported
+
+    Returns:
+        Profile of the fastest import
+    """
+    code = "".join(f"import {name}\n" for name in (*preload, module))
+    profiles = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=ROOT_DIRECTORY,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        profiles.append(_parse(result.stderr, module))
+    return min(profiles, key=lambda profile: profile.total)